@@ -0,0 +1,140 @@
+"""
+Benchmark da detecção de alterações (hash_conteudo) no UPSERT de Repositorios e do logging em fila.
+
+Grava N repositórios sintéticos (com os gatilhos de ProjetoResumo e os índices de relatório) e mede
+uma nova sincronização de todos eles:
+    sem_deteccao        hash_conteudo limpo antes: todas as linhas são reescritas, como antes da detecção
+    inalterados         mesmos dados, hash igual: nenhuma linha é reescrita
+    alterados_5pct      5% dos repositórios com estrelas diferentes
+Também mede o custo, na thread que registra, de N mensagens INFO (uma por repositório, como fazia
+insert_or_update_repository) gravadas direto por um FileHandler e por um QueueHandler (setup_logging).
+
+Uso:
+    python -m benchmarks.bench_change_detection [--sizes 100000] [--output resultado.json]
+"""
+import argparse
+import json
+import logging
+import os
+import queue
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Any, List
+
+from benchmarks.fake_github import generate_repos
+from src.config.config import settings
+
+BENCH_ORG = "bench-org"
+PROJECT_COUNT = 200
+
+
+def _repo_rows(size: int, changed_fraction: float = 0.0) -> List[Dict[str, Any]]:
+    from src.services.github_api import extract_repo_info
+
+    rows = []
+    changed_every = int(1 / changed_fraction) if changed_fraction else 0
+    for index, repo_json in enumerate(generate_repos(BENCH_ORG, size)):
+        row = {**extract_repo_info(repo_json), "projeto_id": index % PROJECT_COUNT + 1}
+        if changed_every and index % changed_every == 0:
+            row["estrelas"] += 1
+        rows.append(row)
+    return rows
+
+
+def _timed_upsert(db_path: str, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    from src.models.model import close_all_pools
+    from src.repositories.github_repository import github_repository
+
+    close_all_pools()
+    settings.override(database_name=db_path)
+    started_at = time.perf_counter()
+    counts = github_repository.upsert_repositories(rows)
+    return {"tempo_s": time.perf_counter() - started_at, **counts}
+
+
+def _timed_logging(work_dir: str, size: int, queued: bool) -> float:
+    """Tempo, na thread que registra, de 'size' mensagens INFO gravadas em arquivo."""
+    handler = logging.FileHandler(os.path.join(work_dir, f"log_{'fila' if queued else 'direto'}.log"))
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    listener = None
+    if queued:
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, handler)
+        listener.start()
+        handler = QueueHandler(log_queue)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+    bench_logger = logging.getLogger("bench_change_detection")
+    bench_logger.propagate = False
+    bench_logger.setLevel(logging.INFO)
+    bench_logger.addHandler(handler)
+    started_at = time.perf_counter()
+    for index in range(size):
+        bench_logger.info(f"Repositório 'repo-{index}' atualizado.")
+    elapsed = time.perf_counter() - started_at
+    bench_logger.removeHandler(handler)
+    if listener:
+        listener.stop()
+    handler.close()
+    return elapsed
+
+
+def run_case(work_dir: str, size: int) -> Dict[str, Any]:
+    from src.models.model import SchemaManager, close_all_pools
+    from src.repositories.project_repository import project_repository
+
+    db_path = os.path.join(work_dir, f"change_{size}.db")
+    settings.override(database_name=db_path)
+    SchemaManager().create_all_tables()
+    project_repository.insert_projects((f"Projeto {i}", None) for i in range(1, PROJECT_COUNT + 1))
+    rows = _repo_rows(size)
+    _timed_upsert(db_path, rows)
+    close_all_pools()
+
+    result: Dict[str, Any] = {"repositorios": size}
+    cases = {"sem_deteccao": rows, "inalterados": rows, "alterados_5pct": _repo_rows(size, changed_fraction=0.05)}
+    for case, case_rows in cases.items():
+        case_path = os.path.join(work_dir, f"change_{size}_{case}.db")
+        shutil.copyfile(db_path, case_path)
+        if case == "sem_deteccao":
+            with sqlite3.connect(case_path) as conn:
+                conn.execute("UPDATE Repositorios SET hash_conteudo = NULL")
+        result[case] = _timed_upsert(case_path, case_rows)
+        close_all_pools()
+        os.remove(case_path)
+
+    result["log_direto_s"] = _timed_logging(work_dir, size, queued=False)
+    result["log_fila_s"] = _timed_logging(work_dir, size, queued=True)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000])
+    parser.add_argument("--output", help="Arquivo JSON onde gravar os resultados.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="repo_monitor_bench_change_") as work_dir:
+        for size in args.sizes:
+            result = run_case(work_dir, size)
+            results.append(result)
+            print(f"[{size}] sem detecção: {result['sem_deteccao']['tempo_s']:.2f} s; "
+                  f"inalterados: {result['inalterados']['tempo_s']:.2f} s "
+                  f"({result['inalterados']['inalterados']} inalterados); "
+                  f"5% alterados: {result['alterados_5pct']['tempo_s']:.2f} s "
+                  f"({result['alterados_5pct']['atualizados']} atualizados); "
+                  f"log: {result['log_direto_s']:.2f} s direto, {result['log_fila_s']:.2f} s em fila",
+                  file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Benchmark da exportação colunar (main.py --export) versus a leitura linha a linha com sqlite3.Row.
+
+Grava N repositórios sintéticos e mede, cada caso em um subprocesso novo (tempo e acréscimo do pico de
+memória residente):
+    linhas   todas as linhas de Repositorios lidas como dicionários (sqlite3.Row), como na carga para o
+             pandas, e as agregações (estrelas/forks por projeto, histograma de idade) em laços Python
+    npz      export_analytics em .npz, em blocos de EXPORT_CHUNK_SIZE linhas, com agregações em numpy
+    parquet  o mesmo em Parquet (se o pyarrow estiver instalado)
+
+Uso:
+    python -m benchmarks.bench_columnar_export [--sizes 100000 500000] [--chunk-size 50000] [--output resultado.json]
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, Any, List
+
+from benchmarks.fake_github import generate_repos
+from src.config.config import DEFAULT_PROJECT_NAME, settings
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_ORG = "bench-org"
+PROJECT_COUNT = 200
+
+_CHILD_CODE = """
+import json, sys, time
+from src.config.config import settings
+# Sem mmap: as páginas do banco mapeadas em memória contariam como memória residente do processo.
+settings.override(database_name=sys.argv[1], export_chunk_size=int(sys.argv[4]), sqlite_mmap_size=0)
+from benchmarks.bench_columnar_export import CASES, peak_rss_kb
+import numpy, src.services.columnar_export
+try:
+    import pyarrow.parquet
+except ImportError:
+    pass
+case = CASES[sys.argv[2]]
+baseline_kb = peak_rss_kb()
+started_at = time.perf_counter()
+case(sys.argv[3])
+elapsed = time.perf_counter() - started_at
+print(json.dumps({"tempo_s": elapsed, "pico_memoria_mb": (peak_rss_kb() - baseline_kb) / 1024}))
+"""
+
+
+def peak_rss_kb() -> int:
+    """
+    Pico de memória residente do processo (VmHWM). O ru_maxrss do resource não serve aqui: no Linux ele
+    preserva, após o exec, o pico do processo pai que criou o subprocesso.
+    """
+    with open("/proc/self/status", encoding="ascii") as status:
+        for line in status:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1])
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def row_by_row(output_dir: str):
+    """Caminho atual dos analistas: linhas como dicionários e agregações em Python."""
+    import time
+    from src.models.model import DatabaseManager
+
+    with DatabaseManager() as conn:
+        rows = [dict(row) for row in conn.execute("SELECT * FROM Repositorios")]
+    per_project: Dict[Any, List[int]] = {}
+    now = time.time()
+    ages = []
+    for row in rows:
+        totals = per_project.setdefault(row["projeto_id"], [0, 0, 0])
+        totals[0] += 1
+        totals[1] += row["estrelas"] or 0
+        totals[2] += row["forks"] or 0
+        created_at = time.mktime(time.strptime(row["data_criacao"], "%Y-%m-%dT%H:%M:%SZ"))
+        ages.append((now - created_at) / 86400)
+    return per_project, ages
+
+
+def columnar(file_format: str):
+    def run(output_dir: str):
+        from src.services.columnar_export import export_analytics
+        export_analytics(os.path.join(output_dir, file_format), file_format)
+    return run
+
+
+CASES = {"linhas": row_by_row, "npz": columnar("npz"), "parquet": columnar("parquet")}
+
+
+def _prepare(db_path: str, size: int):
+    import random
+    from src.models.model import SchemaManager, close_all_pools
+    from src.repositories.github_repository import github_repository
+    from src.repositories.project_repository import project_repository
+    from src.services.github_api import extract_repo_info
+
+    settings.override(database_name=db_path)
+    SchemaManager().create_all_tables()
+    project_repository.insert_projects([(DEFAULT_PROJECT_NAME, None)] +
+                                       [(f"Projeto {i}", None) for i in range(1, PROJECT_COUNT)])
+    rng = random.Random(size)
+    github_repository.upsert_repositories({**extract_repo_info(repo_json), "projeto_id": rng.randint(1, PROJECT_COUNT)}
+                                          for repo_json in generate_repos(BENCH_ORG, size))
+    close_all_pools()
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def run_case(work_dir: str, size: int, chunk_size: int) -> Dict[str, Any]:
+    db_path = os.path.join(work_dir, f"export_{size}.db")
+    _prepare(db_path, size)
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    result: Dict[str, Any] = {"repositorios": size, "bloco": chunk_size}
+    for case in CASES:
+        if case == "parquet" and not _has_pyarrow():
+            continue
+        output_dir = os.path.join(work_dir, f"saida_{size}")
+        completed = subprocess.run([sys.executable, "-c", _CHILD_CODE, db_path, case, output_dir, str(chunk_size)],
+                                   cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True)
+        result[case] = json.loads(completed.stdout.strip().splitlines()[-1])
+        if case != "linhas":
+            path = os.path.join(output_dir, case, f"repositorios.{case}")
+            result[case]["tamanho_mb"] = os.path.getsize(path) / (1024 * 1024)
+    result["banco_mb"] = os.path.getsize(db_path) / (1024 * 1024)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 500000])
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--output", help="Arquivo JSON onde gravar os resultados.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="repo_monitor_bench_export_") as work_dir:
+        for size in args.sizes:
+            result = run_case(work_dir, size, args.chunk_size)
+            results.append(result)
+            summary = "; ".join(f"{case}: {result[case]['tempo_s']:.2f} s, +{result[case]['pico_memoria_mb']:.0f} MB"
+                                for case in CASES if case in result)
+            print(f"[{size}] {summary}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
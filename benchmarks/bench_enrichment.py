@@ -0,0 +1,138 @@
+"""
+Benchmark do enriquecimento de metadados: GraphQL em lotes versus o equivalente REST.
+
+Contra a API falsa (benchmarks/fake_github.py), grava os repositórios de uma organização e mede o custo
+de obter linguagem, tópicos, issues e pull requests abertos, último commit do branch padrão e status
+de arquivado:
+    graphql  enrich_organization: uma consulta para cada 100 repositórios (paginação por cursor)
+    rest     a listagem já traz linguagem, tópicos e arquivado, mas o total de PRs abertos e a data do
+             último commit exigem duas requisições por repositório (/pulls e /commits, com per_page=1)
+O resultado principal é a quantidade de requisições por 1.000 repositórios (e quantas janelas horárias
+de 5.000 requisições do rate limit REST cada caminho consumiria).
+
+Uso:
+    python -m benchmarks.bench_enrichment [--sizes 1000 10000] [--latency-ms 5] [--output resultado.json]
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, Any, List
+
+from benchmarks.fake_github import FakeGitHubServer
+from src.config.config import settings
+
+BENCH_ORG = "bench-org"
+# Requisições por hora permitidas a um token na API REST do GitHub.
+REST_RATE_LIMIT_PER_HOUR = 5000
+
+
+def rest_enrichment(org_name: str, repos_json: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Obtém os mesmos campos do enriquecimento GraphQL usando apenas a API REST."""
+    from src.services.github_api import get_session, parse_last_page
+
+    session = get_session()
+    enrichments = []
+    for repo_json in repos_json:
+        repo_url = f"{settings.github_api_url}/repos/{org_name}/{repo_json['name']}"
+        pulls = session.get(f"{repo_url}/pulls?state=open&per_page=1", timeout=30)
+        pulls.raise_for_status()
+        pull_requests = parse_last_page(pulls.headers.get("Link")) or len(pulls.json())
+        commits = session.get(f"{repo_url}/commits?sha={repo_json['default_branch']}&per_page=1", timeout=30)
+        commits.raise_for_status()
+        last_commit = commits.json()
+        enrichments.append({
+            "github_id": repo_json["id"],
+            "linguagem": repo_json["language"],
+            "topicos": repo_json["topics"],
+            "issues_abertas": repo_json["open_issues_count"] - pull_requests,
+            "pull_requests_abertos": pull_requests,
+            "data_ultimo_commit": last_commit[0]["commit"]["committer"]["date"] if last_commit else None,
+            "arquivado": int(repo_json["archived"]),
+        })
+    return enrichments
+
+
+def run_case(work_dir: str, size: int, latency_ms: float) -> Dict[str, Any]:
+    from src.models.model import SchemaManager, close_all_pools
+    from src.repositories.github_repository import github_repository
+    from src.services.github_api import fetch_org_repos, extract_repo_info
+    from src.services.github_graphql import enrich_organization
+
+    # Sem limite no servidor falso: o custo em janelas do rate limit é calculado a partir das contagens.
+    with FakeGitHubServer(repos_per_org=size, latency_ms=latency_ms, rate_limit=10 ** 9) as server:
+        settings.override(github_api_url=server.url, github_graphql_url=f"{server.url}/graphql",
+                          database_name=os.path.join(work_dir, f"enrich_{size}.db"),
+                          http_cache_path=os.path.join(work_dir, f"http_cache_{size}.db"))
+        SchemaManager().create_all_tables()
+        repos_json, _ = fetch_org_repos(BENCH_ORG, max_workers=settings.github_max_workers)
+        github_repository.upsert_repositories({**extract_repo_info(repo_json), "projeto_id": None}
+                                              for repo_json in repos_json)
+        list_requests = server.state.requests
+
+        server.state.reset_counters()
+        started_at = time.perf_counter()
+        graphql = enrich_organization(BENCH_ORG)
+        graphql_seconds = time.perf_counter() - started_at
+        graphql_requests = server.state.requests
+
+        server.state.reset_counters()
+        started_at = time.perf_counter()
+        rest = rest_enrichment(BENCH_ORG, repos_json)
+        rest_seconds = time.perf_counter() - started_at
+        rest_requests = server.state.requests
+
+    # Confere que os dois caminhos produzem os mesmos valores.
+    with github_repository.db_manager as conn:
+        stored = {row["github_id"]: row for row in conn.execute(
+            "SELECT github_id, issues_abertas, pull_requests_abertos, data_ultimo_commit FROM Repositorios")}
+    mismatches = sum(1 for enrichment in rest
+                     if (stored[enrichment["github_id"]]["issues_abertas"],
+                         stored[enrichment["github_id"]]["pull_requests_abertos"],
+                         stored[enrichment["github_id"]]["data_ultimo_commit"])
+                     != (enrichment["issues_abertas"], enrichment["pull_requests_abertos"],
+                         enrichment["data_ultimo_commit"]))
+    close_all_pools()
+
+    return {
+        "repositorios": size,
+        "requisicoes_listagem": list_requests,
+        "graphql": {"requisicoes": graphql_requests, "por_1k_repos": graphql_requests / size * 1000,
+                    "janelas_rate_limit": math.ceil(graphql_requests / REST_RATE_LIMIT_PER_HOUR),
+                    "tempo_s": graphql_seconds, "atualizados": graphql["atualizados"]},
+        "rest": {"requisicoes": rest_requests, "por_1k_repos": rest_requests / size * 1000,
+                 "janelas_rate_limit": math.ceil(rest_requests / REST_RATE_LIMIT_PER_HOUR),
+                 "tempo_s": rest_seconds},
+        "divergencias": mismatches,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--latency-ms", type=float, default=5, help="Latência injetada em cada resposta da API.")
+    parser.add_argument("--output", help="Arquivo JSON onde gravar os resultados.")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("GITHUB_TOKEN", "benchmark")
+    logging.basicConfig(level=logging.WARNING)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="repo_monitor_bench_enrich_") as work_dir:
+        for size in args.sizes:
+            result = run_case(work_dir, size, args.latency_ms)
+            results.append(result)
+            print(f"[{size}] GraphQL: {result['graphql']['por_1k_repos']:.0f} req/1k repos "
+                  f"({result['graphql']['tempo_s']:.2f} s); REST: {result['rest']['por_1k_repos']:.0f} req/1k repos "
+                  f"({result['rest']['tempo_s']:.2f} s); divergências: {result['divergencias']}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark do tempo de inicialização (import) da aplicação.
+
+Executa `python -X importtime -c "import main"` várias vezes em subprocessos novos, sem GITHUB_TOKEN,
+e reporta o tempo cumulativo de import do módulo principal (mediana), os módulos mais custosos
+e se dependências pesadas (requests, yaml, dotenv) foram carregadas já no import.
+
+Uso:
+    python -m benchmarks.bench_import_time [--runs 10] [--module main] [--output resultado.json]
+                                           [--baseline resultado_anterior.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, Any, List, Optional, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Módulos que não devem ser importados só por carregar a aplicação.
+LAZY_MODULES = ["requests", "yaml", "dotenv"]
+
+
+def _parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """Converte a saída de -X importtime em (módulo, tempo próprio us, tempo cumulativo us)."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append((name.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def measure_once(module: str) -> Dict[str, Any]:
+    """Importa o módulo em um subprocesso novo e retorna o tempo cumulativo e os módulos carregados."""
+    env = {key: value for key, value in os.environ.items() if key != "GITHUB_TOKEN"}
+    env["PYTHONPATH"] = PROJECT_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    code = f"import sys, {module}; print(','.join(sorted(sys.modules)))"
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                               cwd=PROJECT_ROOT, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Falha ao importar '{module}':\n{completed.stderr}")
+    entries = _parse_importtime(completed.stderr)
+    loaded = set(completed.stdout.strip().split(","))
+    total_us = next((cumulative for name, _, cumulative in entries if name == module), 0)
+    return {
+        "total_us": total_us,
+        "modulos": entries,
+        "carregados": [name for name in LAZY_MODULES if name in loaded],
+    }
+
+
+def run(module: str, runs: int) -> Dict[str, Any]:
+    measurements = [measure_once(module) for _ in range(runs)]
+    totals = [measurement["total_us"] for measurement in measurements]
+    top = sorted(measurements[-1]["modulos"], key=lambda entry: entry[1], reverse=True)[:15]
+    return {
+        "modulo": module,
+        "execucoes": runs,
+        "mediana_ms": statistics.median(totals) / 1000,
+        "min_ms": min(totals) / 1000,
+        "max_ms": max(totals) / 1000,
+        "dependencias_carregadas": measurements[-1]["carregados"],
+        "mais_custosos": [{"modulo": name, "proprio_ms": self_us / 1000, "cumulativo_ms": cumulative_us / 1000}
+                          for name, self_us, cumulative_us in top],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--output", help="Arquivo JSON onde gravar o resultado.")
+    parser.add_argument("--baseline", help="Resultado JSON anterior para comparação.")
+    args = parser.parse_args(argv)
+
+    result = run(args.module, args.runs)
+    print(f"import {result['modulo']}: mediana {result['mediana_ms']:.1f} ms "
+          f"(min {result['min_ms']:.1f} ms, max {result['max_ms']:.1f} ms, {result['execucoes']} execuções)")
+    for entry in result["mais_custosos"]:
+        print(f"  {entry['modulo']:<45} {entry['proprio_ms']:8.2f} ms  (cumulativo {entry['cumulativo_ms']:.2f} ms)")
+    if result["dependencias_carregadas"]:
+        print(f"Atenção: dependências carregadas no import: {', '.join(result['dependencias_carregadas'])}")
+
+    baseline: Optional[Dict[str, Any]] = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        result["baseline_mediana_ms"] = baseline["mediana_ms"]
+        print(f"Baseline: {baseline['mediana_ms']:.1f} ms -> {result['mediana_ms']:.1f} ms "
+              f"({result['mediana_ms'] - baseline['mediana_ms']:+.1f} ms)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
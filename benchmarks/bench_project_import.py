@@ -0,0 +1,126 @@
+"""
+Benchmark da importação do catálogo de projetos (CSV e JSON).
+
+Gera catálogos sintéticos com N projetos e compara, em bancos novos:
+    streaming   bulk_import_projects (leitura incremental + executemany INSERT OR IGNORE em lotes)
+    por_linha   project_repository.insert_project, um commit por projeto (caminho antigo)
+O tempo é medido sem instrumentação; o pico de memória Python é medido com tracemalloc em uma segunda
+execução (inclui o mapa nome -> ID retornado ao fim, proporcional ao catálogo, mas não o arquivo lido).
+
+Uso:
+    python -m benchmarks.bench_project_import [--sizes 10000 100000] [--formats csv json] [--output resultado.json]
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, Any, List
+
+from src.config.config import settings
+
+# O caminho linha a linha é lento demais para catálogos muito grandes.
+BY_ROW_MAX_PROJECTS = 20000
+
+
+def write_catalog(path: str, file_format: str, size: int):
+    """Grava um catálogo sintético de 'size' projetos no formato informado."""
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        if file_format == "csv":
+            writer = csv.writer(file)
+            writer.writerow(["organizacao_github", "nome", "descricao"])
+            for i in range(size):
+                writer.writerow([f"org-{i % 10}", f"Projeto {i}", f"Descrição do projeto {i}"])
+        else:
+            file.write("[")
+            for i in range(size):
+                if i:
+                    file.write(",\n")
+                json.dump({"organizacao_github": f"org-{i % 10}", "nome": f"Projeto {i}",
+                           "descricao": f"Descrição do projeto {i}"}, file, ensure_ascii=False)
+            file.write("]")
+
+
+def _read_rows(path: str, file_format: str):
+    with open(path, encoding="utf-8") as file:
+        rows = list(csv.DictReader(file)) if file_format == "csv" else json.load(file)
+    return [(row["nome"], row.get("descricao")) for row in rows]
+
+
+def _import(work_dir: str, catalog: str, file_format: str, mode: str, run: str) -> int:
+    """Importa o catálogo em um banco novo e retorna o tamanho do mapa nome -> ID resultante."""
+    from src.models.model import SchemaManager, close_all_pools
+    from src.repositories.project_repository import project_repository
+    from src.services.project_importer import bulk_import_projects
+
+    settings.override(database_name=os.path.join(work_dir, f"{mode}_{run}_{os.path.basename(catalog)}.db"))
+    SchemaManager().create_all_tables()
+    try:
+        if mode == "streaming":
+            return len(bulk_import_projects(catalog, file_format)["projetos"])
+        for nome, descricao in _read_rows(catalog, file_format):
+            project_repository.insert_project(nome, descricao)
+        return len(project_repository.get_all_project_ids())
+    finally:
+        close_all_pools()
+
+
+def run_case(work_dir: str, file_format: str, size: int, mode: str) -> Dict[str, Any]:
+    catalog = os.path.join(work_dir, f"projetos_{size}.{file_format}")
+    if not os.path.exists(catalog):
+        write_catalog(catalog, file_format, size)
+
+    started_at = time.perf_counter()
+    mapped = _import(work_dir, catalog, file_format, mode, "tempo")
+    elapsed = time.perf_counter() - started_at
+
+    tracemalloc.start()
+    _import(work_dir, catalog, file_format, mode, "memoria")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "formato": file_format,
+        "modo": mode,
+        "projetos": size,
+        "mapeados": mapped,
+        "tempo_s": elapsed,
+        "linhas_por_s": size / elapsed if elapsed else None,
+        "pico_memoria_mb": peak / 1024 / 1024,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--formats", nargs="+", choices=["csv", "json"], default=["csv", "json"])
+    parser.add_argument("--output", help="Arquivo JSON onde gravar os resultados.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="repo_monitor_bench_projects_") as work_dir:
+        for size in args.sizes:
+            for file_format in args.formats:
+                for mode in ("streaming", "por_linha"):
+                    if mode == "por_linha" and size > BY_ROW_MAX_PROJECTS:
+                        print(f"[{size}] {file_format} {mode}: ignorado (mais de {BY_ROW_MAX_PROJECTS} projetos)",
+                              file=sys.stderr)
+                        continue
+                    result = run_case(work_dir, file_format, size, mode)
+                    results.append(result)
+                    print(f"[{size}] {file_format} {mode}: {result['tempo_s']:.2f} s, "
+                          f"{result['linhas_por_s']:,.0f} linhas/s, pico {result['pico_memoria_mb']:.1f} MiB",
+                          file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark da reatribuição de projetos (main.py --reassign) sobre repositórios já gravados.
+
+Grava N repositórios sintéticos (nomes de benchmarks/fake_github.py) todos no projeto padrão e mede,
+com as regras de data/project_assignment_rules.yaml:
+    dry-run      avaliação das regras sobre os nomes gravados e montagem do diff por projeto
+    conjuntos    reassign_repositories: um UPDATE por projeto de destino, em uma única transação
+    linha a linha  o equivalente com um UPDATE e um commit por repositório (como insert_or_update_repository)
+Nenhuma requisição à API é feita.
+
+Uso:
+    python -m benchmarks.bench_reassign [--sizes 10000 50000] [--output resultado.json]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, Any
+
+from benchmarks.fake_github import generate_repos
+from src.config.config import DEFAULT_PROJECT_NAME, settings
+
+BENCH_ORG = "bench-org"
+
+
+def _prepare(db_path: str, size: int):
+    from src.models.model import SchemaManager
+    from src.repositories.github_repository import github_repository
+    from src.repositories.project_repository import project_repository
+    from src.services.github_api import extract_repo_info
+    from src.services.rule_loader import load_compiled_rules
+    import main
+
+    settings.override(database_name=db_path)
+    SchemaManager().create_all_tables()
+    rule_set = load_compiled_rules()
+    project_repository.insert_projects((name, None) for name in [*rule_set.project_names, DEFAULT_PROJECT_NAME])
+    matcher = main.build_rule_matcher(rule_set)
+    github_repository.upsert_repositories({**extract_repo_info(repo_json), "projeto_id": matcher.default_project_id}
+                                          for repo_json in generate_repos(BENCH_ORG, size))
+    return matcher
+
+
+def run_case(work_dir: str, size: int) -> Dict[str, Any]:
+    from src.models.model import close_all_pools
+    from src.repositories.github_repository import github_repository
+    from src.services.reassignment import plan_reassignment, reassign_repositories
+
+    matcher = _prepare(os.path.join(work_dir, f"reassign_{size}.db"), size)
+    started_at = time.perf_counter()
+    reassign_repositories(matcher, dry_run=True)
+    dry_run_seconds = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    result = reassign_repositories(matcher)
+    set_based_seconds = time.perf_counter() - started_at
+    close_all_pools()
+
+    matcher = _prepare(os.path.join(work_dir, f"reassign_{size}_rows.db"), size)
+    started_at = time.perf_counter()
+    plan = plan_reassignment(matcher)
+    target_by_name = {repo_name: target for repo_name, _, target in plan["detalhes"]}
+    with github_repository.db_manager as conn:
+        for repo_id, repo_name, _ in github_repository.get_project_assignments():
+            if repo_name in target_by_name:
+                conn.execute("UPDATE Repositorios SET projeto_id = ? WHERE id = ?", (target_by_name[repo_name], repo_id))
+                conn.commit()
+    row_seconds = time.perf_counter() - started_at
+    close_all_pools()
+
+    return {
+        "repositorios": size,
+        "movidos": result["movidos"],
+        "atualizados": result["atualizados"],
+        "dry_run_s": dry_run_seconds,
+        "conjuntos_s": set_based_seconds,
+        "linha_a_linha_s": row_seconds,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--output", help="Arquivo JSON onde gravar os resultados.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="repo_monitor_bench_reassign_") as work_dir:
+        settings.override(rules_cache_path=os.path.join(work_dir, "rules.pickle"))
+        for size in args.sizes:
+            result = run_case(work_dir, size)
+            results.append(result)
+            print(f"[{size}] {result['movidos']} movidos; dry-run: {result['dry_run_s']:.2f} s, "
+                  f"em conjunto: {result['conjuntos_s']:.2f} s, linha a linha: {result['linha_a_linha_s']:.2f} s",
+                  file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Benchmark das consultas de relatório (src/repositories/report_repository.py) sobre N repositórios.
+
+Grava N repositórios sintéticos distribuídos entre 200 projetos e mede:
+    resumo       totais por projeto lidos de ProjetoResumo versus o GROUP BY sobre Repositorios
+    top          principais projetos por estrelas (ProjetoResumo) versus GROUP BY + ORDER BY
+    stale        100 repositórios mais antigos com os índices versus a varredura da tabela (NOT INDEXED)
+    stale/projeto  o mesmo filtrando um projeto (índice (projeto_id, data_ultima_atualizacao))
+    upsert       custo dos gatilhos de ProjetoResumo: atualização de todos os repositórios com e sem gatilhos
+Também confere que ProjetoResumo, mantida incrementalmente, é igual ao recálculo completo.
+
+Uso:
+    python -m benchmarks.bench_reports [--sizes 100000] [--runs 5] [--output resultado.json]
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Any, List
+
+from benchmarks.fake_github import generate_repos
+from src.config.config import settings
+
+BENCH_ORG = "bench-org"
+PROJECT_COUNT = 200
+
+_GROUP_BY_SQL = """
+    SELECT projeto_id, COUNT(*), SUM(visibilidade = 'público'), SUM(visibilidade <> 'público'),
+           SUM(estrelas), SUM(forks), MAX(data_ultima_atualizacao)
+    FROM Repositorios GROUP BY projeto_id
+"""
+
+
+def _median_time(function: Callable[[], Any], runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started_at = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started_at)
+    return statistics.median(timings)
+
+
+def _repo_rows(size: int, seed: int) -> List[Dict[str, Any]]:
+    from src.services.github_api import extract_repo_info
+
+    rng = random.Random(seed)
+    return [{**extract_repo_info(repo_json), "projeto_id": rng.randint(1, PROJECT_COUNT),
+             "estrelas": repo_json["stargazers_count"] + seed}
+            for repo_json in generate_repos(BENCH_ORG, size)]
+
+
+def _timed_upsert(db_path: str, rows: List[Dict[str, Any]]) -> float:
+    from src.models.model import close_all_pools
+    from src.repositories.github_repository import github_repository
+
+    close_all_pools()
+    settings.override(database_name=db_path)
+    started_at = time.perf_counter()
+    github_repository.upsert_repositories(rows)
+    return time.perf_counter() - started_at
+
+
+def run_case(work_dir: str, size: int, runs: int) -> Dict[str, Any]:
+    from src.models.model import SchemaManager, close_all_pools
+    from src.repositories.project_repository import project_repository
+    from src.repositories.report_repository import report_repository
+
+    db_path = os.path.join(work_dir, f"reports_{size}.db")
+    settings.override(database_name=db_path)
+    SchemaManager().create_all_tables()
+    project_repository.insert_projects((f"Projeto {i}", None) for i in range(1, PROJECT_COUNT + 1))
+    _timed_upsert(db_path, _repo_rows(size, seed=0))
+
+    # Custo dos gatilhos: a mesma atualização (estrelas alteradas em todos os repositórios) com e sem eles.
+    no_triggers_path = os.path.join(work_dir, f"reports_{size}_sem_gatilhos.db")
+    close_all_pools()
+    shutil.copyfile(db_path, no_triggers_path)
+    with sqlite3.connect(no_triggers_path) as conn:
+        for (trigger_name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'").fetchall():
+            conn.execute(f"DROP TRIGGER {trigger_name}")
+    changed_rows = _repo_rows(size, seed=1)
+    upsert_without_triggers = _timed_upsert(no_triggers_path, changed_rows)
+    upsert_with_triggers = _timed_upsert(db_path, changed_rows)
+
+    with report_repository.db_manager as conn:
+        summary_rows = {row["projeto_id"]: tuple(row)[1:] for row in conn.execute("SELECT * FROM ProjetoResumo")}
+        recomputed = {row[0]: tuple(row[1:]) for row in conn.execute(_GROUP_BY_SQL)}
+        stale_sql = """
+            SELECT nome, data_ultima_atualizacao FROM Repositorios {hint}
+            WHERE data_ultima_atualizacao < ? ORDER BY data_ultima_atualizacao LIMIT 100
+        """
+        cutoff = "2023-01-01T00:00:00Z"
+        result = {
+            "repositorios": size,
+            "resumo_consistente": summary_rows == recomputed,
+            "resumo_tabela_ms": _median_time(report_repository.get_project_summaries, runs) * 1000,
+            "resumo_group_by_ms": _median_time(lambda: conn.execute(_GROUP_BY_SQL).fetchall(), runs) * 1000,
+            "top_tabela_ms": _median_time(lambda: report_repository.get_top_projects(10), runs) * 1000,
+            "top_group_by_ms": _median_time(lambda: conn.execute(
+                "SELECT projeto_id, SUM(estrelas) AS total FROM Repositorios GROUP BY projeto_id "
+                "ORDER BY total DESC LIMIT 10").fetchall(), runs) * 1000,
+            "stale_indice_ms": _median_time(lambda: conn.execute(
+                stale_sql.format(hint=""), (cutoff,)).fetchall(), runs) * 1000,
+            "stale_varredura_ms": _median_time(lambda: conn.execute(
+                stale_sql.format(hint="NOT INDEXED"), (cutoff,)).fetchall(), runs) * 1000,
+            "stale_projeto_ms": _median_time(lambda: report_repository.get_stale_repositories(
+                days=365, projeto_id=1), runs) * 1000,
+            "upsert_com_gatilhos_s": upsert_with_triggers,
+            "upsert_sem_gatilhos_s": upsert_without_triggers,
+        }
+    close_all_pools()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="Arquivo JSON onde gravar os resultados.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="repo_monitor_bench_reports_") as work_dir:
+        for size in args.sizes:
+            result = run_case(work_dir, size, args.runs)
+            results.append(result)
+            print(f"[{size}] resumo: {result['resumo_tabela_ms']:.2f} ms (GROUP BY: {result['resumo_group_by_ms']:.1f} ms); "
+                  f"top: {result['top_tabela_ms']:.2f} ms (GROUP BY: {result['top_group_by_ms']:.1f} ms); "
+                  f"stale: {result['stale_indice_ms']:.2f} ms (varredura: {result['stale_varredura_ms']:.1f} ms); "
+                  f"upsert: {result['upsert_com_gatilhos_s']:.2f} s com gatilhos, "
+                  f"{result['upsert_sem_gatilhos_s']:.2f} s sem; consistente: {result['resumo_consistente']}",
+                  file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark do carregamento das regras de atribuição: análise do YAML + compilação versus cache compilado.
+
+Gera um arquivo de regras sintético com N regras e mede, em subprocessos novos (sem o cache de
+expressões regulares do processo), o tempo de load_compiled_rules() sem cache (análise do YAML com
+PyYAML, validação e compilação) e com o cache '<banco>.rules.pickle' já gravado.
+
+Uso:
+    python -m benchmarks.bench_rule_cache [--rules 1000 5000] [--keywords 5] [--runs 3] [--output resultado.json]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, Any, List
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_CHILD_CODE = """
+import time
+started_at = time.perf_counter()
+from src.services.rule_loader import load_compiled_rules
+rule_set = load_compiled_rules()
+print(time.perf_counter() - started_at, len(rule_set))
+"""
+
+
+def write_rules(path: str, rule_count: int, keywords_per_rule: int):
+    """Grava um arquivo de regras sintético (YAML) com rule_count regras."""
+    rng = random.Random(rule_count)
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("rules:\n")
+        for i in range(rule_count):
+            file.write(f'  - project_name: "Projeto {i % 200}"\n    keywords:\n')
+            for _ in range(keywords_per_rule):
+                file.write(f'      - "kw{rng.randint(0, 10 ** 7)}"\n')
+
+
+def _load_in_subprocess(env: Dict[str, str]) -> float:
+    completed = subprocess.run([sys.executable, "-c", _CHILD_CODE], cwd=PROJECT_ROOT, env=env,
+                               capture_output=True, text=True, check=True)
+    return float(completed.stdout.split()[0])
+
+
+def run_case(work_dir: str, rule_count: int, keywords_per_rule: int, runs: int) -> Dict[str, Any]:
+    rules_path = os.path.join(work_dir, f"rules_{rule_count}.yaml")
+    cache_path = os.path.join(work_dir, f"rules_{rule_count}.rules.pickle")
+    write_rules(rules_path, rule_count, keywords_per_rule)
+    env = dict(os.environ)
+    env.update({
+        "PROJECT_ASSIGNMENT_RULES_PATH": rules_path,
+        "RULES_CACHE_PATH": cache_path,
+        "PYTHONPATH": PROJECT_ROOT + os.pathsep + env.get("PYTHONPATH", ""),
+    })
+
+    uncached = []
+    for _ in range(runs):
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+        uncached.append(_load_in_subprocess(env))
+    cached = [_load_in_subprocess(env) for _ in range(runs)]
+    return {
+        "regras": rule_count,
+        "palavras_chave": rule_count * keywords_per_rule,
+        "yaml_s": statistics.median(uncached),
+        "cache_s": statistics.median(cached),
+        "tamanho_yaml_kb": os.path.getsize(rules_path) / 1024,
+        "tamanho_cache_kb": os.path.getsize(cache_path) / 1024,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rules", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--keywords", type=int, default=5, help="Palavras-chave por regra.")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--output", help="Arquivo JSON onde gravar os resultados.")
+    args = parser.parse_args(argv)
+
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="repo_monitor_bench_rules_") as work_dir:
+        for rule_count in args.rules:
+            result = run_case(work_dir, rule_count, args.keywords, args.runs)
+            results.append(result)
+            print(f"[{rule_count} regras] YAML: {result['yaml_s'] * 1000:.0f} ms, "
+                  f"cache: {result['cache_s'] * 1000:.0f} ms ({result['yaml_s'] / result['cache_s']:.1f}x)",
+                  file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
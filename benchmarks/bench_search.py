@@ -0,0 +1,163 @@
+"""
+Benchmark da busca textual (índice FTS5 RepositoriosBusca, src/repositories/search_repository.py).
+
+Grava N repositórios sintéticos (nome, descrição e tópicos) e mede, pela mediana de várias execuções:
+    busca      search_repository.search (bm25, 20 resultados) versus LIKE '%...%' em nome e descrição
+               (que precisa de todas as linhas que casam para ordená-las), para o nome de um repositório,
+               um termo comum, dois termos e um que casa com todos os repositórios
+    prévia     find_by_name_fragment (prévia de palavra-chave das regras) versus instr(lower(nome)) na tabela
+    gatilhos   custo de manter o índice: inserção de todos os repositórios e nova sincronização com 5%
+               das descrições alteradas, página a página, com e sem o índice (gatilhos e reindexação)
+Também confere que o índice mantido pelos gatilhos é igual ao recriado do zero.
+
+Uso:
+    python -m benchmarks.bench_search [--sizes 100000] [--runs 5] [--output resultado.json]
+"""
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Any, List
+
+from benchmarks.fake_github import generate_repos
+from src.config.config import settings
+
+BENCH_ORG = "bench-org"
+PROJECT_COUNT = 200
+QUERIES = {"comum": "unity", "dois_termos": "docs wiki", "todos": "sintético"}
+
+
+def _median_time(function: Callable[[], Any], runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started_at = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started_at)
+    return statistics.median(timings)
+
+
+def _repo_rows(size: int, changed_every: int = 0) -> List[Dict[str, Any]]:
+    from src.services.github_api import extract_repo_info
+
+    rows = []
+    for index, repo_json in enumerate(generate_repos(BENCH_ORG, size)):
+        row = {**extract_repo_info(repo_json), "projeto_id": index % PROJECT_COUNT + 1}
+        if changed_every and index % changed_every == 0:
+            row["descricao"] += " (alterado)"
+        rows.append(row)
+    return rows
+
+
+def _prepare(db_path: str, with_index: bool) -> None:
+    from src.models.model import SchemaManager, close_all_pools
+    from src.repositories.project_repository import project_repository
+
+    close_all_pools()
+    settings.override(database_name=db_path)
+    SchemaManager().create_all_tables()
+    project_repository.insert_projects((f"Projeto {i}", None) for i in range(1, PROJECT_COUNT + 1))
+    if not with_index:
+        close_all_pools()
+        with sqlite3.connect(db_path) as conn:
+            for suffix in ("insert", "update", "delete", "projeto"):
+                conn.execute(f"DROP TRIGGER trg_repositorios_busca_{suffix}")
+            conn.execute("DROP TABLE RepositoriosBusca")
+
+
+def _timed_sync(rows: List[Dict[str, Any]]) -> float:
+    """Grava os repositórios página a página, como OrganizationSync, aplicando as alterações do índice."""
+    from src.repositories.github_repository import github_repository
+    from src.repositories.search_repository import search_repository
+    from src.services.github_api import PER_PAGE
+
+    started_at = time.perf_counter()
+    for start in range(0, len(rows), PER_PAGE):
+        github_repository.upsert_repositories(rows[start:start + PER_PAGE])
+        search_repository.apply_pending_changes()
+    return time.perf_counter() - started_at
+
+
+def run_case(work_dir: str, size: int, runs: int) -> Dict[str, Any]:
+    from src.models.model import close_all_pools
+    from src.repositories.search_repository import search_repository
+
+    rows = _repo_rows(size)
+    changed_rows = _repo_rows(size, changed_every=20)
+    result: Dict[str, Any] = {"repositorios": size}
+
+    # Custo do índice: mesmo esquema, com e sem RepositoriosBusca e seus gatilhos.
+    _prepare(os.path.join(work_dir, f"busca_{size}_sem_indice.db"), with_index=False)
+    result["insercao_sem_indice_s"] = _timed_sync(rows)
+    result["resincronizacao_sem_indice_s"] = _timed_sync(changed_rows)
+    _prepare(os.path.join(work_dir, f"busca_{size}.db"), with_index=True)
+    result["insercao_com_indice_s"] = _timed_sync(rows)
+    result["resincronizacao_com_indice_s"] = _timed_sync(changed_rows)
+
+    with search_repository.db_manager as conn:
+        maintained = conn.execute("SELECT rowid, * FROM RepositoriosBusca ORDER BY rowid").fetchall()
+    search_repository.rebuild_index()
+    with search_repository.db_manager as conn:
+        rebuilt = conn.execute("SELECT rowid, * FROM RepositoriosBusca ORDER BY rowid").fetchall()
+        result["indice_consistente"] = [tuple(row) for row in maintained] == [tuple(row) for row in rebuilt]
+        result["tokenizador"] = search_repository.get_tokenizer()
+
+        queries = {"raro": rows[size // 2]["nome"], **QUERIES}
+        result["consultas"] = queries
+        for name, text in queries.items():
+            like_params = [f"%{term}%" for term in text.split() for _ in range(2)]
+            like_filter = " AND ".join("(nome LIKE ? OR descricao LIKE ?)" for _ in text.split())
+            result[f"busca_{name}"] = {
+                "resultados": len(search_repository.search(text, limit=20)),
+                "fts_ms": _median_time(lambda: search_repository.search(text, limit=20), runs) * 1000,
+                "like_ms": _median_time(lambda: conn.execute(
+                    f"SELECT id, nome FROM Repositorios WHERE {like_filter}", like_params).fetchall(),
+                    runs) * 1000,
+            }
+
+        keyword = "unity"
+        result["previa"] = {
+            "repositorios": len(search_repository.find_by_name_fragment(keyword)),
+            "fts_ms": _median_time(lambda: search_repository.find_by_name_fragment(keyword), runs) * 1000,
+            "varredura_ms": _median_time(lambda: conn.execute(
+                "SELECT id, nome, projeto_id FROM Repositorios WHERE instr(lower(nome), ?) > 0",
+                (keyword,)).fetchall(), runs) * 1000,
+        }
+    close_all_pools()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="Arquivo JSON onde gravar os resultados.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="repo_monitor_bench_search_") as work_dir:
+        for size in args.sizes:
+            result = run_case(work_dir, size, args.runs)
+            results.append(result)
+            searches = "; ".join(
+                f"{name}: {result[f'busca_{name}']['fts_ms']:.2f} ms (LIKE: {result[f'busca_{name}']['like_ms']:.1f} ms)"
+                for name in result["consultas"])
+            print(f"[{size}] {result['tokenizador']}; {searches}; prévia: {result['previa']['fts_ms']:.2f} ms "
+                  f"(varredura: {result['previa']['varredura_ms']:.1f} ms); inserção: "
+                  f"{result['insercao_com_indice_s']:.2f} s com índice, {result['insercao_sem_indice_s']:.2f} s sem; "
+                  f"ressincronização 5%: {result['resincronizacao_com_indice_s']:.2f} s com, "
+                  f"{result['resincronizacao_sem_indice_s']:.2f} s sem; consistente: {result['indice_consistente']}",
+                  file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
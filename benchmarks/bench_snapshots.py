@@ -0,0 +1,132 @@
+"""
+Benchmark do histórico de estrelas/forks (RepositorioSnapshots).
+
+Simula um ano de execuções diárias para 10k repositórios, em que apenas uma fração dos repositórios
+muda a cada dia, e mede o tempo de gravação dos snapshots, o tamanho da tabela e o tempo das
+consultas de crescimento por projeto, comparando com um cálculo em Python repositório a repositório.
+
+Uso:
+    python -m benchmarks.bench_snapshots [--repos 10000] [--days 365] [--output resultados.json]
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("GITHUB_TOKEN", "benchmark")
+_tmp_dir = tempfile.mkdtemp(prefix="bench_snapshots_")
+os.environ["DATABASE_NAME"] = os.path.join(_tmp_dir, "bench.db")
+
+from src.models.model import SchemaManager  # noqa: E402
+from src.repositories.snapshot_repository import snapshot_repository  # noqa: E402
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+def populate(conn, repos: int, projects: int):
+    conn.executemany("INSERT INTO Projetos (nome) VALUES (?)", [(f"Projeto {i}",) for i in range(projects)])
+    conn.executemany("""
+        INSERT INTO Repositorios (github_id, nome, visibilidade, data_criacao, data_ultima_atualizacao,
+                                  estrelas, forks, url, projeto_id)
+        VALUES (?, ?, 'público', '2020-01-01T00:00:00Z', '2020-01-01T00:00:00Z', ?, ?, ?, ?)
+    """, [(i, f"repo-{i}", random.randint(0, 500), random.randint(0, 50), f"https://github.com/bench/repo-{i}",
+           i % projects + 1) for i in range(1, repos + 1)])
+    conn.commit()
+
+
+def simulate_day(conn, repos: int, change_rate: float):
+    changed = random.sample(range(1, repos + 1), int(repos * change_rate))
+    conn.executemany("UPDATE Repositorios SET estrelas = estrelas + ?, forks = forks + ? WHERE id = ?",
+                     [(random.randint(1, 5), int(random.random() < 0.2), repo_id) for repo_id in changed])
+    conn.commit()
+
+
+def python_loop_growth(conn, days: int, now: int):
+    """Cálculo equivalente a get_growth_by_project feito em Python, consultando cada repositório."""
+    cutoff = now - days * SECONDS_PER_DAY
+    growth = {}
+    for repo in conn.execute("SELECT id, projeto_id FROM Repositorios").fetchall():
+        history = conn.execute(
+            "SELECT coletado_em, estrelas, forks FROM RepositorioSnapshots WHERE repositorio_id = ? ORDER BY coletado_em",
+            (repo[0],)).fetchall()
+        if not history:
+            continue
+        before = [row for row in history if row[0] <= cutoff]
+        base = before[-1] if before else history[0]
+        stars, forks = growth.get(repo[1], (0, 0))
+        growth[repo[1]] = (stars + history[-1][1] - base[1], forks + history[-1][2] - base[2])
+    return growth
+
+
+def timed(func, *args):
+    started_at = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started_at
+
+
+def run(repos: int, days: int, projects: int, change_rate: float):
+    random.seed(42)
+    logging.getLogger().setLevel(logging.WARNING)
+    schema_manager = SchemaManager(os.environ["DATABASE_NAME"])
+    schema_manager.create_all_tables()
+    with schema_manager.db_manager as conn:
+        populate(conn, repos, projects)
+
+        start = int(time.time()) - days * SECONDS_PER_DAY
+        record_times = []
+        for day in range(days):
+            simulate_day(conn, repos, change_rate)
+            _, elapsed = timed(snapshot_repository.record_snapshots, start + day * SECONDS_PER_DAY)
+            record_times.append(elapsed)
+
+        snapshot_rows = conn.execute("SELECT COUNT(*) FROM RepositorioSnapshots").fetchone()[0]
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        now = start + (days - 1) * SECONDS_PER_DAY
+
+        queries = {}
+        for window in (7, 30, 90, 365):
+            _, elapsed = timed(snapshot_repository.get_growth_by_project, window, now)
+            queries[f"crescimento_{window}_dias_s"] = elapsed
+        _, loop_elapsed = timed(python_loop_growth, conn, 30, now)
+
+    db_size = os.path.getsize(os.environ["DATABASE_NAME"])
+    return {
+        "repositorios": repos,
+        "dias": days,
+        "taxa_de_mudanca_diaria": change_rate,
+        "linhas_snapshot": snapshot_rows,
+        "linhas_snapshot_sem_deltas": repos * days,
+        "tamanho_banco_bytes": db_size,
+        "tamanho_pagina": page_size,
+        "gravacao_media_s": sum(record_times) / len(record_times),
+        "gravacao_max_s": max(record_times),
+        "gravacao_total_s": sum(record_times),
+        **queries,
+        "crescimento_30_dias_loop_python_s": loop_elapsed,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repos", type=int, default=10000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--change-rate", type=float, default=0.03)
+    parser.add_argument("--output", help="Arquivo JSON onde gravar os resultados.")
+    args = parser.parse_args(argv)
+
+    results = run(args.repos, args.days, args.projects, args.change_rate)
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Benchmark da coleta em fluxo (página a página) versus a coleta com a lista completa em memória.
+
+Sobe a API falsa do GitHub (benchmarks/fake_github.py) com N repositórios e mede, cada caso em um
+subprocesso novo (tempo total, tempo até a primeira gravação no banco e acréscimo do pico de memória
+residente):
+    lista  fetch_org_repos acumula o JSON de todos os repositórios, que depois vira dicionários
+           (extract_repo_info) e é gravado de uma vez, como era feito antes
+    fluxo  stream_org_repos + OrganizationSync (main._store_organization_repos): cada página vira
+           RepoRecord e é gravada assim que chega
+
+Uso:
+    python -m benchmarks.bench_streaming [--sizes 10000 50000 100000] [--latency-ms 5] [--workers 4]
+                                         [--output resultado.json]
+"""
+import argparse
+import json
+import logging
+import subprocess
+import sys
+import tempfile
+from typing import Dict, Any
+
+from benchmarks.bench_columnar_export import peak_rss_kb
+from benchmarks.run_benchmarks import BENCH_ORG, PROJECT_ROOT, _prepare_environment
+
+CASES = ("lista", "fluxo")
+
+_CHILD_CODE = """
+import json, logging, sys, time
+logging.disable(logging.WARNING)
+from benchmarks.bench_streaming import run_child
+print(json.dumps(run_child(sys.argv[1], int(sys.argv[2]))))
+"""
+
+
+def run_child(case: str, workers: int) -> Dict[str, Any]:
+    """Executa um caso no processo atual (subprocesso filho) e retorna as medições."""
+    import time
+    import main
+    from src.config.config import settings
+    from src.repositories.github_repository import github_repository
+    from src.repositories.sync_state_repository import sync_state_repository
+    from src.services.github_api import fetch_org_repos, extract_repo_info, stream_org_repos
+    from src.services.project_importer import import_projects_from_csv
+    from src.services.rule_loader import load_compiled_rules
+    from src.models.model import SchemaManager
+
+    # Sem mmap: as páginas do banco mapeadas em memória contariam como memória residente do processo.
+    settings.override(github_max_workers=workers, sqlite_mmap_size=0)
+    SchemaManager().create_all_tables()
+    import_projects_from_csv()
+    main.project_repository.insert_project(main.DEFAULT_PROJECT_NAME)
+    main.rule_matcher = main.build_rule_matcher(load_compiled_rules() or [])
+
+    first_write = []
+    upsert_repositories = github_repository.upsert_repositories
+
+    def timed_upsert(repos, *args, **kwargs):
+        if not first_write:
+            first_write.append(time.perf_counter())
+        return upsert_repositories(repos, *args, **kwargs)
+
+    github_repository.upsert_repositories = timed_upsert
+
+    baseline_kb = peak_rss_kb()
+    started_at = time.perf_counter()
+    if case == "lista":
+        repos_json, complete = fetch_org_repos(BENCH_ORG, max_workers=workers)
+        rows = []
+        for repo_json in repos_json:
+            repo_data = extract_repo_info(repo_json)
+            repo_data["projeto_id"] = main.assign_repo_to_project(repo_data["nome"])
+            rows.append(repo_data)
+        github_repository.upsert_repositories(rows)
+        github_repository.delete_missing_repositories(BENCH_ORG, (repo_json["id"] for repo_json in repos_json))
+        sync_state_repository.save_state(BENCH_ORG, max(repo_json["updated_at"] for repo_json in repos_json), True)
+        stored = len(rows)
+    else:
+        sync = main._store_organization_repos(BENCH_ORG, stream_org_repos(BENCH_ORG, max_workers=workers),
+                                              full_reconcile=True)
+        stored = sync.repositories
+    elapsed = time.perf_counter() - started_at
+    return {
+        "repositorios": stored,
+        "tempo_s": elapsed,
+        "primeira_gravacao_s": first_write[0] - started_at if first_write else None,
+        "pico_memoria_mb": (peak_rss_kb() - baseline_kb) / 1024,
+    }
+
+
+def run_case(size: int, latency_ms: float, workers: int) -> Dict[str, Any]:
+    from benchmarks.fake_github import FakeGitHubServer
+
+    result: Dict[str, Any] = {"repositorios": size, "latencia_ms": latency_ms, "workers": workers}
+    with FakeGitHubServer(repos_per_org=size, latency_ms=latency_ms, rate_limit=10 ** 9) as server:
+        for case in CASES:
+            with tempfile.TemporaryDirectory(prefix="repo_monitor_bench_streaming_") as work_dir:
+                env = _prepare_environment(work_dir, server.url)
+                completed = subprocess.run([sys.executable, "-c", _CHILD_CODE, case, str(workers)],
+                                           cwd=PROJECT_ROOT, env=env, capture_output=True, text=True)
+            if completed.returncode != 0:
+                print(completed.stderr, file=sys.stderr)
+                raise RuntimeError(f"Caso '{case}' falhou para {size} repositórios.")
+            result[case] = json.loads(completed.stdout.strip().splitlines()[-1])
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000, 100000])
+    parser.add_argument("--latency-ms", type=float, default=5)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--output", help="Arquivo JSON onde gravar os resultados.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+    results = []
+    for size in args.sizes:
+        result = run_case(size, args.latency_ms, args.workers)
+        results.append(result)
+        summary = "; ".join(
+            f"{case}: {result[case]['tempo_s']:.2f} s, primeira gravação em {result[case]['primeira_gravacao_s']:.2f} s, "
+            f"+{result[case]['pico_memoria_mb']:.0f} MB" for case in CASES)
+        print(f"[{size}] {summary}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark do receptor de webhooks: micro-lotes versus um commit por evento.
+
+Gera entregas sintéticas gravadas em JSON Lines (eventos 'repository' created para N repositórios,
+seguidos de uma rajada de 'star', 'fork' e 'push' sobre eles), sobe o receptor local
+(src/services/webhook_server.py) e as reenvia assinadas com HMAC, como o GitHub faria, medindo o
+tempo até todas estarem aplicadas no banco e a quantidade de transações (lotes) usadas:
+    micro-lotes  WEBHOOK_BATCH_SIZE / WEBHOOK_FLUSH_SECONDS padrão
+    por evento   batch_size=1 (um commit por evento)
+O arquivo gerado também serve para reproduzir localmente com 'python main.py --replay-webhooks'.
+
+Uso:
+    python -m benchmarks.bench_webhooks [--repos 500] [--events 5000] [--output resultado.json]
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, Any, List
+
+from benchmarks.fake_github import generate_repos
+from src.config.config import settings
+
+BENCH_ORG = "bench-org"
+BENCH_SECRET = "benchmark"
+
+
+def _push_repository(repo_json: Dict[str, Any]) -> Dict[str, Any]:
+    """Repositório no formato do payload de 'push', que traz created_at e pushed_at como timestamps Unix."""
+    from datetime import datetime
+
+    created_at = datetime.strptime(repo_json["created_at"], "%Y-%m-%dT%H:%M:%S%z")
+    return dict(repo_json, created_at=int(created_at.timestamp()), pushed_at=int(time.time()))
+
+
+def write_deliveries(path: str, repo_count: int, event_count: int):
+    """Grava entregas sintéticas (uma por linha, no formato do WebhookServer) para repo_count repositórios."""
+    rng = random.Random(repo_count)
+    repos = generate_repos(BENCH_ORG, repo_count)
+    organization = {"login": BENCH_ORG}
+    with open(path, "w", encoding="utf-8") as file:
+        def write(event_name: str, payload: Dict[str, Any]):
+            file.write(json.dumps({"event": event_name, "delivery": None, "payload": payload}) + "\n")
+
+        for repo_json in repos:
+            write("repository", {"action": "created", "repository": repo_json, "organization": organization})
+        for _ in range(event_count):
+            repo_json = rng.choice(repos)
+            event_name = rng.choice(["star", "fork", "push"])
+            if event_name == "star":
+                repo_json["stargazers_count"] += 1
+                write("star", {"action": "created", "repository": repo_json, "organization": organization})
+            elif event_name == "fork":
+                repo_json["forks_count"] += 1
+                write("fork", {"forkee": {"id": 0}, "repository": repo_json, "organization": organization})
+            else:
+                write("push", {"ref": "refs/heads/main", "repository": _push_repository(repo_json),
+                               "organization": organization})
+    return repos
+
+
+def run_case(work_dir: str, deliveries_path: str, repos: List[Dict[str, Any]], label: str,
+             batch_size: int) -> Dict[str, Any]:
+    from src.models.model import SchemaManager, close_all_pools
+    from src.repositories.github_repository import github_repository
+    from src.repositories.project_repository import project_repository
+    from src.services.metrics import metrics
+    from src.services.webhook_server import WebhookReceiver, replay_recorded_deliveries
+
+    settings.override(database_name=os.path.join(work_dir, f"webhooks_{label}.db"), webhook_secret=BENCH_SECRET,
+                      webhook_batch_size=batch_size)
+    SchemaManager().create_all_tables()
+    project_repository.insert_project("Projeto Diversos", "")
+    project_id = project_repository.get_project_id_by_name("Projeto Diversos")
+
+    metrics.reset()
+    receiver = WebhookReceiver(lambda repo_name: project_id, [BENCH_ORG], host="127.0.0.1", port=0)
+    receiver.start()
+    url = receiver.url
+    started_at = time.perf_counter()
+    statuses = replay_recorded_deliveries(deliveries_path, url, BENCH_SECRET)
+    receiver.stop()
+    elapsed = time.perf_counter() - started_at
+
+    # Confere que o estado final do banco é o dos últimos payloads.
+    with github_repository.db_manager as conn:
+        stored = {row["github_id"]: (row["estrelas"], row["forks"])
+                  for row in conn.execute("SELECT github_id, estrelas, forks FROM Repositorios")}
+    mismatches = sum(1 for repo_json in repos
+                     if stored.get(repo_json["id"]) != (repo_json["stargazers_count"], repo_json["forks_count"]))
+    close_all_pools()
+
+    stats = receiver.processor.stats
+    return {"modo": label, "eventos": stats["recebidos"], "lotes": stats["lotes"], "respostas": statuses,
+            "tempo_s": elapsed, "eventos_por_s": stats["recebidos"] / elapsed if elapsed else 0.0,
+            "tempo_gravacao_s": metrics.to_dict()["estagios"].get("webhook_apply", {}).get("tempo_s", 0.0),
+            "divergencias": mismatches}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repos", type=int, default=500)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--output", help="Arquivo JSON onde gravar os resultados.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="repo_monitor_bench_webhooks_") as work_dir:
+        deliveries_path = os.path.join(work_dir, "deliveries.jsonl")
+        repos = write_deliveries(deliveries_path, args.repos, args.events)
+        for label, batch_size in (("micro-lotes", settings.webhook_batch_size), ("por evento", 1)):
+            result = run_case(work_dir, deliveries_path, repos, label, batch_size)
+            results.append(result)
+            print(f"[{label}] {result['eventos']} eventos em {result['lotes']} transações, "
+                  f"{result['tempo_s']:.2f} s ({result['eventos_por_s']:.0f} eventos/s, "
+                  f"{result['tempo_gravacao_s']:.2f} s gravando); "
+                  f"divergências: {result['divergencias']}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""
+Servidor HTTP local que simula a API REST do GitHub para os benchmarks.
+
+Serve listagens sintéticas de /orgs/{org}/repos com paginação realista (cabeçalho 'Link'),
+cabeçalhos de rate limit, latência injetada e suporte a requisições condicionais (ETag/304).
+Também atende POST /graphql (consulta de enriquecimento de src/services/github_graphql.py, com
+paginação por cursor) e, para comparação de custo, os endpoints REST por repositório
+/repos/{org}/{repo}/pulls e /repos/{org}/{repo}/commits.
+
+Uso isolado:
+    python -m benchmarks.fake_github --repos 10000 --latency-ms 20 --port 8765
+"""
+import argparse
+import base64
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlparse, parse_qs
+
+# Fragmentos usados nos nomes sintéticos: parte casa com as regras de data/project_assignment_rules.yaml.
+NAME_FRAGMENTS = ["game", "docs", "tools", "wiki", "unity", "util", "api", "service", "web", "infra", "lib", "app"]
+
+
+def generate_repos(org_name: str, count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Gera 'count' objetos de repositório no formato da API do GitHub para a organização."""
+    rng = random.Random(f"{org_name}-{seed}")
+    base_date = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    org_offset = int(hashlib.md5(org_name.encode()).hexdigest()[:6], 16) * 1_000_000
+    repos = []
+    for i in range(count):
+        name = f"{rng.choice(NAME_FRAGMENTS)}-{rng.choice(NAME_FRAGMENTS)}-{i}"
+        created_at = base_date + timedelta(minutes=rng.randint(0, 2_000_000))
+        updated_at = created_at + timedelta(minutes=rng.randint(0, 500_000))
+        repos.append({
+            "id": org_offset + i + 1,
+            "node_id": f"R_{org_offset + i + 1}",
+            "name": name,
+            "full_name": f"{org_name}/{name}",
+            "private": rng.random() < 0.3,
+            "owner": {"login": org_name, "type": "Organization"},
+            "html_url": f"https://github.com/{org_name}/{name}",
+            "description": f"Repositório sintético {name}",
+            "fork": False,
+            "created_at": created_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "updated_at": updated_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "pushed_at": updated_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "stargazers_count": rng.randint(0, 5000),
+            "watchers_count": rng.randint(0, 5000),
+            "forks_count": rng.randint(0, 500),
+            "open_issues_count": rng.randint(0, 100),
+            "language": rng.choice(["Python", "C#", "C++", "Go", None]),
+            "topics": rng.sample(NAME_FRAGMENTS, 2),
+            "archived": rng.random() < 0.05,
+            "default_branch": "main",
+        })
+    return repos
+
+
+def open_pull_requests(repo_json: Dict[str, Any]) -> int:
+    """Quantidade sintética de pull requests abertos (contidos em open_issues_count, como na API REST)."""
+    return min(repo_json["open_issues_count"], repo_json["id"] % 7)
+
+
+def graphql_node(repo_json: Dict[str, Any]) -> Dict[str, Any]:
+    """Nó 'Repository' da consulta GraphQL de enriquecimento correspondente a um repositório sintético."""
+    pull_requests = open_pull_requests(repo_json)
+    return {
+        "databaseId": repo_json["id"],
+        "name": repo_json["name"],
+        "isArchived": repo_json["archived"],
+        "primaryLanguage": {"name": repo_json["language"]} if repo_json["language"] else None,
+        "repositoryTopics": {"nodes": [{"topic": {"name": topic}} for topic in repo_json["topics"]]},
+        "issues": {"totalCount": repo_json["open_issues_count"] - pull_requests},
+        "pullRequests": {"totalCount": pull_requests},
+        "defaultBranchRef": {"target": {"committedDate": repo_json["pushed_at"]}},
+    }
+
+
+class FakeGitHubState:
+    """Estado compartilhado do servidor: organizações, corpos pré-serializados e contadores."""
+
+    def __init__(self, repos_per_org: int, latency_ms: float, rate_limit: int):
+        self.repos_per_org = repos_per_org
+        self.latency_ms = latency_ms
+        self.rate_limit = rate_limit
+        self.orgs: Dict[str, List[Dict[str, Any]]] = {}
+        self._pages: Dict[str, tuple] = {}
+        self._repos_by_name: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self.reset_counters()
+
+    def reset_counters(self):
+        with self._lock:
+            self.requests = 0
+            self.not_modified = 0
+            self.remaining = self.rate_limit
+            self.reset_at = int(time.time()) + 3600
+
+    def repos_for(self, org_name: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            if org_name not in self.orgs:
+                self.orgs[org_name] = generate_repos(org_name, self.repos_per_org)
+                self._repos_by_name[org_name] = {repo["name"]: repo for repo in self.orgs[org_name]}
+            return self.orgs[org_name]
+
+    def repo(self, org_name: str, repo_name: str) -> Optional[Dict[str, Any]]:
+        self.repos_for(org_name)
+        return self._repos_by_name[org_name].get(repo_name)
+
+    def page(self, org_name: str, sort: Optional[str], direction: str, per_page: int, page: int):
+        """Retorna (corpo, etag, última página) de uma página, serializando cada página uma única vez."""
+        key = f"{org_name}|{sort}|{direction}|{per_page}|{page}"
+        cached = self._pages.get(key)
+        if cached is None:
+            repos = self.repos_for(org_name)
+            if sort == "updated":
+                repos = sorted(repos, key=lambda repo: repo["updated_at"], reverse=(direction != "asc"))
+            body = json.dumps(repos[(page - 1) * per_page:page * per_page]).encode()
+            last_page = max(1, -(-len(repos) // per_page))
+            cached = (body, f'"{hashlib.sha1(body).hexdigest()}"', last_page)
+            self._pages[key] = cached
+        return cached
+
+    def consume(self, counted: bool):
+        """Contabiliza uma requisição; retorna (saldo restante, reset, se o limite foi excedido)."""
+        with self._lock:
+            self.requests += 1
+            if not counted:
+                self.not_modified += 1
+                return self.remaining, self.reset_at, False
+            if self.remaining == 0:
+                return 0, self.reset_at, True
+            self.remaining -= 1
+            return self.remaining, self.reset_at, False
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Cabeçalhos e corpo são escritos separadamente: sem TCP_NODELAY, o ACK atrasado do cliente
+    # acrescentaria ~40 ms a cada resposta em conexões keep-alive.
+    disable_nagle_algorithm = True
+    state: FakeGitHubState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes = b"", headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _rate_limit_headers(self, remaining: int, reset_at: int) -> Dict[str, str]:
+        return {
+            "X-RateLimit-Limit": str(self.state.rate_limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(reset_at),
+        }
+
+    def _send_json(self, data: Any, headers: Optional[Dict[str, str]] = None, status: int = 200):
+        headers = dict(headers or {})
+        headers["Content-Type"] = "application/json; charset=utf-8"
+        self._send(status, json.dumps(data).encode(), headers)
+
+    def do_GET(self):
+        if self.state.latency_ms:
+            time.sleep(self.state.latency_ms / 1000)
+        parsed = urlparse(self.path)
+        parts = parsed.path.strip("/").split("/")
+        if len(parts) == 4 and parts[0] == "repos" and parts[3] in ("pulls", "commits"):
+            self._repo_endpoint(parts[1], parts[2], parts[3], parsed)
+            return
+        if len(parts) != 3 or parts[0] != "orgs" or parts[2] != "repos":
+            self._send(404, b'{"message": "Not Found"}', {"Content-Type": "application/json"})
+            return
+
+        query = parse_qs(parsed.query)
+        org_name = parts[1]
+        per_page = min(int(query.get("per_page", ["30"])[0]), 100)
+        page = int(query.get("page", ["1"])[0])
+        sort = query.get("sort", [None])[0]
+        direction = query.get("direction", ["desc"])[0]
+        body, etag, last_page = self.state.page(org_name, sort, direction, per_page, page)
+
+        not_modified = self.headers.get("If-None-Match") == etag
+        remaining, reset_at, exceeded = self.state.consume(counted=not not_modified)
+        headers = {"ETag": etag, **self._rate_limit_headers(remaining, reset_at)}
+        base = f"http://{self.headers.get('Host')}{parsed.path}?per_page={per_page}"
+        if sort:
+            base += f"&sort={sort}&direction={direction}"
+        links = []
+        if page < last_page:
+            links.append(f'<{base}&page={page + 1}>; rel="next"')
+            links.append(f'<{base}&page={last_page}>; rel="last"')
+        if page > 1:
+            links.append(f'<{base}&page=1>; rel="first"')
+            links.append(f'<{base}&page={page - 1}>; rel="prev"')
+        if links:
+            headers["Link"] = ", ".join(links)
+
+        if not_modified:
+            self._send(304, headers=headers)
+            return
+        if exceeded:
+            self._send(403, b'{"message": "API rate limit exceeded"}', headers)
+            return
+        headers["Content-Type"] = "application/json; charset=utf-8"
+        self._send(200, body, headers)
+
+    def _repo_endpoint(self, org_name: str, repo_name: str, endpoint: str, parsed):
+        """
+        Endpoints REST por repositório, com per_page=1: pull requests abertos (o total vem do 'Link'
+        rel="last", como na API real) e o último commit do branch padrão.
+        """
+        remaining, reset_at, exceeded = self.state.consume(counted=True)
+        headers = self._rate_limit_headers(remaining, reset_at)
+        repo_json = self.state.repo(org_name, repo_name)
+        if exceeded or repo_json is None:
+            status, message = (403, "API rate limit exceeded") if exceeded else (404, "Not Found")
+            self._send_json({"message": message}, headers, status)
+            return
+        if endpoint == "commits":
+            self._send_json([{"sha": hashlib.sha1(repo_name.encode()).hexdigest(),
+                              "commit": {"committer": {"date": repo_json["pushed_at"]}}}], headers)
+            return
+        total = open_pull_requests(repo_json)
+        page = int(parse_qs(parsed.query).get("page", ["1"])[0])
+        if total > 1:
+            base = f"http://{self.headers.get('Host')}{parsed.path}?state=open&per_page=1"
+            headers["Link"] = f'<{base}&page={min(page + 1, total)}>; rel="next", <{base}&page={total}>; rel="last"'
+        self._send_json([{"number": page}] if page <= total else [], headers)
+
+    def do_POST(self):
+        if self.state.latency_ms:
+            time.sleep(self.state.latency_ms / 1000)
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if urlparse(self.path).path != "/graphql":
+            self._send(404, b'{"message": "Not Found"}', {"Content-Type": "application/json"})
+            return
+
+        remaining, reset_at, exceeded = self.state.consume(counted=True)
+        headers = self._rate_limit_headers(remaining, reset_at)
+        if exceeded:
+            self._send_json({"errors": [{"type": "RATE_LIMITED", "message": "API rate limit exceeded"}]}, headers)
+            return
+        variables = json.loads(body or b"{}").get("variables") or {}
+        first = min(int(variables.get("first") or 100), 100)
+        after = variables.get("after")
+        offset = int(base64.b64decode(after).decode().split(":")[1]) if after else 0
+        repos = self.state.repos_for(variables["org"])[offset:offset + first]
+        end = offset + len(repos)
+        self._send_json({"data": {
+            "organization": {"repositories": {
+                "pageInfo": {"hasNextPage": end < self.state.repos_per_org,
+                             "endCursor": base64.b64encode(f"cursor:{end}".encode()).decode()},
+                "nodes": [graphql_node(repo_json) for repo_json in repos],
+            }},
+            "rateLimit": {"cost": 1, "remaining": remaining,
+                          "resetAt": datetime.fromtimestamp(reset_at, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")},
+        }}, headers)
+
+
+class FakeGitHubServer:
+    """Servidor falso da API do GitHub executado em uma thread de fundo."""
+
+    def __init__(self, repos_per_org: int = 1000, latency_ms: float = 0, rate_limit: int = 5000,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.state = FakeGitHubState(repos_per_org, latency_ms, rate_limit)
+        handler = type("BoundFakeGitHubHandler", (FakeGitHubHandler,), {"state": self.state})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeGitHubServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="fake-github", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repos", type=int, default=1000, help="Repositórios por organização.")
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--rate-limit", type=int, default=5000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+
+    server = FakeGitHubServer(args.repos, args.latency_ms, args.rate_limit, port=args.port)
+    print(f"API falsa do GitHub em {server.url} (Ctrl+C para encerrar)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Suíte de benchmarks offline do pipeline de monitoramento.
+
+Sobe a API falsa do GitHub (benchmarks/fake_github.py) e executa, para cada tamanho de organização,
+cada estágio do pipeline isoladamente e o main.main() completo. Cada medição roda em um subprocesso
+próprio, com banco de dados e cache HTTP novos, para que o pico de memória (RSS) seja do estágio.
+Os resultados (tempo, vazão e pico de RSS) são gravados em um arquivo JSON para comparação entre execuções.
+
+Estágios:
+    fetch          get_org_repos contra a API falsa (cache HTTP vazio)
+    fetch_cached   get_org_repos repetido, respondido com 304 a partir do cache
+    extract        extract_repo_info sobre os objetos JSON
+    assign         assign_repo_to_project sobre os nomes dos repositórios
+    upsert         github_repository.upsert_repositories
+    upsert_by_row  github_repository.insert_or_update_repository, uma linha por vez
+    main           main.main() de ponta a ponta
+
+Uso:
+    python -m benchmarks.run_benchmarks [--sizes 1000 10000 100000] [--stages fetch upsert main]
+                                        [--latency-ms 20] [--output benchmarks/results/minha_execucao.json]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "benchmarks", "results")
+BENCH_ORG = "bench-org"
+STAGES = ["fetch", "fetch_cached", "extract", "assign", "upsert", "upsert_by_row", "main"]
+# A gravação linha a linha é lenta demais para organizações muito grandes.
+UPSERT_BY_ROW_MAX_REPOS = 10000
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Pico de memória residente do processo atual, em MiB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss é em KiB no Linux e em bytes no macOS.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _prepare_environment(work_dir: str, api_url: str) -> Dict[str, str]:
+    """Cria o arquivo de projetos do benchmark e retorna as variáveis de ambiente do subprocesso."""
+    projects_csv = os.path.join(work_dir, "projetos.csv")
+    with open(projects_csv, "w", encoding="utf-8") as file:
+        file.write("organizacao_github,nome,descricao\n")
+        file.write(f"{BENCH_ORG},Projeto Jogo Alpha,Benchmark\n")
+        file.write(",Documentacao do Jogo,Benchmark\n")
+        file.write(",Ferramentas de Desenvolvimento,Benchmark\n")
+    env = dict(os.environ)
+    env.update({
+        "GITHUB_TOKEN": env.get("GITHUB_TOKEN", "benchmark"),
+        "GITHUB_API_URL": api_url,
+        "DATABASE_NAME": os.path.join(work_dir, "bench.db"),
+        "HTTP_CACHE_PATH": os.path.join(work_dir, "http_cache.db"),
+        "PROJECTS_CSV_PATH": projects_csv,
+        "PROJECTS_JSON_PATH": os.path.join(work_dir, "projetos.json"),
+        "PYTHONPATH": PROJECT_ROOT + os.pathsep + env.get("PYTHONPATH", ""),
+    })
+    return env
+
+
+def _timed(func, *args, **kwargs):
+    started_at = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started_at
+
+
+def run_stage(stage: str, size: int) -> Dict[str, Any]:
+    """Executa um estágio no processo atual (subprocesso filho) e retorna as métricas."""
+    import logging
+    import main
+    from benchmarks.fake_github import generate_repos
+    from src.models.model import SchemaManager
+    from src.config.config import settings
+    from src.repositories.github_repository import github_repository
+    from src.services.github_api import get_org_repos, extract_repo_info
+    from src.services.project_importer import import_projects_from_csv
+    from src.services.rule_loader import load_compiled_rules
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    def prepare_database():
+        SchemaManager().create_all_tables()
+        import_projects_from_csv()
+        main.project_repository.insert_project(main.DEFAULT_PROJECT_NAME)
+        main.rule_matcher = main.build_rule_matcher(load_compiled_rules() or [])
+
+    def records(repos_json):
+        for repo_json in repos_json:
+            repo_data = extract_repo_info(repo_json)
+            repo_data["projeto_id"] = main.assign_repo_to_project(repo_data["nome"])
+            yield repo_data
+
+    items = size
+    if stage == "fetch":
+        repos, elapsed = _timed(get_org_repos, BENCH_ORG, max_workers=settings.github_max_workers)
+        items = len(repos)
+    elif stage == "fetch_cached":
+        get_org_repos(BENCH_ORG, max_workers=settings.github_max_workers)
+        repos, elapsed = _timed(get_org_repos, BENCH_ORG, max_workers=settings.github_max_workers)
+        items = len(repos)
+    elif stage == "extract":
+        repos_json = generate_repos(BENCH_ORG, size)
+        _, elapsed = _timed(lambda: [extract_repo_info(repo_json) for repo_json in repos_json])
+    elif stage == "assign":
+        prepare_database()
+        names = [repo_json["name"] for repo_json in generate_repos(BENCH_ORG, size)]
+        _, elapsed = _timed(lambda: [main.assign_repo_to_project(name) for name in names])
+    elif stage == "upsert":
+        prepare_database()
+        prepared = list(records(generate_repos(BENCH_ORG, size)))
+        _, elapsed = _timed(github_repository.upsert_repositories, prepared)
+    elif stage == "upsert_by_row":
+        prepare_database()
+        prepared = list(records(generate_repos(BENCH_ORG, size)))
+        _, elapsed = _timed(lambda: [github_repository.insert_or_update_repository(repo) for repo in prepared])
+    elif stage == "main":
+        _, elapsed = _timed(main.main)
+    else:
+        raise ValueError(f"Estágio desconhecido: {stage}")
+
+    return {
+        "estagio": stage,
+        "repositorios": items,
+        "tempo_s": elapsed,
+        "repos_por_s": items / elapsed if elapsed else None,
+        "pico_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_suite(sizes: List[int], stages: List[str], latency_ms: float, rate_limit: int) -> List[Dict[str, Any]]:
+    """Executa todos os estágios para cada tamanho, cada um em um subprocesso isolado."""
+    from benchmarks.fake_github import FakeGitHubServer
+
+    results = []
+    for size in sizes:
+        with FakeGitHubServer(repos_per_org=size, latency_ms=latency_ms, rate_limit=rate_limit) as server:
+            for stage in stages:
+                if stage == "upsert_by_row" and size > UPSERT_BY_ROW_MAX_REPOS:
+                    print(f"[{size}] {stage}: ignorado (mais de {UPSERT_BY_ROW_MAX_REPOS} repositórios)", file=sys.stderr)
+                    continue
+                server.state.reset_counters()
+                with tempfile.TemporaryDirectory(prefix="repo_monitor_bench_") as work_dir:
+                    env = _prepare_environment(work_dir, server.url)
+                    completed = subprocess.run(
+                        [sys.executable, "-m", "benchmarks.run_benchmarks", "--child", stage, "--size", str(size)],
+                        cwd=work_dir, env=env, capture_output=True, text=True)
+                if completed.returncode != 0:
+                    print(completed.stderr, file=sys.stderr)
+                    raise RuntimeError(f"Estágio '{stage}' falhou para {size} repositórios.")
+                result = json.loads(completed.stdout.strip().splitlines()[-1])
+                result["tamanho_organizacao"] = size
+                result["requisicoes_http"] = server.state.requests
+                result["respostas_304"] = server.state.not_modified
+                results.append(result)
+                print(f"[{size}] {stage}: {result['tempo_s']:.3f} s, "
+                      f"{result['repos_por_s'] or 0:,.0f} repos/s, pico RSS {result['pico_rss_mb'] or 0:.1f} MiB",
+                      file=sys.stderr)
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Quantidades de repositórios da organização falsa.")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--latency-ms", type=float, default=20, help="Latência injetada em cada resposta da API.")
+    parser.add_argument("--rate-limit", type=int, default=5000)
+    parser.add_argument("--output", help="Arquivo JSON de resultados (padrão: benchmarks/results/<data>.json).")
+    parser.add_argument("--child", choices=STAGES, help=argparse.SUPPRESS)
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_stage(args.child, args.size)))
+        return
+
+    started_at = datetime.now(timezone.utc)
+    results = run_suite(args.sizes, args.stages, args.latency_ms, args.rate_limit)
+    report = {
+        "data": started_at.isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "parametros": {"tamanhos": args.sizes, "estagios": args.stages,
+                       "latencia_ms": args.latency_ms, "rate_limit": args.rate_limit},
+        "resultados": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, started_at.strftime("%Y%m%dT%H%M%SZ") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2, ensure_ascii=False)
+    print(f"Resultados gravados em {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,122 +1,541 @@
 import os
+import signal
+import threading
+import time
+import argparse
 import logging
-from typing import Optional, List, Dict, Any
-import yaml
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict, Any, Iterable, Union
 
-from src.models.model import SchemaManager
+from src.models.model import RepoRecord, SchemaManager
 from src.repositories.project_repository import project_repository
 from src.repositories.github_repository import github_repository
-from src.services.github_api import get_org_repos, extract_repo_info
-from src.services.project_importer import import_projects_from_csv, import_projects_from_json
-from src.services.rule_loader import load_assignment_rules_from_yaml
-from src.config.config import PROJECTS_CSV_PATH, PROJECTS_JSON_PATH, \
-    DEFAULT_PROJECT_NAME, setup_logging, DATABASE_NAME
+from src.repositories.snapshot_repository import snapshot_repository
+from src.repositories.sync_state_repository import sync_state_repository
+from src.services.metrics import metrics, profiling
+from src.services.repo_sync import OrganizationSync
+from src.services.project_importer import import_projects_from_csv, import_projects_from_json, load_organization_names
+from src.services.rule_loader import load_compiled_rules
+from src.services.rule_matcher import CompiledRuleSet, ProjectRuleMatcher
+from src.config.config import DEFAULT_PROJECT_NAME, settings, setup_logging
 
 logger = logging.getLogger(__name__)
 
-assignment_rules: Optional[List[Dict[str, Any]]] = None
+rule_matcher: Optional[ProjectRuleMatcher] = None
+
+
+def build_rule_matcher(rules: Union[CompiledRuleSet, List[Dict[str, Any]]]) -> ProjectRuleMatcher:
+    """Prepara as regras de atribuição, resolvendo os nomes dos projetos para IDs em uma única consulta."""
+    rule_set = rules if isinstance(rules, CompiledRuleSet) else CompiledRuleSet(rules)
+    project_names = set(rule_set.project_names)
+    project_names.add(DEFAULT_PROJECT_NAME)
+    project_ids = project_repository.get_project_ids_by_names(project_names)
+    matcher = ProjectRuleMatcher(rule_set, project_ids, project_ids.get(DEFAULT_PROJECT_NAME))
+    if not matcher.has_rules:
+        logger.warning(
+            "Nenhuma regra de atribuição de projeto carregada ou as regras estão vazias. Usando o projeto padrão.")
+    return matcher
 
 
 def assign_repo_to_project(repo_name: str) -> Optional[int]:
     """
     Função de lógica para atribuir um repositório a um projeto com base em regras carregadas.
     """
-    global assignment_rules
+    global rule_matcher
 
-    if assignment_rules is None or not assignment_rules:
-        logger.warning(
-            "Nenhuma regra de atribuição de projeto carregada ou as regras estão vazias. Usando o projeto padrão.")
-        # Chama o método do repositório de projetos
+    if rule_matcher is None:
+        logger.warning("Nenhuma regra de atribuição de projeto carregada. Usando o projeto padrão.")
         return project_repository.get_project_id_by_name(DEFAULT_PROJECT_NAME)
+    if not rule_matcher.has_rules:
+        # O aviso de regras vazias é emitido uma única vez, em build_rule_matcher.
+        return rule_matcher.default_project_id
 
-    for rule in assignment_rules:
-        project_name_from_rule = rule.get("project_name")
-        keywords = rule.get("keywords", [])
+    project_id = rule_matcher.match(repo_name)
+    if project_id:
+        logger.debug(f"Repositório '{repo_name}' associado ao projeto {project_id}.")
+        return project_id
 
-        if not project_name_from_rule or not isinstance(keywords, list):
-            logger.warning(f"Regra de atribuição inválida: {rule}. Ignorando.")
-            continue
+    # Uma linha por repositório só em DEBUG; o total sai no resumo da execução.
+    logger.debug(
+        f"Repositório '{repo_name}' não pôde ser associado a um projeto conhecido por nenhuma regra. Usando o projeto padrão.")
+    metrics.inc("repos_default_project")
 
-        for keyword in keywords:
-            if keyword.lower() in repo_name.lower():
+    return rule_matcher.default_project_id
 
-                project_id = project_repository.get_project_id_by_name(project_name_from_rule)
-                if project_id:
-                    logger.debug(f"Repositório '{repo_name}' associado a '{project_name_from_rule}'.")
-                    return project_id
-                else:
-                    logger.warning(
-                        f"Projeto '{project_name_from_rule}' da regra '{rule}' não encontrado no banco de dados. Verifique o arquivo de projetos. Tentando a próxima regra se houver.")
-                    break
 
-    logger.warning(
-        f"Repositório '{repo_name}' não pôde ser associado a um projeto conhecido por nenhuma regra. Usando o projeto padrão.")
+def _incremental_sync_possible(state: Optional[Dict[str, Any]]) -> bool:
+    """Indica se é possível sincronizar apenas as alterações ou se uma reconciliação completa é necessária."""
+    if not state or not state["marca_atualizacao"] or not state["ultima_reconciliacao"]:
+        return False
+    last_reconcile = datetime.fromisoformat(state["ultima_reconciliacao"])
+    return datetime.now(timezone.utc) - last_reconcile < timedelta(hours=settings.full_reconcile_interval_hours)
 
-    return project_repository.get_project_id_by_name(DEFAULT_PROJECT_NAME)
 
+def _store_organization_repos(org_name: str, stream: Iterable[List[RepoRecord]],
+                              full_reconcile: bool) -> OrganizationSync:
+    """
+    Atribui projetos e grava os repositórios de uma organização página a página, à medida que a coleta
+    (um RepoPageStream) avança. Após uma coleta completa, remove os repositórios ausentes (reconciliação)
+    e avança a marca d'água.
+    """
+    logger.info(f"\nProcessando e armazenando os repositórios da organização '{org_name}' à medida que chegam...")
+    sync = OrganizationSync(org_name, assign_repo_to_project, full_reconcile)
+    for records in stream:
+        sync.write_page(records)
+    sync.finish(stream.complete)
+    return sync
 
-def main():
-    logger.info("Iniciando monitoramento de repositórios GitHub...")
 
-    schema_manager = SchemaManager(DATABASE_NAME)
-    schema_manager.create_all_tables()  # Cria todas as tabelas
+def main(incremental: bool = False, organizations: Optional[List[str]] = None, enrich: bool = False):
+    """
+    Executa o monitoramento das organizações.
+    As organizações vêm do parâmetro 'organizations' ou, se não informadas, da coluna 'organizacao_github'
+    do arquivo de projetos; várias organizações são coletadas concorrentemente.
+    Com incremental=True, busca apenas os repositórios alterados desde a última sincronização,
+    fazendo uma reconciliação completa quando não houver marca d'água ou quando ela estiver vencida.
+    Com enrich=True, completa os metadados dos repositórios (linguagem, tópicos, issues/PRs abertos,
+    último commit, arquivado) em lotes pela API GraphQL.
+    """
+    metrics.reset()
+    with profiling():
+        try:
+            with metrics.stage("total"):
+                _run_monitor(incremental, organizations, enrich)
+        finally:
+            metrics.export()
+
+
+def _load_assignment_rules(read_only: bool = False) -> Optional[CompiledRuleSet]:
+    """
+    Cria as tabelas e carrega as regras de atribuição. Com read_only=True, não cria nem migra as tabelas
+    e não grava o cache de regras. Retorna None se a aplicação não puder continuar.
+    """
+    if not read_only:
+        schema_manager = SchemaManager()
+        schema_manager.create_all_tables()  # Cria todas as tabelas
 
     logger.info("\nCarregando regras de atribuição de projetos...")
-    global assignment_rules
-    assignment_rules = load_assignment_rules_from_yaml()
+    assignment_rules = load_compiled_rules(write_cache=not read_only)
     if assignment_rules is None:
         logger.error("Falha ao carregar as regras de atribuição. A aplicação não pode continuar.")
-        return
+        return None
     if not assignment_rules:
         logger.warning(
             "O arquivo de regras de atribuição foi carregado, mas não contém nenhuma regra. Repositórios serão associados ao projeto padrão.")
+    return assignment_rules
+
 
+def _import_projects_file() -> Optional[str]:
+    """
+    Importa os projetos do arquivo CSV (ou, na falta dele, JSON) e garante o projeto padrão.
+    Retorna o nome da organização do arquivo (ou None se o arquivo não o tiver).
+    """
     logger.info("\nImportando projetos e nome da organização...")
-    github_organization_name = None
-    if os.path.exists(PROJECTS_CSV_PATH):
+    if os.path.exists(settings.projects_csv_path):
         github_organization_name = import_projects_from_csv()
-    elif os.path.exists(PROJECTS_JSON_PATH):
-        github_organization_name = import_projects_from_json()
     else:
+        github_organization_name = import_projects_from_json()
+    project_repository.insert_project(DEFAULT_PROJECT_NAME,
+                                      "Repositórios que não foram associados a um projeto específico.")
+    return github_organization_name
+
+
+def _projects_file_exists() -> bool:
+    """Indica se há um arquivo de projetos (CSV ou JSON)."""
+    return os.path.exists(settings.projects_csv_path) or os.path.exists(settings.projects_json_path)
+
+
+def _prepare_monitor(organizations: Optional[List[str]]) -> Optional[List[str]]:
+    """
+    Cria as tabelas, carrega as regras, importa os projetos e prepara o rule_matcher.
+    Retorna as organizações a monitorar, ou None se a aplicação não puder continuar.
+    """
+    global rule_matcher
+    assignment_rules = _load_assignment_rules()
+    if assignment_rules is None:
+        return None
+
+    if not _projects_file_exists():
         logger.error(
             "Nenhum arquivo de projetos CSV ou JSON encontrado. A aplicação não pode continuar sem o nome da organização e projetos.")
-        return
+        return None
+    github_organization_name = _import_projects_file()
 
-    if not github_organization_name:
+    if not github_organization_name and not organizations:
         logger.error(
             "Nome da organização do GitHub não foi encontrado nos arquivos de projetos. A aplicação não pode continuar.")
+        return None
+    logger.info(f"Organização GitHub a ser monitorada: {organizations or github_organization_name}")
+
+    rule_matcher = build_rule_matcher(assignment_rules)
+
+    return organizations or load_organization_names() or [github_organization_name]
+
+
+def _run_monitor(incremental: bool, organizations: Optional[List[str]], enrich: bool = False):
+    # O cliente HTTP (requests) só é importado quando o monitoramento de fato acessa o GitHub.
+    from src.services.github_api import stream_org_repos, stream_org_repos_updated_since, response_cache
+    from src.services.github_collector import collect_organizations
+
+    logger.info("Iniciando monitoramento de repositórios GitHub...")
+
+    organizations = _prepare_monitor(organizations)
+    if organizations is None:
         return
+    states = {org_name: sync_state_repository.get_state(org_name) if incremental else None
+              for org_name in organizations}
+    full_orgs = [org_name for org_name in organizations if not _incremental_sync_possible(states[org_name])]
+
+    synced = []
+    if len(full_orgs) == 1:
+        logger.info(f"\nColetando repositórios do GitHub para a organização '{full_orgs[0]}'...")
+        stream = stream_org_repos(full_orgs[0], max_workers=settings.github_max_workers)
+        synced.append(_store_organization_repos(full_orgs[0], stream, full_reconcile=True))
+    elif full_orgs:
+        logger.info(f"\nColetando repositórios do GitHub de {len(full_orgs)} organizações concorrentemente...")
+        syncs = {org_name: OrganizationSync(org_name, assign_repo_to_project, True) for org_name in full_orgs}
+        for result in collect_organizations(full_orgs, lambda org_name, records: syncs[org_name].write_page(records)):
+            syncs[result["organizacao"]].finish(result["completa"])
+        synced.extend(syncs.values())
+
+    for org_name in organizations:
+        if org_name in full_orgs:
+            continue
+        since = states[org_name]["marca_atualizacao"]
+        logger.info(f"\nColetando repositórios da organização '{org_name}' alterados desde {since}...")
+        stream = stream_org_repos_updated_since(org_name, since)
+        synced.append(_store_organization_repos(org_name, stream, full_reconcile=False))
+
+    _log_run_summary(synced)
+
+    if enrich:
+        from src.services.github_graphql import enrich_organization
+
+        for sync in synced:
+            if sync.repositories:
+                logger.info(f"\nEnriquecendo os metadados dos repositórios da organização '{sync.org_name}' via GraphQL...")
+                with metrics.stage("graphql_enrichment"):
+                    enrich_organization(sync.org_name)
+
+    snapshot_repository.record_snapshots()
+
+    response_cache.log_stats()
+    github_repository.db_manager.pool.log_stats()
+    logger.info("\nMonitoramento de repositórios concluído.")
+
+
+def _log_run_summary(synced: List[OrganizationSync]):
+    """Registra o resumo da execução: totais de inseridos/atualizados/inalterados/falhas das organizações."""
+    totals = {key: sum(sync.counts[key] for sync in synced) for key in ("inseridos", "atualizados", "inalterados", "falhas")}
+    logger.info(
+        f"\nResumo da execução ({len(synced)} organizações, {sum(sync.repositories for sync in synced)} repositórios): "
+        f"{totals['inseridos']} inseridos, {totals['atualizados']} atualizados, {totals['inalterados']} inalterados, "
+        f"{totals['falhas']} falhas.")
+    default_assigned = int(metrics.counter("repos_default_project"))
+    if default_assigned:
+        logger.warning(
+            f"{default_assigned} repositórios não casaram com nenhuma regra e foram associados ao projeto padrão "
+            f"(lista no log em nível DEBUG).")
+
+
+def poll_organization(org_name: str) -> Dict[str, int]:
+    """
+    Coleta agendada de uma organização no modo daemon: sincroniza apenas as alterações desde a marca
+    d'água ou, quando necessário, faz a reconciliação completa.
+    Retorna {"alteracoes": repositórios alterados, "requisicoes": requisições feitas à API}.
+    """
+    from src.services.github_api import stream_org_repos, stream_org_repos_updated_since
+
+    requests_before = metrics.counter("http_requests")
+    state = sync_state_repository.get_state(org_name)
+    since = state["marca_atualizacao"] if state else None
+    full_reconcile = not _incremental_sync_possible(state)
+    if full_reconcile:
+        stream = stream_org_repos(org_name, max_workers=settings.github_max_workers)
     else:
-        logger.info(f"Organização GitHub a ser monitorada: {github_organization_name}")
+        stream = stream_org_repos_updated_since(org_name, since)
 
-        project_repository.insert_project(DEFAULT_PROJECT_NAME,
-                                          "Repositórios que não foram associados a um projeto específico.")
+    # A busca incremental inclui o repositório da própria marca d'água; só os mais recentes são alterações.
+    changes = 0
+    sync = OrganizationSync(org_name, assign_repo_to_project, full_reconcile)
+    for records in stream:
+        changes += sum(1 for record in records if since is None or record.data_ultima_atualizacao > since)
+        sync.write_page(records)
+    if sync.repositories:
+        sync.finish(stream.complete)
+        if changes:
+            snapshot_repository.record_snapshots()
+    return {"alteracoes": changes, "requisicoes": int(metrics.counter("http_requests") - requests_before)}
 
-    logger.info(f"\nColetando repositórios do GitHub para a organização '{github_organization_name}'...")
-    github_repos = get_org_repos(github_organization_name)
 
-    if not github_repos:
-        logger.warning("Nenhum repositório encontrado ou erro ao acessar a API do GitHub. Encerrando.")
+def run_daemon(organizations: Optional[List[str]] = None, max_polls: Optional[int] = None,
+               webhook: bool = False):
+    """
+    Modo daemon: mantém sessão HTTP, regras compiladas e IDs de projetos em memória e coleta cada
+    organização em um intervalo adaptativo, dentro do orçamento horário de requisições.
+    As regras são recompiladas quando o arquivo YAML muda. Encerra de forma limpa com SIGTERM/SIGINT.
+    Com webhook=True, também recebe os webhooks da organização (ver run_webhook_receiver) e as
+    coletas passam a ser apenas as reconciliações periódicas.
+    """
+    from src.services.scheduler import AdaptiveInterval, PollingScheduler
+    from src.services.webhook_server import WebhookReceiver
+
+    metrics.reset()
+    logger.info("Iniciando o monitoramento em modo daemon...")
+    organizations = _prepare_monitor(organizations)
+    if organizations is None:
+        return
+    receiver = WebhookReceiver(assign_repo_to_project, organizations) if webhook else None
+    if receiver and not receiver.start():
         return
 
-    logger.info(f"Encontrados {len(github_repos)} repositórios.")
+    rules_path = settings.project_assignment_rules_path
+    rules_mtime = os.path.getmtime(rules_path) if os.path.exists(rules_path) else None
 
-    logger.info("\nProcessando e armazenando repositórios...")
-    for repo_json in github_repos:
-        repo_data = extract_repo_info(repo_json)
+    def on_cycle():
+        global rule_matcher
+        nonlocal rules_mtime
+        current_mtime = os.path.getmtime(rules_path) if os.path.exists(rules_path) else None
+        if current_mtime != rules_mtime:
+            rules_mtime = current_mtime
+            rule_set = load_compiled_rules()
+            if rule_set is not None:
+                logger.info("Arquivo de regras alterado: regras de atribuição recompiladas.")
+                rule_matcher = build_rule_matcher(rule_set)
+        metrics.export()
 
-        projeto_id = assign_repo_to_project(repo_data["nome"])
+    # Com os webhooks trazendo as alterações, a coleta agendada só precisa reconciliar, no intervalo de
+    # reconciliação completa (FULL_RECONCILE_INTERVAL_HOURS).
+    reconcile_seconds = settings.full_reconcile_interval_hours * 60 * 60
+    policy = AdaptiveInterval(reconcile_seconds, reconcile_seconds) if receiver else None
+    scheduler = PollingScheduler(organizations, poll_organization, policy=policy, on_cycle=on_cycle)
+    previous_handlers = scheduler.install_signal_handlers()
+    try:
+        scheduler.run(max_polls)
+    finally:
+        if receiver:
+            receiver.stop()
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+        metrics.export()
 
-        if projeto_id:
-            repo_data["projeto_id"] = projeto_id
-            github_repository.insert_or_update_repository(repo_data)
-        else:
-            logger.critical(
-                f"Repositório '{repo_data['nome']}' não pôde ser associado a nenhum projeto (nem mesmo o padrão). Isso é um erro inesperado e indica um problema na lógica de atribuição ou no projeto padrão.")
 
-    logger.info("\nMonitoramento de repositórios concluído.")
+def run_webhook_receiver(organizations: Optional[List[str]] = None):
+    """
+    Recebe os webhooks da organização (eventos repository, star, fork e push) e aplica cada alteração
+    ao repositório correspondente, em micro-lotes, sem varrer a organização. Repositórios novos ou
+    renomeados passam pelas regras de atribuição. Encerra com SIGTERM/SIGINT após aplicar a fila.
+    """
+    from src.services.webhook_server import WebhookReceiver
+
+    metrics.reset()
+    organizations = _prepare_monitor(organizations)
+    if organizations is None:
+        return
+    receiver = WebhookReceiver(assign_repo_to_project, organizations)
+    if not receiver.start():
+        return
+
+    stop_requested = threading.Event()
+    previous_handlers = {signum: signal.signal(signum, lambda *_: stop_requested.set())
+                         for signum in (signal.SIGTERM, signal.SIGINT)}
+    try:
+        while not stop_requested.wait(1.0):
+            pass
+        logger.info("Encerramento solicitado. Aplicando os eventos pendentes...")
+    finally:
+        receiver.stop()
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+        metrics.export()
+
+
+def replay_webhooks(path: str, organizations: Optional[List[str]] = None, url: Optional[str] = None):
+    """
+    Reproduz entregas de webhook gravadas em JSON Lines (WEBHOOK_RECORD_PATH).
+    Com url, reenvia as entregas assinadas ao receptor em execução nesse endereço; sem url,
+    aplica-as diretamente ao banco, pelo mesmo processamento em micro-lotes do receptor.
+    """
+    from src.services.webhook_server import WebhookProcessor, load_recorded_deliveries, replay_recorded_deliveries
+
+    if url:
+        if not settings.webhook_secret:
+            logger.error("GITHUB_WEBHOOK_SECRET não configurado: não é possível assinar as entregas.")
+            return
+        statuses = replay_recorded_deliveries(path, url, settings.webhook_secret)
+        logger.info(f"Entregas de '{path}' reenviadas para {url}: {statuses}")
+        return
+
+    organizations = _prepare_monitor(organizations)
+    if organizations is None:
+        return
+    processor = WebhookProcessor(assign_repo_to_project, organizations)
+    for event_name, payload in load_recorded_deliveries(path):
+        processor.submit(event_name, payload)
+    processor.flush()
+    logger.info(f"Entregas de '{path}' reproduzidas: {processor.stats}")
+
+
+def reassign(dry_run: bool = False):
+    """
+    Reaplica as regras de atribuição aos repositórios já gravados, sem acessar a API do GitHub
+    (por exemplo, depois de alterar o arquivo de regras). Com dry_run=True, só exibe o diff por projeto:
+    o banco existente é aberto somente leitura (sem criar ou migrar tabelas nem importar o arquivo de
+    projetos) e o cache de regras não é gravado.
+    """
+    from src.services.reassignment import reassign_repositories
+
+    if dry_run and not os.path.exists(settings.database_name):
+        logger.error(f"Banco de dados '{settings.database_name}' não encontrado: não há repositórios para reatribuir.")
+        return
+    read_only = settings.sqlite_read_only
+    settings.override(sqlite_read_only=read_only or dry_run)
+    metrics.reset()
+    try:
+        with metrics.stage("total"):
+            assignment_rules = _load_assignment_rules(read_only=dry_run)
+            if assignment_rules is None:
+                return
+            # Não precisa da organização; com dry_run, usa os projetos já gravados, sem importar nada.
+            if not dry_run and _projects_file_exists():
+                _import_projects_file()
+            reassign_repositories(build_rule_matcher(assignment_rules), dry_run=dry_run)
+    finally:
+        settings.override(sqlite_read_only=read_only)
+        metrics.export()
+
+
+def report(stale_days: int = 180, limit: int = 10):
+    """Exibe o resumo por projeto (ProjetoResumo), os principais projetos e os repositórios desatualizados."""
+    from src.repositories.report_repository import report_repository
+
+    SchemaManager().create_all_tables()
+    logger.info("\nResumo por projeto (repositórios, públicos/privados, estrelas, forks, última atualização):")
+    for summary in report_repository.get_project_summaries():
+        logger.info(f"  {summary['projeto']}: {summary['repositorios']} ({summary['publicos']}/{summary['privados']}), "
+                    f"{summary['estrelas']} estrelas, {summary['forks']} forks, {summary['ultima_atualizacao']}")
+
+    logger.info(f"\nTop {limit} projetos por estrelas:")
+    for position, summary in enumerate(report_repository.get_top_projects(limit), start=1):
+        logger.info(f"  {position}. {summary['projeto']}: {summary['estrelas']} estrelas")
+
+    stale_count = report_repository.count_stale_repositories(stale_days)
+    logger.info(f"\n{stale_count} repositórios sem atualização há mais de {stale_days} dias. Mais antigos:")
+    for repo in report_repository.get_stale_repositories(stale_days, limit):
+        logger.info(f"  {repo['nome']} ({repo['projeto']}): {repo['data_ultima_atualizacao']}")
+
+
+def search(text: str, limit: int = 20):
+    """Busca repositórios por trechos do nome, da descrição, dos tópicos ou do projeto (índice FTS5), por relevância."""
+    from src.repositories.search_repository import search_repository
+
+    SchemaManager().create_all_tables()
+    started_at = time.perf_counter()
+    results = search_repository.search(text, limit)
+    elapsed_ms = (time.perf_counter() - started_at) * 1000
+    logger.info(f"\n{len(results)} repositórios encontrados para '{text}' em {elapsed_ms:.1f} ms:")
+    for repo in results:
+        description = f" - {repo['descricao']}" if repo["descricao"] else ""
+        logger.info(f"  {repo['destaque']} ({repo['projeto']}): {repo['url']}{description}")
+
+
+def preview_rule_keyword(keyword: str, project_name: str):
+    """
+    Mostra quais repositórios uma palavra-chave nova casaria e quais mudariam de projeto se ela fosse
+    acrescentada à regra de 'project_name' em project_assignment_rules.yaml, sem gravar nada.
+    """
+    from src.services.reassignment import preview_keyword
+
+    SchemaManager().create_all_tables()
+    assignment_rules = load_compiled_rules()
+    if assignment_rules is None:
+        logger.error("Falha ao carregar as regras de atribuição. A prévia não pode continuar.")
+        return
+    preview_keyword(keyword, build_rule_matcher(assignment_rules.with_keyword(project_name, keyword)))
+
+
+def export(output_dir: str, file_format: Optional[str] = None):
+    """
+    Exporta Repositorios e Projetos em formato colunar (Parquet ou .npz) para 'output_dir', lendo o banco
+    em blocos de EXPORT_CHUNK_SIZE linhas, e grava as agregações vetorizadas em 'agregacoes.json'.
+    """
+    from src.services.columnar_export import export_analytics
+
+    metrics.reset()
+    SchemaManager().create_all_tables()
+    try:
+        with metrics.stage("total"):
+            aggregations = export_analytics(output_dir, file_format)["agregacoes"]
+    except ImportError as e:
+        logger.error(str(e))
+        return
+    finally:
+        metrics.export()
+    for project in aggregations["projetos"][:10]:
+        logger.info(f"  {project['projeto']}: {project['repositorios']} repositórios, "
+                    f"{project['estrelas']} estrelas, {project['forks']} forks")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Monitoramento de repositórios GitHub.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Sincroniza apenas os repositórios alterados desde a última execução.")
+    parser.add_argument("--org", dest="organizations", action="append", metavar="ORGANIZACAO",
+                        help="Organização a monitorar (pode ser repetido). Padrão: organizações do arquivo de projetos.")
+    parser.add_argument("--enrich", action="store_true",
+                        help="Enriquece os metadados dos repositórios (linguagem, tópicos, issues/PRs) via GraphQL.")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Executa continuamente, com intervalo de coleta adaptativo por organização.")
+    parser.add_argument("--reassign", action="store_true",
+                        help="Reaplica as regras de atribuição aos repositórios já gravados (sem acessar a API).")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Com --reassign, apenas exibe as mudanças de projeto, sem gravá-las.")
+    parser.add_argument("--report", action="store_true",
+                        help="Exibe o resumo por projeto, os principais projetos e os repositórios desatualizados.")
+    parser.add_argument("--stale-days", type=int, default=180, metavar="DIAS",
+                        help="Com --report, dias sem atualização para um repositório ser considerado desatualizado.")
+    parser.add_argument("--search", metavar="TEXTO",
+                        help="Busca repositórios por nome, descrição, tópicos ou projeto, por relevância.")
+    parser.add_argument("--limit", type=int, default=20, metavar="N",
+                        help="Com --search, quantidade máxima de resultados.")
+    parser.add_argument("--preview-keyword", metavar="PALAVRA",
+                        help="Mostra os repositórios que uma palavra-chave nova das regras casaria (requer --project).")
+    parser.add_argument("--project", metavar="PROJETO",
+                        help="Com --preview-keyword, projeto cuja regra receberia a palavra-chave.")
+    parser.add_argument("--export", metavar="DIRETORIO",
+                        help="Exporta repositórios e projetos em formato colunar, com agregações vetorizadas.")
+    parser.add_argument("--export-format", choices=("parquet", "npz"),
+                        help="Formato de --export. Padrão: parquet se o pyarrow estiver instalado, senão npz.")
+    parser.add_argument("--webhook", action="store_true",
+                        help="Recebe os webhooks da organização (repository, star, fork, push). Combina com --daemon.")
+    parser.add_argument("--replay-webhooks", metavar="ARQUIVO",
+                        help="Reproduz entregas de webhook gravadas em JSON Lines (WEBHOOK_RECORD_PATH).")
+    parser.add_argument("--webhook-url", metavar="URL",
+                        help="Com --replay-webhooks, reenvia as entregas assinadas a um receptor em execução.")
+    args = parser.parse_args(argv)
+    if args.preview_keyword and not args.project:
+        parser.error("--preview-keyword requer --project.")
+    return args
 
 
 if __name__ == "__main__":
+    args = parse_args()
     setup_logging()
-    main()
\ No newline at end of file
+    if args.search:
+        search(args.search, limit=args.limit)
+    elif args.preview_keyword:
+        preview_rule_keyword(args.preview_keyword, args.project)
+    elif args.export:
+        export(args.export, file_format=args.export_format)
+    elif args.report:
+        report(stale_days=args.stale_days)
+    elif args.reassign:
+        reassign(dry_run=args.dry_run)
+    elif args.replay_webhooks:
+        replay_webhooks(args.replay_webhooks, organizations=args.organizations, url=args.webhook_url)
+    elif args.daemon:
+        run_daemon(organizations=args.organizations, webhook=args.webhook)
+    elif args.webhook:
+        run_webhook_receiver(organizations=args.organizations)
+    else:
+        main(incremental=args.incremental, organizations=args.organizations, enrich=args.enrich)
\ No newline at end of file
@@ -1,39 +1,198 @@
-
-
+import atexit
 import os
-from dotenv import load_dotenv
 import logging
+import queue
+import threading
+from typing import Any, Callable, Dict, Tuple
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root_dir = os.path.join(current_dir, '..', '..')
-
-load_dotenv(os.path.join(project_root_dir, '.env'))
-
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
-DATABASE_NAME = os.path.join(project_root_dir, "data", "repos_monitor.db")
-PROJECTS_CSV_PATH = os.path.join(project_root_dir, "data", "projetos.csv")
-PROJECTS_JSON_PATH = os.path.join(project_root_dir, "data", "projetos.json")
-
-PROJECT_ASSIGNMENT_RULES_PATH = os.path.join(project_root_dir, "data", "project_assignment_rules.yaml")
+data_dir = os.path.join(project_root_dir, "data")
 
 LOG_FILE = os.path.join(project_root_dir, "app.log")
 LOG_LEVEL = logging.INFO
 
 DEFAULT_PROJECT_NAME = "Projeto Diversos"
 
-if not GITHUB_TOKEN:
-    raise ValueError("GITHUB_TOKEN não configurado nas variáveis de ambiente. Verifique o arquivo .env.")
+_log_listener = None  # logging.handlers.QueueListener de setup_logging
+
+
+def _data_path(file_name: str) -> Callable[[], str]:
+    return lambda: os.path.join(data_dir, file_name)
+
+
+# Configurações: nome do atributo -> (variável de ambiente, valor padrão, conversor).
+_SETTINGS_SPEC: Dict[str, Tuple[str, Any, Callable[[str], Any]]] = {
+    "github_token": ("GITHUB_TOKEN", None, str),
+    "database_name": ("DATABASE_NAME", _data_path("repos_monitor.db"), str),
+    "projects_csv_path": ("PROJECTS_CSV_PATH", _data_path("projetos.csv"), str),
+    "projects_json_path": ("PROJECTS_JSON_PATH", _data_path("projetos.json"), str),
+    "project_assignment_rules_path": ("PROJECT_ASSIGNMENT_RULES_PATH", _data_path("project_assignment_rules.yaml"), str),
+    # Cache das regras compiladas (padrão: '<banco>.rules.pickle', ao lado do banco de dados).
+    "rules_cache_path": ("RULES_CACHE_PATH", None, str),
+    # URL base da API REST do GitHub (pode apontar para um servidor local nos benchmarks).
+    "github_api_url": ("GITHUB_API_URL", "https://api.github.com", str),
+    # Endpoint da API GraphQL do GitHub, usado no enriquecimento dos metadados (também substituível localmente).
+    "github_graphql_url": ("GITHUB_GRAPHQL_URL", "https://api.github.com/graphql", str),
+    # Repositórios por requisição GraphQL no enriquecimento (máximo permitido pelo GitHub: 100).
+    "graphql_page_size": ("GRAPHQL_PAGE_SIZE", 100, int),
+    # Número de páginas da API do GitHub buscadas em paralelo (1 = busca sequencial).
+    "github_max_workers": ("GITHUB_MAX_WORKERS", 8, int),
+    # PRAGMAs aplicados às conexões do pool SQLite (cache_size negativo = KiB).
+    "sqlite_journal_mode": ("SQLITE_JOURNAL_MODE", "WAL", str),
+    "sqlite_synchronous": ("SQLITE_SYNCHRONOUS", "NORMAL", str),
+    "sqlite_cache_size": ("SQLITE_CACHE_SIZE", -16000, int),
+    "sqlite_mmap_size": ("SQLITE_MMAP_SIZE", 256 * 1024 * 1024, int),
+    # Conexões do pool somente leitura (mode=ro), sem criar o banco nem alterar o modo de journal.
+    "sqlite_read_only": ("SQLITE_READ_ONLY", False, lambda value: value.strip().lower() in ("1", "true", "sim")),
+    # Tamanho do cache de comandos preparados de cada conexão do pool.
+    "sqlite_cached_statements": ("SQLITE_CACHED_STATEMENTS", 256, int),
+    # Coleta concorrente de várias organizações: limite de requisições simultâneas e
+    # quantidade de requisições do rate limit preservadas (não usadas pelo coletor).
+    "github_max_concurrency": ("GITHUB_MAX_CONCURRENCY", 8, int),
+    "github_rate_limit_reserve": ("GITHUB_RATE_LIMIT_RESERVE", 50, int),
+    # Quantidade de repositórios gravados por transação no upsert em lote.
+    "upsert_batch_size": ("UPSERT_BATCH_SIZE", 1000, int),
+    # Quantidade de projetos gravados por transação na importação em lote do catálogo de projetos.
+    "project_import_batch_size": ("PROJECT_IMPORT_BATCH_SIZE", 50000, int),
+    # Linhas lidas do SQLite por bloco na exportação colunar (limita o pico de memória).
+    "export_chunk_size": ("EXPORT_CHUNK_SIZE", 50000, int),
+    # Intervalo máximo entre reconciliações completas no modo incremental (detecção de remoções).
+    "full_reconcile_interval_hours": ("FULL_RECONCILE_INTERVAL_HOURS", 24.0, float),
+    # Modo daemon: limites do intervalo adaptativo entre coletas de uma organização e orçamento de
+    # requisições por hora (abaixo do limite de 5000/hora do token, para sobrar margem a outros usos).
+    "daemon_min_interval_seconds": ("DAEMON_MIN_INTERVAL_SECONDS", 60.0, float),
+    "daemon_max_interval_seconds": ("DAEMON_MAX_INTERVAL_SECONDS", 6 * 60 * 60.0, float),
+    "daemon_api_budget_per_hour": ("DAEMON_API_BUDGET_PER_HOUR", 4000, int),
+    # Receptor de webhooks da organização: segredo do HMAC (X-Hub-Signature-256), endereço, micro-lotes
+    # (eventos por transação e espera máxima para fechar um lote) e arquivo JSON Lines opcional onde
+    # gravar as entregas recebidas para reprodução posterior.
+    "webhook_secret": ("GITHUB_WEBHOOK_SECRET", None, str),
+    "webhook_host": ("WEBHOOK_HOST", "127.0.0.1", str),
+    "webhook_port": ("WEBHOOK_PORT", 8000, int),
+    "webhook_batch_size": ("WEBHOOK_BATCH_SIZE", 500, int),
+    "webhook_flush_seconds": ("WEBHOOK_FLUSH_SECONDS", 1.0, float),
+    "webhook_record_path": ("WEBHOOK_RECORD_PATH", None, str),
+    # Cache em disco das respostas da API do GitHub (requisições condicionais com ETag).
+    "http_cache_path": ("HTTP_CACHE_PATH", _data_path("http_cache.db"), str),
+    "http_cache_max_bytes": ("HTTP_CACHE_MAX_BYTES", 64 * 1024 * 1024, int),
+    # Métricas exportadas ao fim de cada execução: resumo JSON e arquivo do Prometheus (textfile collector).
+    "metrics_json_path": ("METRICS_JSON_PATH", _data_path("metrics.json"), str),
+    "metrics_prometheus_path": ("METRICS_PROMETHEUS_PATH", _data_path("repo_monitor.prom"), str),
+    # Perfilamento opcional da execução: "cprofile", "tracemalloc" ou "cprofile,tracemalloc".
+    "profile_mode": ("REPO_MONITOR_PROFILE", "", str),
+    "profile_output_dir": ("REPO_MONITOR_PROFILE_DIR", _data_path("profile"), str),
+}
+
+
+class Settings:
+    """
+    Configurações da aplicação, avaliadas sob demanda.
+    O arquivo .env só é lido no primeiro acesso a uma configuração, e cada valor vem, nesta ordem,
+    de override(), da variável de ambiente correspondente ou do valor padrão.
+    O GITHUB_TOKEN só é exigido quando é efetivamente usado.
+    """
+
+    def __init__(self):
+        self._values: Dict[str, Any] = {}
+        self._overrides: Dict[str, Any] = {}
+        self._env_loaded = False
+        self._lock = threading.Lock()
+
+    def _load_env(self):
+        if self._env_loaded:
+            return
+        with self._lock:
+            if not self._env_loaded:
+                from dotenv import load_dotenv
+                load_dotenv(os.path.join(project_root_dir, '.env'))
+                self._env_loaded = True
+
+    def _resolve(self, name: str) -> Any:
+        if name in self._overrides:
+            return self._overrides[name]
+        if name in self._values:
+            return self._values[name]
+        env_var, default, convert = _SETTINGS_SPEC[name]
+        self._load_env()
+        raw_value = os.getenv(env_var)
+        if raw_value is None:
+            value = default() if callable(default) else default
+        else:
+            value = convert(raw_value)
+        self._values[name] = value
+        return value
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_") or name not in _SETTINGS_SPEC:
+            raise AttributeError(f"Configuração desconhecida: '{name}'.")
+        return self._resolve(name)
+
+    @property
+    def github_token(self) -> str:
+        token = self._resolve("github_token")
+        if not token:
+            raise ValueError("GITHUB_TOKEN não configurado nas variáveis de ambiente. Verifique o arquivo .env.")
+        return token
+
+    @property
+    def sqlite_pragmas(self) -> Dict[str, Any]:
+        """PRAGMAs aplicados às conexões do pool SQLite."""
+        return {
+            "journal_mode": self.sqlite_journal_mode,
+            "synchronous": self.sqlite_synchronous,
+            "cache_size": self.sqlite_cache_size,
+            "mmap_size": self.sqlite_mmap_size,
+            "temp_store": "MEMORY",
+        }
+
+    def override(self, **values: Any):
+        """Sobrescreve configurações (por exemplo, caminhos em testes e benchmarks)."""
+        for name in values:
+            if name not in _SETTINGS_SPEC:
+                raise AttributeError(f"Configuração desconhecida: '{name}'.")
+        self._overrides.update(values)
+
+    def reset(self):
+        """Descarta os valores já avaliados e as sobrescritas."""
+        self._values.clear()
+        self._overrides.clear()
+
+
+settings = Settings()
+
+
+def __getattr__(name: str) -> Any:
+    """Compatibilidade com as constantes antigas do módulo (ex.: DATABASE_NAME), avaliadas sob demanda."""
+    attribute = name.lower()
+    if attribute in _SETTINGS_SPEC or attribute == "sqlite_pragmas":
+        return getattr(settings, attribute)
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
 
 def setup_logging():
-    logging.basicConfig(
-        level=LOG_LEVEL,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(LOG_FILE),
-            logging.StreamHandler()
-        ]
-    )
-
-setup_logging()
-
-logging.info("Configurações carregadas com sucesso.")
\ No newline at end of file
+    """
+    Configura o logging da aplicação (arquivo LOG_FILE e console).
+    Os registros passam por uma fila: o QueueHandler do logger raiz só enfileira, e uma thread do
+    QueueListener grava no arquivo e no console, de modo que a escrita em disco não bloqueia as threads
+    que registram. A fila é esvaziada ao encerrar o processo.
+    """
+    # logging.handlers (socket, pickle...) só é importado quando a aplicação configura o logging.
+    from logging.handlers import QueueHandler, QueueListener
+
+    global _log_listener
+    if _log_listener is not None:
+        return
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [logging.FileHandler(LOG_FILE), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    log_queue = queue.SimpleQueue()
+    _log_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+    # O QueueHandler só junta a mensagem (e o traceback); o formato completo é aplicado pelo listener.
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(level=LOG_LEVEL, handlers=[queue_handler])
+    logging.info("Configurações carregadas com sucesso.")
@@ -1,20 +1,166 @@
 
+import atexit
+import os
 import sqlite3
 import logging
-from src.config.config import DATABASE_NAME
+import threading
+import time
+from typing import Dict, Any, NamedTuple, Optional, Tuple
+from urllib.request import pathname2url
+from src.config.config import settings
 
 logger = logging.getLogger(__name__)
 
 
-class DatabaseManager:
-    """Gerencia a conexão com o banco de dados SQLite."""
+class ConnectionPool:
+    """
+    Mantém uma conexão SQLite de longa duração por thread para um banco de dados.
+    As conexões são configuradas com os PRAGMAs informados e reaproveitadas entre os blocos 'with',
+    o que também mantém aquecido o cache de comandos preparados (cached_statements) de cada conexão.
+    """
 
-    def __init__(self, db_name: str):
+    def __init__(self, db_name: str, pragmas: Optional[Dict[str, Any]] = None,
+                 cached_statements: Optional[int] = None, read_only: bool = False):
         self.db_name = db_name
+        self.read_only = read_only
+        self.pragmas = dict(settings.sqlite_pragmas if pragmas is None else pragmas)
+        if read_only:
+            # O modo de journal é gravado no arquivo do banco; uma conexão somente leitura não o altera.
+            self.pragmas.pop("journal_mode", None)
+        self.cached_statements = settings.sqlite_cached_statements if cached_statements is None else cached_statements
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+        self.connections_opened = 0
+        self.checkouts = 0
+        self.wait_time = 0.0
+
+    def _open(self) -> sqlite3.Connection:
+        """Abre uma nova conexão (somente leitura, se configurado) e aplica os PRAGMAs configurados."""
+        if self.read_only:
+            conn = sqlite3.connect(f"file:{pathname2url(os.path.abspath(self.db_name))}?mode=ro", uri=True,
+                                   cached_statements=self.cached_statements, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.db_name, cached_statements=self.cached_statements, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {pragma} = {value}")
+        with self._lock:
+            self._connections.append(conn)
+            self.connections_opened += 1
+        logger.debug(f"Conexão aberta com o banco de dados '{self.db_name}' ({threading.current_thread().name}).")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """Retorna a conexão da thread atual, abrindo-a na primeira utilização."""
+        started_at = time.perf_counter()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            self._local.depth = 0
+        self._local.depth += 1
+        with self._lock:
+            self.checkouts += 1
+            self.wait_time += time.perf_counter() - started_at
+        return conn
+
+    def release(self):
+        """
+        Devolve a conexão da thread atual.
+        Ao sair do bloco 'with' mais externo, transações não confirmadas são desfeitas,
+        como aconteceria ao fechar a conexão.
+        """
+        self._local.depth -= 1
+        conn = self._local.conn
+        if self._local.depth == 0 and conn.in_transaction:
+            conn.rollback()
+
+    def close_all(self):
+        """Fecha todas as conexões abertas pelo pool."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.error(f"Erro ao fechar conexão com o banco de dados '{self.db_name}': {e}")
+        self._local = threading.local()
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna as estatísticas de uso do pool."""
+        with self._lock:
+            return {
+                "conexoes_abertas": self.connections_opened,
+                "checkouts": self.checkouts,
+                "tempo_espera_s": self.wait_time,
+            }
+
+    def log_stats(self):
+        """Registra no log as estatísticas de uso do pool."""
+        stats = self.stats()
+        logger.info(
+            f"Pool de conexões '{self.db_name}': {stats['conexoes_abertas']} conexões abertas, "
+            f"{stats['checkouts']} checkouts, {stats['tempo_espera_s'] * 1000:.1f} ms de espera.")
+
+
+_pools: Dict[Tuple[str, bool], ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(db_name: str) -> ConnectionPool:
+    """
+    Retorna o pool de conexões compartilhado para o banco de dados informado (um pool separado,
+    somente leitura, enquanto settings.sqlite_read_only estiver ativo).
+    """
+    read_only = bool(settings.sqlite_read_only) and db_name != ":memory:"
+    key = (db_name if db_name == ":memory:" else os.path.abspath(db_name), read_only)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.setdefault(key, ConnectionPool(db_name, read_only=read_only))
+    return pool
+
+
+@atexit.register
+def close_all_pools():
+    """Fecha as conexões de todos os pools."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_all()
+
+
+class DatabaseManager:
+    """
+    Gerencia a conexão com o banco de dados SQLite.
+    Por padrão usa o pool compartilhado do banco (uma conexão de longa duração por thread);
+    com pooled=False abre e fecha uma conexão a cada bloco 'with'.
+    Sem db_name, usa o banco configurado em settings.database_name no momento da conexão.
+    """
+
+    def __init__(self, db_name: Optional[str] = None, pooled: bool = True):
+        self._db_name = db_name
+        self.pooled = pooled
+
+    @property
+    def db_name(self) -> str:
+        return self._db_name or settings.database_name
+
+    @db_name.setter
+    def db_name(self, value: str):
+        self._db_name = value
+
+    @property
+    def pool(self) -> ConnectionPool:
+        """Pool de conexões compartilhado do banco de dados."""
+        return get_connection_pool(self.db_name)
 
     def __enter__(self):
-        """Abre a conexão ao entrar no bloco 'with'."""
+        """Obtém a conexão ao entrar no bloco 'with'."""
         try:
+            if self.pooled:
+                return self.pool.acquire()
             self.conn = sqlite3.connect(self.db_name)
             self.conn.row_factory = sqlite3.Row
             return self.conn
@@ -23,15 +169,90 @@ class DatabaseManager:
             raise
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Fecha a conexão ao sair do bloco 'with'."""
-        if self.conn:
+        """Devolve a conexão ao pool (ou a fecha) ao sair do bloco 'with'."""
+        if self.pooled:
+            self.pool.release()
+        elif self.conn:
             self.conn.close()
 
 
+class RepoRecord(NamedTuple):
+    """
+    Dados de um repositório coletado, na ordem das colunas gravadas em Repositorios.
+    Tupla nomeada (sem __dict__ por instância): ocupa uma fração de um dicionário com as mesmas chaves
+    e vai direto como parâmetros do UPSERT.
+    """
+    github_id: int
+    nome: str
+    visibilidade: str
+    data_criacao: str
+    data_ultima_atualizacao: str
+    estrelas: int
+    forks: int
+    url: str
+    descricao: Optional[str] = None
+    projeto_id: Optional[int] = None
+
+
+# Recalcula ProjetoResumo a partir de Repositorios (preenchimento inicial e reconstrução).
+PROJETO_RESUMO_REBUILD_SQL = """
+    INSERT OR REPLACE INTO ProjetoResumo (projeto_id, repositorios, publicos, privados, estrelas, forks,
+                                          ultima_atualizacao)
+    SELECT projeto_id, COUNT(*), SUM(visibilidade = 'público'), SUM(visibilidade <> 'público'),
+           COALESCE(SUM(estrelas), 0), COALESCE(SUM(forks), 0), MAX(data_ultima_atualizacao)
+    FROM Repositorios
+    WHERE projeto_id IS NOT NULL
+    GROUP BY projeto_id
+"""
+
+
+# Tópicos (array JSON em Repositorios.topicos) como texto separado por espaços para o índice de busca.
+_SEARCH_TOPICS_SQL = "CASE WHEN json_valid({0}) THEN (SELECT group_concat(value, ' ') FROM json_each({0})) END"
+
+_SEARCH_INDEX_INSERT_SQL = f"""
+    INSERT INTO RepositoriosBusca (rowid, nome, descricao, topicos, projeto)
+    SELECT r.id, r.nome, r.descricao, {_SEARCH_TOPICS_SQL.format("r.topicos")}, p.nome
+    FROM Repositorios r
+    LEFT JOIN Projetos p ON p.id = r.projeto_id
+"""
+
+# Preenche RepositoriosBusca a partir de Repositorios e Projetos (preenchimento inicial e reconstrução).
+REPOSITORIOS_BUSCA_REBUILD_SQL = _SEARCH_INDEX_INSERT_SQL
+
+# Reindexa, em poucas instruções, os repositórios anotados pelos gatilhos em RepositoriosBuscaPendentes
+# (os removidos de Repositorios apenas saem do índice).
+REPOSITORIOS_BUSCA_APPLY_SQL = (
+    "DELETE FROM RepositoriosBusca WHERE rowid IN (SELECT id FROM RepositoriosBuscaPendentes)",
+    _SEARCH_INDEX_INSERT_SQL + "WHERE r.id IN (SELECT id FROM RepositoriosBuscaPendentes)",
+    "DELETE FROM RepositoriosBuscaPendentes",
+)
+
+# Tokenizadores do índice de busca, em ordem de preferência: trigram (SQLite >= 3.34) permite buscar
+# qualquer trecho do nome, como um LIKE '%...%'; unicode61 busca por palavras e prefixos.
+SEARCH_TOKENIZERS = ("trigram", "unicode61 remove_diacritics 2")
+
+
 class SchemaManager:
     """Gerencia a criação das tabelas no banco de dados."""
 
-    def __init__(self, db_name: str):
+    # Colunas acrescentadas à tabela Repositorios depois da sua definição original.
+    # Bancos existentes são migrados com ALTER TABLE ... ADD COLUMN em create_all_tables.
+    REPOSITORIOS_EXTRA_COLUMNS = {
+        # Metadados obtidos no enriquecimento via GraphQL (src/services/github_graphql.py).
+        "linguagem": "TEXT",
+        "topicos": "TEXT",  # Array JSON com os nomes dos tópicos.
+        "issues_abertas": "INTEGER",
+        "pull_requests_abertos": "INTEGER",
+        "data_ultimo_commit": "TEXT",
+        "arquivado": "INTEGER",
+        "enriquecido_em": "TEXT",
+        # Hash dos campos gravados pela coleta (src/repositories/github_repository.py): o UPSERT não
+        # reescreve linhas sem alterações.
+        "hash_conteudo": "INTEGER",
+        "descricao": "TEXT",
+    }
+
+    def __init__(self, db_name: Optional[str] = None):
         self.db_manager = DatabaseManager(db_name)
 
     def create_all_tables(self):
@@ -108,8 +329,232 @@ class SchemaManager:
                                )
                                    );
                                """)
-                conn.commit()
                 logger.info("Tabela 'Repositorios' criada ou já existente.")
+                self._add_missing_columns(cursor, "Repositorios", self.REPOSITORIOS_EXTRA_COLUMNS)
+
+                cursor.execute("""
+                               CREATE TABLE IF NOT EXISTS EstadoSincronizacao
+                               (
+                                   organizacao TEXT PRIMARY KEY,
+                                   marca_atualizacao TEXT,
+                                   ultima_sincronizacao TEXT NOT NULL,
+                                   ultima_reconciliacao TEXT
+                               );
+                               """)
+                logger.info("Tabela 'EstadoSincronizacao' criada ou já existente.")
+
+                # Histórico de estrelas/forks: uma linha por repositório apenas quando os contadores mudam.
+                # A chave primária (repositorio_id, coletado_em) em uma tabela WITHOUT ROWID é o próprio
+                # índice clusterizado usado nas consultas de tendência.
+                cursor.execute("""
+                               CREATE TABLE IF NOT EXISTS RepositorioSnapshots
+                               (
+                                   repositorio_id INTEGER NOT NULL,
+                                   coletado_em INTEGER NOT NULL,
+                                   estrelas INTEGER,
+                                   forks INTEGER,
+                                   PRIMARY KEY (repositorio_id, coletado_em),
+                                   FOREIGN KEY (repositorio_id) REFERENCES Repositorios (id)
+                               ) WITHOUT ROWID;
+                               """)
+                logger.info("Tabela 'RepositorioSnapshots' criada ou já existente.")
+
+                # Agendamento do modo daemon: intervalo adaptativo e próxima coleta (timestamps Unix) por organização.
+                cursor.execute("""
+                               CREATE TABLE IF NOT EXISTS AgendamentoColeta
+                               (
+                                   organizacao TEXT PRIMARY KEY,
+                                   intervalo_s REAL NOT NULL,
+                                   proxima_execucao REAL NOT NULL,
+                                   ultima_execucao REAL,
+                                   ultimas_alteracoes INTEGER NOT NULL DEFAULT 0,
+                                   ultimo_custo INTEGER NOT NULL DEFAULT 1
+                               );
+                               """)
+                logger.info("Tabela 'AgendamentoColeta' criada ou já existente.")
+
+                self._create_reporting_indexes(cursor)
+                self._create_project_summary(cursor)
+                self._create_search_index(cursor)
+                conn.commit()
             except sqlite3.Error as e:
                 logger.error(f"Erro ao criar tabelas: {e}")
-                raise
\ No newline at end of file
+                raise
+
+    @staticmethod
+    def _create_reporting_indexes(cursor: sqlite3.Cursor):
+        """Índices das consultas de relatório (src/repositories/report_repository.py)."""
+        # (projeto_id, data_ultima_atualizacao) atende tanto os filtros por projeto quanto o MAX da
+        # atualização mais recente de um projeto, usado pelos gatilhos de ProjetoResumo.
+        cursor.execute("""
+                       CREATE INDEX IF NOT EXISTS idx_repositorios_projeto_atualizacao
+                           ON Repositorios (projeto_id, data_ultima_atualizacao)
+                       """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_repositorios_visibilidade ON Repositorios (visibilidade)")
+        cursor.execute("""
+                       CREATE INDEX IF NOT EXISTS idx_repositorios_atualizacao
+                           ON Repositorios (data_ultima_atualizacao)
+                       """)
+        logger.info("Índices de relatório da tabela 'Repositorios' criados ou já existentes.")
+
+    @staticmethod
+    def _create_project_summary(cursor: sqlite3.Cursor):
+        """
+        Cria a tabela ProjetoResumo (totais por projeto) e os gatilhos que a mantêm a cada INSERT,
+        UPDATE e DELETE em Repositorios, aplicando apenas a diferença de cada linha alterada.
+        Em bancos existentes, a tabela é preenchida uma única vez a partir de Repositorios.
+        """
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ProjetoResumo'").fetchone()
+        cursor.execute("""
+                       CREATE TABLE IF NOT EXISTS ProjetoResumo
+                       (
+                           projeto_id INTEGER PRIMARY KEY,
+                           repositorios INTEGER NOT NULL DEFAULT 0,
+                           publicos INTEGER NOT NULL DEFAULT 0,
+                           privados INTEGER NOT NULL DEFAULT 0,
+                           estrelas INTEGER NOT NULL DEFAULT 0,
+                           forks INTEGER NOT NULL DEFAULT 0,
+                           ultima_atualizacao TEXT,
+                           FOREIGN KEY (projeto_id) REFERENCES Projetos (id)
+                       );
+                       """)
+        if not exists:
+            cursor.execute(PROJETO_RESUMO_REBUILD_SQL)
+        logger.info("Tabela 'ProjetoResumo' criada ou já existente.")
+
+        add_new = """
+            INSERT INTO ProjetoResumo (projeto_id, repositorios, publicos, privados, estrelas, forks,
+                                       ultima_atualizacao)
+            SELECT NEW.projeto_id, 1, NEW.visibilidade = 'público', NEW.visibilidade <> 'público',
+                   COALESCE(NEW.estrelas, 0), COALESCE(NEW.forks, 0), NEW.data_ultima_atualizacao
+            WHERE NEW.projeto_id IS NOT NULL
+            ON CONFLICT(projeto_id) DO UPDATE SET
+                repositorios = repositorios + 1,
+                publicos = publicos + excluded.publicos,
+                privados = privados + excluded.privados,
+                estrelas = estrelas + excluded.estrelas,
+                forks = forks + excluded.forks,
+                ultima_atualizacao = MAX(COALESCE(ultima_atualizacao, ''), excluded.ultima_atualizacao);
+        """
+        # A atualização mais recente não pode ser "subtraída": é relida pelo índice (projeto_id, data).
+        remove_old = """
+            UPDATE ProjetoResumo SET
+                repositorios = repositorios - 1,
+                publicos = publicos - (OLD.visibilidade = 'público'),
+                privados = privados - (OLD.visibilidade <> 'público'),
+                estrelas = estrelas - COALESCE(OLD.estrelas, 0),
+                forks = forks - COALESCE(OLD.forks, 0),
+                ultima_atualizacao = (SELECT MAX(data_ultima_atualizacao) FROM Repositorios
+                                      WHERE projeto_id = OLD.projeto_id)
+            WHERE projeto_id = OLD.projeto_id;
+            DELETE FROM ProjetoResumo WHERE projeto_id = OLD.projeto_id AND repositorios <= 0;
+        """
+        cursor.execute(f"""
+                       CREATE TRIGGER IF NOT EXISTS trg_projeto_resumo_insert
+                       AFTER INSERT ON Repositorios
+                       BEGIN {add_new} END
+                       """)
+        cursor.execute(f"""
+                       CREATE TRIGGER IF NOT EXISTS trg_projeto_resumo_update
+                       AFTER UPDATE OF projeto_id, visibilidade, estrelas, forks, data_ultima_atualizacao
+                       ON Repositorios
+                       WHEN OLD.projeto_id IS NOT NEW.projeto_id
+                           OR OLD.visibilidade IS NOT NEW.visibilidade
+                           OR OLD.estrelas IS NOT NEW.estrelas
+                           OR OLD.forks IS NOT NEW.forks
+                           OR OLD.data_ultima_atualizacao IS NOT NEW.data_ultima_atualizacao
+                       BEGIN {remove_old} {add_new} END
+                       """)
+        cursor.execute(f"""
+                       CREATE TRIGGER IF NOT EXISTS trg_projeto_resumo_delete
+                       AFTER DELETE ON Repositorios
+                       BEGIN {remove_old} END
+                       """)
+
+    @staticmethod
+    def _create_search_index(cursor: sqlite3.Cursor):
+        """
+        Cria o índice de busca textual RepositoriosBusca (FTS5) sobre nome, descrição e tópicos dos
+        repositórios e o nome do projeto, com rowid = Repositorios.id, e os gatilhos que anotam em
+        RepositoriosBuscaPendentes os repositórios a reindexar a cada INSERT, UPDATE e DELETE em
+        Repositorios e a cada renomeação de projeto (ver REPOSITORIOS_BUSCA_APPLY_SQL).
+        Usa o primeiro tokenizador de SEARCH_TOKENIZERS disponível no SQLite; sem FTS5, a busca fica
+        indisponível e o restante do esquema segue normalmente.
+        """
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'RepositoriosBusca'").fetchone()
+        if not exists:
+            for tokenizer in SEARCH_TOKENIZERS:
+                try:
+                    cursor.execute(f"""
+                                   CREATE VIRTUAL TABLE RepositoriosBusca USING fts5(
+                                       nome, descricao, topicos, projeto, tokenize = '{tokenizer}'
+                                   )
+                                   """)
+                    break
+                except sqlite3.OperationalError as e:
+                    if "fts5" in str(e):
+                        logger.warning(f"SQLite sem suporte a FTS5: a busca de repositórios fica indisponível ({e}).")
+                        return
+                    logger.warning(f"Tokenizador '{tokenizer}' indisponível no SQLite ({e}). Tentando o próximo.")
+            else:
+                logger.warning("Nenhum tokenizador de busca disponível: a busca de repositórios fica indisponível.")
+                return
+            cursor.execute(REPOSITORIOS_BUSCA_REBUILD_SQL)
+        logger.info("Índice de busca 'RepositoriosBusca' criado ou já existente.")
+
+        # Os gatilhos só anotam os repositórios alterados: inserir no FTS5 linha a linha, de dentro de um
+        # gatilho, grava um segmento do índice por linha. SearchRepository.apply_pending_changes aplica as
+        # anotações de uma vez.
+        cursor.execute("""
+                       CREATE TABLE IF NOT EXISTS RepositoriosBuscaPendentes
+                       (
+                           id INTEGER PRIMARY KEY
+                       )
+                       """)
+        # NOT EXISTS em vez de INSERT OR IGNORE: a política de conflito da instrução que dispara o gatilho
+        # (como o UPSERT de Repositorios) substitui a das instruções do gatilho.
+        mark = """
+            INSERT INTO RepositoriosBuscaPendentes (id)
+            SELECT {0}.id WHERE NOT EXISTS (SELECT 1 FROM RepositoriosBuscaPendentes WHERE id = {0}.id);
+        """
+        mark_new = mark.format("NEW")
+        cursor.execute(f"""
+                       CREATE TRIGGER IF NOT EXISTS trg_repositorios_busca_insert
+                       AFTER INSERT ON Repositorios
+                       BEGIN {mark_new} END
+                       """)
+        cursor.execute(f"""
+                       CREATE TRIGGER IF NOT EXISTS trg_repositorios_busca_update
+                       AFTER UPDATE OF nome, descricao, topicos, projeto_id ON Repositorios
+                       WHEN OLD.nome IS NOT NEW.nome
+                           OR OLD.descricao IS NOT NEW.descricao
+                           OR OLD.topicos IS NOT NEW.topicos
+                           OR OLD.projeto_id IS NOT NEW.projeto_id
+                       BEGIN {mark_new} END
+                       """)
+        cursor.execute(f"""
+                       CREATE TRIGGER IF NOT EXISTS trg_repositorios_busca_delete
+                       AFTER DELETE ON Repositorios
+                       BEGIN {mark.format("OLD")} END
+                       """)
+        cursor.execute("""
+                       CREATE TRIGGER IF NOT EXISTS trg_repositorios_busca_projeto
+                       AFTER UPDATE OF nome ON Projetos
+                       WHEN OLD.nome IS NOT NEW.nome
+                       BEGIN
+                           INSERT INTO RepositoriosBuscaPendentes (id)
+                           SELECT id FROM Repositorios
+                           WHERE projeto_id = NEW.id AND id NOT IN (SELECT id FROM RepositoriosBuscaPendentes);
+                       END
+                       """)
+
+    @staticmethod
+    def _add_missing_columns(cursor: sqlite3.Cursor, table: str, columns: Dict[str, str]):
+        """Acrescenta à tabela as colunas que ainda não existem (migração de bancos antigos)."""
+        existing = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})").fetchall()}
+        for column, definition in columns.items():
+            if column not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+                logger.info(f"Coluna '{column}' adicionada à tabela '{table}'.")
\ No newline at end of file
@@ -0,0 +1,45 @@
+import sqlite3
+import logging
+from typing import Iterator, List, Optional, Sequence, Tuple
+from src.models.model import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+class ExportRepository:
+    """Leitura em blocos das tabelas para a exportação colunar (src/services/columnar_export.py)."""
+
+    def __init__(self):
+        self.db_manager = DatabaseManager()
+
+    def count_rows(self, table: str) -> int:
+        """Quantidade de linhas da tabela."""
+        with self.db_manager as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def max_id(self, table: str) -> Optional[int]:
+        """Maior id da tabela (None se estiver vazia)."""
+        with self.db_manager as conn:
+            return conn.execute(f"SELECT MAX(id) FROM {table}").fetchone()[0]
+
+    def iter_chunks(self, table: str, expressions: Sequence[str], chunk_size: int) -> Iterator[List[Tuple]]:
+        """
+        Percorre a tabela em ordem de id, em blocos de até chunk_size tuplas com as expressões SQL
+        informadas. Só um bloco fica em memória por vez (sem sqlite3.Row, para reduzir o custo por linha).
+        """
+        with self.db_manager as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            try:
+                cursor.execute(f"SELECT {', '.join(expressions)} FROM {table} ORDER BY id")
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        return
+                    yield rows
+            except sqlite3.Error as e:
+                logger.error(f"Erro ao ler a tabela '{table}' para exportação: {e}")
+                raise
+            finally:
+                cursor.close()
+
+export_repository = ExportRepository()
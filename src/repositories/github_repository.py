@@ -1,58 +1,283 @@
 
+import hashlib
+import json
 import sqlite3
 import logging
-from typing import Dict, Any
-from src.config.config import DATABASE_NAME
-from src.models.model import DatabaseManager
+import time
+from itertools import islice
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
+from src.config.config import settings
+from src.models.model import DatabaseManager, RepoRecord
+from src.services.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
+_UPSERT_COLUMNS = ("github_id", "nome", "visibilidade", "data_criacao", "data_ultima_atualizacao",
+                   "estrelas", "forks", "url", "descricao", "projeto_id")
+
+# Colunas que um dicionário pode omitir (gravadas como NULL).
+_OPTIONAL_UPSERT_COLUMNS = frozenset({"descricao"})
+
+_ENRICHMENT_COLUMNS = ("linguagem", "topicos", "issues_abertas", "pull_requests_abertos",
+                       "data_ultimo_commit", "arquivado", "enriquecido_em")
+
+_ENRICHMENT_SQL = f"""
+    UPDATE Repositorios SET {", ".join(f"{column} = ?" for column in _ENRICHMENT_COLUMNS)}
+    WHERE github_id = ?
+"""
+
+# Sem alterações no conteúdo (hash_conteudo igual), o DO UPDATE é ignorado: a linha não é reescrita,
+# os gatilhos de ProjetoResumo não disparam e nenhuma página do banco ou dos índices é tocada.
+_UPSERT_SQL = f"""
+    INSERT INTO Repositorios ({", ".join(_UPSERT_COLUMNS)}, hash_conteudo)
+    VALUES ({", ".join("?" for _ in _UPSERT_COLUMNS)}, ?)
+    ON CONFLICT(github_id) DO UPDATE SET
+        {", ".join(f"{column} = excluded.{column}" for column in _UPSERT_COLUMNS[1:])},
+        hash_conteudo = excluded.hash_conteudo
+    WHERE Repositorios.hash_conteudo IS NOT excluded.hash_conteudo
+"""
+
+
+# Linhas com a URL de algum repositório do lote, mas outro github_id: o repositório foi excluído e recriado
+# com o mesmo nome no GitHub. Recebe um array JSON de pares [github_id, url].
+_STALE_URL_FILTER = """
+    id IN (SELECT r.id FROM json_each(?) j
+           JOIN Repositorios r ON r.url = json_extract(j.value, '$[1]')
+           WHERE r.github_id <> json_extract(j.value, '$[0]'))
+"""
+_URL_INDEX = _UPSERT_COLUMNS.index("url")
+
+
+def content_hash(values: Tuple) -> int:
+    """
+    Hash de 64 bits (com sinal, para caber em um INTEGER do SQLite) dos valores gravados pelo UPSERT.
+    Estável entre processos, ao contrário de hash() do Python.
+    """
+    digest = hashlib.blake2b("\x1f".join(map(str, values)).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def _upsert_params(repo_data: Union[RepoRecord, Dict[str, Any]]) -> Tuple:
+    """
+    Parâmetros de _UPSERT_SQL: os valores de _UPSERT_COLUMNS (um RepoRecord já está nessa ordem; um
+    dicionário é convertido, e as colunas de _OPTIONAL_UPSERT_COLUMNS ausentes viram None) seguidos do
+    hash do conteúdo.
+    """
+    if isinstance(repo_data, tuple):
+        values = repo_data
+    else:
+        values = tuple(repo_data.get(column) if column in _OPTIONAL_UPSERT_COLUMNS else repo_data[column]
+                       for column in _UPSERT_COLUMNS)
+    return (*values, content_hash(values))
+
+
+def _batched(items: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+    """Agrupa os itens em listas de até batch_size elementos."""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
 class GitHubRepositoryRepository:
     """Gerencia as operações CRUD para a tabela Repositorios."""
 
     def __init__(self):
-        self.db_manager = DatabaseManager(DATABASE_NAME)
+        self.db_manager = DatabaseManager()
 
     def insert_or_update_repository(self, repo_data: Dict[str, Any]) -> bool:
         """
         Insere ou atualiza um repositório no banco de dados.
         Recebe um dicionário com os dados do repositório, incluindo 'projeto_id'.
+        Um repositório sem alterações (mesmo hash_conteudo) não é reescrito.
         """
+        params = _upsert_params(repo_data)
         with self.db_manager as conn:
             try:
                 cursor = conn.cursor()
-                cursor.execute("SELECT id FROM Repositorios WHERE github_id = ?", (repo_data["github_id"],))
+                cursor.execute("SELECT hash_conteudo FROM Repositorios WHERE github_id = ?", (repo_data["github_id"],))
                 existing_repo = cursor.fetchone()
+                if existing_repo and existing_repo[0] == params[-1]:
+                    logger.debug(f"Repositório '{repo_data['nome']}' sem alterações.")
+                    return True
 
-                if existing_repo:
-                    cursor.execute("""
-                        UPDATE Repositorios SET
-                            nome = ?, visibilidade = ?, data_criacao = ?,
-                            data_ultima_atualizacao = ?, estrelas = ?, forks = ?,
-                            url = ?, projeto_id = ?
-                        WHERE github_id = ?
-                    """, (
-                        repo_data["nome"], repo_data["visibilidade"], repo_data["data_criacao"],
-                        repo_data["data_ultima_atualizacao"], repo_data["estrelas"], repo_data["forks"],
-                        repo_data["url"], repo_data["projeto_id"], repo_data["github_id"]
-                    ))
-                    logger.info(f"Repositório '{repo_data['nome']}' atualizado.")
-                else:
-                    cursor.execute("""
-                        INSERT INTO Repositorios (
-                            github_id, nome, visibilidade, data_criacao,
-                            data_ultima_atualizacao, estrelas, forks, url, projeto_id
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        repo_data["github_id"], repo_data["nome"], repo_data["visibilidade"],
-                        repo_data["data_criacao"], repo_data["data_ultima_atualizacao"],
-                        repo_data["estrelas"], repo_data["forks"], repo_data["url"], repo_data["projeto_id"]
-                    ))
-                    logger.info(f"Repositório '{repo_data['nome']}' inserido.")
+                cursor.execute(_UPSERT_SQL, params)
                 conn.commit()
+                logger.debug(f"Repositório '{repo_data['nome']}' {'atualizado' if existing_repo else 'inserido'}.")
                 return True
             except sqlite3.Error as e:
                 logger.error(f"Erro ao inserir/atualizar repositório '{repo_data.get('nome', 'N/A')}': {e}")
                 return False
 
+    def upsert_repositories(self, repos: Iterable[Union[RepoRecord, Dict[str, Any]]],
+                            batch_size: Optional[int] = None) -> Dict[str, int]:
+        """
+        Insere ou atualiza repositórios em lote, com uma única transação por lote.
+        Recebe um iterável de RepoRecord ou de dicionários com os dados dos repositórios, incluindo 'projeto_id'.
+        Repositórios cujo conteúdo não mudou (mesmo hash_conteudo) não são reescritos.
+        Retorna a contagem de repositórios inseridos, atualizados, inalterados e de falhas.
+        """
+        counts = {"inseridos": 0, "atualizados": 0, "inalterados": 0, "falhas": 0}
+        with self.db_manager as conn:
+            for batch in _batched(map(_upsert_params, repos), batch_size or settings.upsert_batch_size):
+                github_ids = {params[0] for params in batch}
+                started_at = time.perf_counter()
+                try:
+                    cursor = conn.cursor()
+                    cursor.execute(
+                        "SELECT COUNT(*) FROM Repositorios WHERE github_id IN (SELECT value FROM json_each(?))",
+                        (json.dumps(list(github_ids)),))
+                    inserted = len(github_ids) - cursor.fetchone()[0]
+                    self._delete_stale_urls(cursor, batch)
+                    cursor.executemany(_UPSERT_SQL, batch)
+                    # rowcount soma as linhas inseridas e as de fato atualizadas (sem as alterações dos gatilhos).
+                    written = cursor.rowcount
+                    conn.commit()
+                except sqlite3.Error as e:
+                    conn.rollback()
+                    logger.error(f"Erro ao inserir/atualizar lote de {len(batch)} repositórios: {e}")
+                    counts["falhas"] += len(batch)
+                    continue
+                elapsed = time.perf_counter() - started_at
+                metrics.add_stage_time("db_upsert", elapsed)
+                metrics.inc("rows_upserted", len(batch))
+                metrics.inc("rows_unchanged", len(batch) - written)
+                if elapsed > 0:
+                    metrics.observe("db_upsert_rows_per_second", len(batch) / elapsed)
+                counts["inseridos"] += inserted
+                counts["atualizados"] += written - inserted
+                counts["inalterados"] += len(batch) - written
+                logger.debug(f"Lote de {len(batch)} repositórios gravado ({inserted} inseridos, {written - inserted} atualizados).")
+        return counts
+
+    @staticmethod
+    def _delete_stale_urls(cursor: sqlite3.Cursor, batch: List[Tuple]):
+        """
+        Remove (com seus snapshots) as linhas que impediriam a gravação do lote por UNIQUE(url): repositórios
+        excluídos e recriados com o mesmo nome, que voltam com outro github_id. Sem isso, o lote inteiro falharia.
+        """
+        params = (json.dumps([[params[0], params[_URL_INDEX]] for params in batch]),)
+        cursor.execute(f"DELETE FROM RepositorioSnapshots WHERE repositorio_id IN "
+                       f"(SELECT id FROM Repositorios WHERE {_STALE_URL_FILTER})", params)
+        cursor.execute(f"DELETE FROM Repositorios WHERE {_STALE_URL_FILTER}", params)
+        if cursor.rowcount:
+            logger.info(f"{cursor.rowcount} repositórios recriados no GitHub: registros antigos com a mesma URL removidos.")
+
+    def delete_missing_repositories(self, org_name: str, github_ids: Iterable[int],
+                                    url_prefix: Optional[str] = None) -> int:
+        """
+        Remove os repositórios da organização que não estão entre os github_ids informados
+        (repositórios excluídos ou transferidos). Deve receber a listagem completa da organização.
+        Os repositórios da organização são os de URL iniciada por 'url_prefix' (o html_url da organização
+        devolvido pela API, como 'https://github.com/<org>/'; por padrão, montado a partir de org_name),
+        sem diferenciar maiúsculas de minúsculas, como os logins do GitHub.
+        Retorna a quantidade de repositórios removidos.
+        """
+        with self.db_manager as conn:
+            try:
+                cursor = conn.cursor()
+                # Prefixo da URL comparado por substr (LIKE trataria '_' e '%' do nome como curingas).
+                missing_filter = ("lower(substr(url, 1, length(?1))) = lower(?1) "
+                                  "AND github_id NOT IN (SELECT value FROM json_each(?2))")
+                params = (url_prefix or f"https://github.com/{org_name}/", json.dumps(list(github_ids)))
+                cursor.execute(f"""
+                    DELETE FROM RepositorioSnapshots
+                    WHERE repositorio_id IN (SELECT id FROM Repositorios WHERE {missing_filter})
+                """, params)
+                cursor.execute(f"DELETE FROM Repositorios WHERE {missing_filter}", params)
+                conn.commit()
+                if cursor.rowcount:
+                    logger.info(f"{cursor.rowcount} repositórios removidos da organização '{org_name}' não existem mais no GitHub.")
+                return cursor.rowcount
+            except sqlite3.Error as e:
+                conn.rollback()
+                logger.error(f"Erro ao remover repositórios ausentes da organização '{org_name}': {e}")
+                return 0
+
+    def get_repositories_by_github_ids(self, github_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """Retorna o nome e o projeto dos repositórios já gravados, indexados pelo github_id."""
+        with self.db_manager as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT github_id, nome, projeto_id FROM Repositorios
+                    WHERE github_id IN (SELECT value FROM json_each(?))
+                """, (json.dumps(list(github_ids)),))
+                return {row["github_id"]: dict(row) for row in cursor.fetchall()}
+            except sqlite3.Error as e:
+                logger.error(f"Erro ao buscar repositórios por github_id: {e}")
+                return {}
+
+    def delete_repositories(self, github_ids: Iterable[int]) -> int:
+        """Remove os repositórios informados (e seus snapshots). Retorna a quantidade de repositórios removidos."""
+        params = (json.dumps(list(github_ids)),)
+        with self.db_manager as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    DELETE FROM RepositorioSnapshots WHERE repositorio_id IN (
+                        SELECT id FROM Repositorios WHERE github_id IN (SELECT value FROM json_each(?)))
+                """, params)
+                cursor.execute("DELETE FROM Repositorios WHERE github_id IN (SELECT value FROM json_each(?))", params)
+                conn.commit()
+                return cursor.rowcount
+            except sqlite3.Error as e:
+                conn.rollback()
+                logger.error(f"Erro ao remover repositórios: {e}")
+                return 0
+
+    def get_project_assignments(self) -> List[Tuple[int, str, Optional[int]]]:
+        """Retorna (id, nome, projeto_id) de todos os repositórios gravados."""
+        with self.db_manager as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SELECT id, nome, projeto_id FROM Repositorios")
+                return [tuple(row) for row in cursor.fetchall()]
+            except sqlite3.Error as e:
+                logger.error(f"Erro ao buscar as atribuições de projeto dos repositórios: {e}")
+                return []
+
+    def reassign_projects(self, moves: Dict[int, List[int]]) -> int:
+        """
+        Move repositórios entre projetos: 'moves' mapeia o projeto de destino para os IDs (Repositorios.id)
+        dos repositórios que passam a pertencer a ele. Executa um UPDATE por projeto de destino, todos em
+        uma única transação. Retorna a quantidade de repositórios atualizados.
+        """
+        with self.db_manager as conn:
+            try:
+                # hash_conteudo inclui o projeto: é limpo para que o próximo UPSERT regrave a linha com o hash novo.
+                # rowcount (e não total_changes) para não contar as alterações dos gatilhos de ProjetoResumo.
+                cursor = conn.cursor()
+                cursor.executemany(
+                    "UPDATE Repositorios SET projeto_id = ?, hash_conteudo = NULL WHERE id IN (SELECT value FROM json_each(?))",
+                    ((projeto_id, json.dumps(repo_ids)) for projeto_id, repo_ids in moves.items()))
+                conn.commit()
+                return cursor.rowcount
+            except sqlite3.Error as e:
+                conn.rollback()
+                logger.error(f"Erro ao reatribuir projetos dos repositórios: {e}")
+                return 0
+
+    def update_enrichment(self, enrichments: List[Dict[str, Any]]) -> int:
+        """
+        Grava os metadados do enriquecimento via GraphQL (linguagem, tópicos, issues e PRs abertos,
+        último commit, arquivado) dos repositórios já existentes, em uma única transação.
+        Retorna a quantidade de repositórios atualizados.
+        """
+        params = [tuple(enrichment[column] for column in _ENRICHMENT_COLUMNS) + (enrichment["github_id"],)
+                  for enrichment in enrichments]
+        with self.db_manager as conn:
+            try:
+                # rowcount (e não total_changes) para não contar as alterações dos gatilhos.
+                cursor = conn.cursor()
+                cursor.executemany(_ENRICHMENT_SQL, params)
+                conn.commit()
+                return cursor.rowcount
+            except sqlite3.Error as e:
+                conn.rollback()
+                logger.error(f"Erro ao gravar o enriquecimento de {len(params)} repositórios: {e}")
+                return 0
+
 github_repository = GitHubRepositoryRepository()
\ No newline at end of file
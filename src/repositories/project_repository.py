@@ -1,8 +1,10 @@
 
+import json
 import sqlite3
 import logging
-from typing import Optional
-from src.config.config import DATABASE_NAME
+from itertools import islice
+from typing import Optional, Dict, Iterable, Tuple
+from src.config.config import settings
 from src.models.model import DatabaseManager
 
 logger = logging.getLogger(__name__)
@@ -11,7 +13,7 @@ class ProjectRepository:
     """Gerencia as operações CRUD para a tabela Projetos."""
 
     def __init__(self):
-        self.db_manager = DatabaseManager(DATABASE_NAME)
+        self.db_manager = DatabaseManager()
 
     def insert_project(self, nome: str, descricao: Optional[str] = None) -> Optional[int]:
         """
@@ -45,4 +47,55 @@ class ProjectRepository:
                 logger.error(f"Erro ao buscar ID do projeto '{nome}': {e}")
                 return None
 
+    def get_project_ids_by_names(self, nomes: Iterable[str]) -> Dict[str, int]:
+        """Retorna um mapa nome -> ID para os projetos informados, em uma única consulta."""
+        nomes = list(nomes)
+        with self.db_manager as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SELECT id, nome FROM Projetos WHERE nome IN (SELECT value FROM json_each(?))",
+                               (json.dumps(nomes),))
+                return {row["nome"]: row["id"] for row in cursor.fetchall()}
+            except sqlite3.Error as e:
+                logger.error(f"Erro ao buscar IDs dos projetos: {e}")
+                return {}
+
+    def insert_projects(self, projects: Iterable[Tuple[str, Optional[str]]],
+                        batch_size: Optional[int] = None) -> Dict[str, int]:
+        """
+        Insere projetos (nome, descricao) em lote com INSERT OR IGNORE, consumindo o iterável aos poucos:
+        cada lote de até batch_size projetos é gravado com executemany em uma única transação.
+        Retorna as contagens {"linhas", "inseridos", "falhas"}; projetos já existentes não são alterados.
+        """
+        batch_size = batch_size or settings.project_import_batch_size
+        counts = {"linhas": 0, "inseridos": 0, "falhas": 0}
+        iterator = iter(projects)
+        with self.db_manager as conn:
+            while True:
+                batch = list(islice(iterator, batch_size))
+                if not batch:
+                    break
+                counts["linhas"] += len(batch)
+                try:
+                    changes_before = conn.total_changes
+                    conn.executemany("INSERT OR IGNORE INTO Projetos (nome, descricao) VALUES (?, ?)", batch)
+                    conn.commit()
+                    counts["inseridos"] += conn.total_changes - changes_before
+                except sqlite3.Error as e:
+                    conn.rollback()
+                    counts["falhas"] += len(batch)
+                    logger.error(f"Erro ao inserir lote de {len(batch)} projetos: {e}")
+        return counts
+
+    def get_all_project_ids(self) -> Dict[str, int]:
+        """Retorna o mapa nome -> ID de todos os projetos, em uma única consulta."""
+        with self.db_manager as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SELECT id, nome FROM Projetos")
+                return {row["nome"]: row["id"] for row in cursor}
+            except sqlite3.Error as e:
+                logger.error(f"Erro ao buscar IDs dos projetos: {e}")
+                return {}
+
 project_repository = ProjectRepository()
\ No newline at end of file
@@ -0,0 +1,109 @@
+import sqlite3
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict, Any
+from src.models.model import DatabaseManager, PROJETO_RESUMO_REBUILD_SQL
+
+logger = logging.getLogger(__name__)
+
+# Colunas de ProjetoResumo aceitas na ordenação de get_top_projects.
+_TOP_PROJECT_ORDERS = ("repositorios", "publicos", "privados", "estrelas", "forks", "ultima_atualizacao")
+
+class ReportRepository:
+    """
+    Consultas de relatório. Os totais por projeto vêm da tabela ProjetoResumo, mantida pelos gatilhos
+    de Repositorios, e as consultas por repositório usam os índices criados pelo SchemaManager.
+    """
+
+    def __init__(self):
+        self.db_manager = DatabaseManager()
+
+    def get_project_summaries(self) -> List[Dict[str, Any]]:
+        """Retorna os totais de todos os projetos (repositórios, públicos/privados, estrelas, forks, última atualização)."""
+        with self.db_manager as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT p.nome AS projeto, r.*
+                    FROM ProjetoResumo r
+                    JOIN Projetos p ON p.id = r.projeto_id
+                    ORDER BY p.nome
+                """)
+                return [dict(row) for row in cursor.fetchall()]
+            except sqlite3.Error as e:
+                logger.error(f"Erro ao buscar o resumo dos projetos: {e}")
+                return []
+
+    def get_top_projects(self, limit: int = 10, order_by: str = "estrelas") -> List[Dict[str, Any]]:
+        """Retorna os 'limit' projetos com os maiores valores da coluna 'order_by' de ProjetoResumo."""
+        if order_by not in _TOP_PROJECT_ORDERS:
+            raise ValueError(f"Ordenação inválida: '{order_by}'. Use uma de {', '.join(_TOP_PROJECT_ORDERS)}.")
+        with self.db_manager as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute(f"""
+                    SELECT p.nome AS projeto, r.*
+                    FROM ProjetoResumo r
+                    JOIN Projetos p ON p.id = r.projeto_id
+                    ORDER BY r.{order_by} DESC
+                    LIMIT ?
+                """, (limit,))
+                return [dict(row) for row in cursor.fetchall()]
+            except sqlite3.Error as e:
+                logger.error(f"Erro ao buscar os principais projetos: {e}")
+                return []
+
+    def get_stale_repositories(self, days: int = 180, limit: int = 100,
+                               projeto_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Retorna os repositórios sem atualização há mais de 'days' dias, dos mais antigos para os mais
+        recentes (opcionalmente de um único projeto). Usa os índices de data_ultima_atualizacao.
+        """
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        project_filter = "AND r.projeto_id = ?" if projeto_id is not None else ""
+        params = (cutoff, projeto_id, limit) if projeto_id is not None else (cutoff, limit)
+        with self.db_manager as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute(f"""
+                    SELECT r.nome, r.url, r.visibilidade, r.data_ultima_atualizacao, r.estrelas, r.forks,
+                           p.nome AS projeto
+                    FROM Repositorios r
+                    LEFT JOIN Projetos p ON p.id = r.projeto_id
+                    WHERE r.data_ultima_atualizacao < ? {project_filter}
+                    ORDER BY r.data_ultima_atualizacao
+                    LIMIT ?
+                """, params)
+                return [dict(row) for row in cursor.fetchall()]
+            except sqlite3.Error as e:
+                logger.error(f"Erro ao buscar repositórios desatualizados: {e}")
+                return []
+
+    def count_stale_repositories(self, days: int = 180) -> int:
+        """Quantidade de repositórios sem atualização há mais de 'days' dias."""
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        with self.db_manager as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SELECT COUNT(*) FROM Repositorios WHERE data_ultima_atualizacao < ?", (cutoff,))
+                return cursor.fetchone()[0]
+            except sqlite3.Error as e:
+                logger.error(f"Erro ao contar repositórios desatualizados: {e}")
+                return 0
+
+    def rebuild_project_summary(self) -> bool:
+        """Recalcula ProjetoResumo inteira a partir de Repositorios (reparo; os gatilhos a mantêm atualizada)."""
+        with self.db_manager as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute("DELETE FROM ProjetoResumo")
+                cursor.execute(PROJETO_RESUMO_REBUILD_SQL)
+                conn.commit()
+                logger.info("Tabela 'ProjetoResumo' recalculada.")
+                return True
+            except sqlite3.Error as e:
+                conn.rollback()
+                logger.error(f"Erro ao recalcular o resumo dos projetos: {e}")
+                return False
+
+report_repository = ReportRepository()
@@ -0,0 +1,49 @@
+
+import sqlite3
+import logging
+from typing import Dict, Any
+from src.models.model import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+class ScheduleRepository:
+    """Gerencia o agendamento do modo daemon (intervalo e próxima coleta de cada organização) na tabela AgendamentoColeta."""
+
+    def __init__(self):
+        self.db_manager = DatabaseManager()
+
+    def get_all(self) -> Dict[str, Dict[str, Any]]:
+        """Retorna o agendamento persistido, indexado pelo nome da organização."""
+        with self.db_manager as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SELECT * FROM AgendamentoColeta")
+                return {row["organizacao"]: dict(row) for row in cursor.fetchall()}
+            except sqlite3.Error as e:
+                logger.error(f"Erro ao carregar o agendamento de coletas: {e}")
+                return {}
+
+    def save(self, entry: Dict[str, Any]) -> bool:
+        """Grava (insere ou atualiza) o agendamento de uma organização."""
+        with self.db_manager as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    INSERT INTO AgendamentoColeta (organizacao, intervalo_s, proxima_execucao, ultima_execucao,
+                                                   ultimas_alteracoes, ultimo_custo)
+                    VALUES (:organizacao, :intervalo_s, :proxima_execucao, :ultima_execucao,
+                            :ultimas_alteracoes, :ultimo_custo)
+                    ON CONFLICT(organizacao) DO UPDATE SET
+                        intervalo_s = excluded.intervalo_s,
+                        proxima_execucao = excluded.proxima_execucao,
+                        ultima_execucao = excluded.ultima_execucao,
+                        ultimas_alteracoes = excluded.ultimas_alteracoes,
+                        ultimo_custo = excluded.ultimo_custo
+                """, entry)
+                conn.commit()
+                return True
+            except sqlite3.Error as e:
+                logger.error(f"Erro ao gravar o agendamento da organização '{entry['organizacao']}': {e}")
+                return False
+
+schedule_repository = ScheduleRepository()
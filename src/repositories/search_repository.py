@@ -0,0 +1,159 @@
+import sqlite3
+import logging
+from typing import Optional, List, Dict, Any
+from src.models.model import DatabaseManager, REPOSITORIOS_BUSCA_REBUILD_SQL, REPOSITORIOS_BUSCA_APPLY_SQL
+
+logger = logging.getLogger(__name__)
+
+# Pesos do bm25 por coluna de RepositoriosBusca (nome, descricao, topicos, projeto): o nome pesa mais.
+_RANK_WEIGHTS = (10.0, 2.0, 4.0, 1.0)
+# Ordenado por 'rank', o FTS5 ordena os resultados internamente e só calcula highlight() dos retornados.
+_RANK_FUNCTION = f"bm25({', '.join(map(str, _RANK_WEIGHTS))})"
+
+# O tokenizador trigram só indexa trechos de 3 ou mais caracteres.
+TRIGRAM_MIN_LENGTH = 3
+
+
+def build_match_expression(text: str, trigram: bool, column: Optional[str] = None) -> Optional[str]:
+    """
+    Monta a expressão MATCH do FTS5 a partir do texto digitado: cada termo vira uma string entre aspas
+    (sem operadores do FTS5), e todos os termos precisam estar presentes.
+    Com trigram, cada termo casa com qualquer trecho do texto e termos curtos demais são ignorados; com
+    unicode61, cada termo casa com palavras iniciadas por ele. Com 'column', restringe a busca à coluna.
+    Retorna None se não sobrar nenhum termo.
+    """
+    terms = []
+    for term in text.split():
+        if trigram and len(term) < TRIGRAM_MIN_LENGTH:
+            logger.debug(f"Termo '{term}' ignorado na busca: menos de {TRIGRAM_MIN_LENGTH} caracteres.")
+            continue
+        quoted = '"' + term.replace('"', '""') + '"'
+        terms.append(quoted if trigram else quoted + "*")
+    if not terms:
+        return None
+    expression = " ".join(terms)
+    return f"{{{column}}} : ({expression})" if column else expression
+
+
+class SearchRepository:
+    """
+    Busca textual nos repositórios pelo índice FTS5 RepositoriosBusca (nome, descrição, tópicos e
+    projeto). Os gatilhos criados pelo SchemaManager anotam os repositórios alterados; as anotações são
+    aplicadas ao índice a cada página sincronizada e, antes de cada busca, as que ainda restarem.
+    """
+
+    def __init__(self):
+        self.db_manager = DatabaseManager()
+
+    def get_tokenizer(self) -> Optional[str]:
+        """Tokenizador do índice de busca ('trigram' ou 'unicode61'), ou None se o índice não existir."""
+        with self.db_manager as conn:
+            row = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'RepositoriosBusca'").fetchone()
+        if row is None:
+            return None
+        return "trigram" if "trigram" in row[0] else "unicode61"
+
+    def apply_pending_changes(self) -> int:
+        """
+        Reindexa os repositórios anotados pelos gatilhos em RepositoriosBuscaPendentes.
+        Retorna quantos repositórios foram reindexados (0 se não houver anotações ou índice).
+        """
+        if self.get_tokenizer() is None:
+            return 0
+        with self.db_manager as conn:
+            try:
+                cursor = conn.cursor()
+                pending = cursor.execute("SELECT count(*) FROM RepositoriosBuscaPendentes").fetchone()[0]
+                if not pending:
+                    return 0
+                for statement in REPOSITORIOS_BUSCA_APPLY_SQL:
+                    cursor.execute(statement)
+                conn.commit()
+                logger.debug(f"Índice de busca: {pending} repositórios reindexados.")
+                return pending
+            except sqlite3.Error as e:
+                conn.rollback()
+                logger.error(f"Erro ao atualizar o índice de busca: {e}")
+                return 0
+
+    def search(self, text: str, limit: int = 20, projeto_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Busca os repositórios cujo nome, descrição, tópicos ou projeto contêm todos os termos do texto,
+        ordenados por relevância (bm25, com o nome pesando mais). 'destaque' traz o nome com os trechos
+        encontrados entre colchetes.
+        """
+        tokenizer = self.get_tokenizer()
+        if tokenizer is None:
+            logger.error("Índice de busca 'RepositoriosBusca' indisponível neste banco de dados.")
+            return []
+        expression = build_match_expression(text, tokenizer == "trigram")
+        if expression is None:
+            return []
+        self.apply_pending_changes()
+        project_filter = "AND r.projeto_id = ?" if projeto_id is not None else ""
+        params = (expression, projeto_id, limit) if projeto_id is not None else (expression, limit)
+        with self.db_manager as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute(f"""
+                    SELECT r.id, r.nome, r.url, r.descricao, p.nome AS projeto,
+                           highlight(RepositoriosBusca, 0, '[', ']') AS destaque, rank AS relevancia
+                    FROM RepositoriosBusca b
+                    JOIN Repositorios r ON r.id = b.rowid
+                    LEFT JOIN Projetos p ON p.id = r.projeto_id
+                    WHERE RepositoriosBusca MATCH ? AND rank MATCH '{_RANK_FUNCTION}' {project_filter}
+                    ORDER BY rank
+                    LIMIT ?
+                """, params)
+                return [dict(row) for row in cursor.fetchall()]
+            except sqlite3.Error as e:
+                logger.error(f"Erro ao buscar repositórios por '{text}': {e}")
+                return []
+
+    def find_by_name_fragment(self, fragment: str) -> List[Dict[str, Any]]:
+        """
+        Repositórios cujo nome contém o trecho, sem diferenciar maiúsculas de minúsculas (a mesma regra
+        das palavras-chave de atribuição). Com o tokenizador trigram, usa o índice de busca; senão (ou
+        com trechos curtos demais), percorre a tabela. Retorna id, nome e projeto_id.
+        """
+        fragment = fragment.lower()
+        use_index = self.get_tokenizer() == "trigram" and len(fragment) >= TRIGRAM_MIN_LENGTH
+        if use_index:
+            self.apply_pending_changes()
+        with self.db_manager as conn:
+            try:
+                cursor = conn.cursor()
+                if use_index:
+                    cursor.execute("""
+                        SELECT r.id, r.nome, r.projeto_id
+                        FROM RepositoriosBusca b
+                        JOIN Repositorios r ON r.id = b.rowid
+                        WHERE RepositoriosBusca MATCH ?
+                    """, (build_match_expression(fragment, True, column="nome"),))
+                else:
+                    cursor.execute("SELECT id, nome, projeto_id FROM Repositorios WHERE instr(lower(nome), ?) > 0",
+                                   (fragment,))
+                # lower() do SQLite só trata ASCII: a confirmação usa a mesma regra do ProjectRuleMatcher.
+                return [dict(row) for row in cursor.fetchall() if fragment in row["nome"].lower()]
+            except sqlite3.Error as e:
+                logger.error(f"Erro ao buscar repositórios com '{fragment}' no nome: {e}")
+                return []
+
+    def rebuild_index(self) -> bool:
+        """Recria o conteúdo de RepositoriosBusca a partir de Repositorios (reparo; normalmente, os gatilhos bastam)."""
+        with self.db_manager as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute("DELETE FROM RepositoriosBusca")
+                cursor.execute(REPOSITORIOS_BUSCA_REBUILD_SQL)
+                cursor.execute("DELETE FROM RepositoriosBuscaPendentes")
+                conn.commit()
+                logger.info("Índice de busca 'RepositoriosBusca' recriado.")
+                return True
+            except sqlite3.Error as e:
+                conn.rollback()
+                logger.error(f"Erro ao recriar o índice de busca: {e}")
+                return False
+
+search_repository = SearchRepository()
@@ -0,0 +1,104 @@
+import sqlite3
+import logging
+import time
+from typing import Optional, List, Dict, Any
+from src.models.model import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+_SECONDS_PER_DAY = 24 * 60 * 60
+
+class SnapshotRepository:
+    """
+    Gerencia o histórico de estrelas/forks na tabela RepositorioSnapshots.
+    Só grava uma nova linha para um repositório quando seus contadores mudam (armazenamento por deltas),
+    e as consultas de tendência são agregações SQL que usam a chave (repositorio_id, coletado_em).
+    """
+
+    def __init__(self):
+        self.db_manager = DatabaseManager()
+
+    def record_snapshots(self, coletado_em: Optional[int] = None) -> int:
+        """
+        Registra os contadores atuais de todos os repositórios cujas estrelas ou forks
+        mudaram desde o último snapshot (ou que ainda não têm snapshot).
+        coletado_em é um timestamp Unix (padrão: agora). Retorna a quantidade de snapshots gravados.
+        """
+        coletado_em = int(time.time()) if coletado_em is None else coletado_em
+        with self.db_manager as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    INSERT OR REPLACE INTO RepositorioSnapshots (repositorio_id, coletado_em, estrelas, forks)
+                    SELECT r.id, ?, r.estrelas, r.forks
+                    FROM Repositorios r
+                    LEFT JOIN RepositorioSnapshots s
+                        ON s.repositorio_id = r.id
+                        AND s.coletado_em = (SELECT MAX(coletado_em) FROM RepositorioSnapshots
+                                             WHERE repositorio_id = r.id)
+                    WHERE s.repositorio_id IS NULL
+                        OR s.estrelas IS NOT r.estrelas
+                        OR s.forks IS NOT r.forks
+                """, (coletado_em,))
+                conn.commit()
+                logger.info(f"{cursor.rowcount} snapshots de estrelas/forks registrados.")
+                return cursor.rowcount
+            except sqlite3.Error as e:
+                logger.error(f"Erro ao registrar snapshots de repositórios: {e}")
+                return 0
+
+    def get_repository_history(self, repositorio_id: int, days: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Retorna os snapshots de um repositório (opcionalmente, apenas os dos últimos 'days' dias)."""
+        since = 0 if days is None else int(time.time()) - days * _SECONDS_PER_DAY
+        with self.db_manager as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT coletado_em, estrelas, forks FROM RepositorioSnapshots
+                    WHERE repositorio_id = ? AND coletado_em >= ?
+                    ORDER BY coletado_em
+                """, (repositorio_id, since))
+                return [dict(row) for row in cursor.fetchall()]
+            except sqlite3.Error as e:
+                logger.error(f"Erro ao buscar histórico do repositório {repositorio_id}: {e}")
+                return []
+
+    def get_growth_by_project(self, days: int, now: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Retorna o crescimento de estrelas e forks por projeto nos últimos 'days' dias,
+        ordenado pelo crescimento de estrelas.
+        A base de cada repositório é o último snapshot anterior ao início do período ou, para repositórios
+        monitorados há menos tempo, o primeiro snapshot registrado.
+        """
+        now = int(time.time()) if now is None else now
+        cutoff = now - days * _SECONDS_PER_DAY
+        with self.db_manager as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT p.id AS projeto_id,
+                           p.nome AS projeto,
+                           COUNT(*) AS repositorios,
+                           SUM(atual.estrelas - base.estrelas) AS crescimento_estrelas,
+                           SUM(atual.forks - base.forks) AS crescimento_forks
+                    FROM Repositorios r
+                    JOIN Projetos p ON p.id = r.projeto_id
+                    JOIN RepositorioSnapshots atual
+                        ON atual.repositorio_id = r.id
+                        AND atual.coletado_em = (SELECT MAX(coletado_em) FROM RepositorioSnapshots
+                                                 WHERE repositorio_id = r.id AND coletado_em <= :agora)
+                    JOIN RepositorioSnapshots base
+                        ON base.repositorio_id = r.id
+                        AND base.coletado_em = COALESCE(
+                            (SELECT MAX(coletado_em) FROM RepositorioSnapshots
+                             WHERE repositorio_id = r.id AND coletado_em <= :inicio),
+                            (SELECT MIN(coletado_em) FROM RepositorioSnapshots WHERE repositorio_id = r.id))
+                    GROUP BY p.id, p.nome
+                    ORDER BY crescimento_estrelas DESC
+                """, {"agora": now, "inicio": cutoff})
+                return [dict(row) for row in cursor.fetchall()]
+            except sqlite3.Error as e:
+                logger.error(f"Erro ao calcular crescimento por projeto: {e}")
+                return []
+
+snapshot_repository = SnapshotRepository()
@@ -0,0 +1,56 @@
+
+import sqlite3
+import logging
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any
+from src.models.model import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+class SyncStateRepository:
+    """Gerencia o estado de sincronização (marca d'água) de cada organização na tabela EstadoSincronizacao."""
+
+    def __init__(self):
+        self.db_manager = DatabaseManager()
+
+    def get_state(self, organizacao: str) -> Optional[Dict[str, Any]]:
+        """Retorna o estado da última sincronização bem-sucedida da organização, se houver."""
+        with self.db_manager as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SELECT * FROM EstadoSincronizacao WHERE organizacao = ?", (organizacao,))
+                result = cursor.fetchone()
+                return dict(result) if result else None
+            except sqlite3.Error as e:
+                logger.error(f"Erro ao buscar estado de sincronização da organização '{organizacao}': {e}")
+                return None
+
+    def save_state(self, organizacao: str, marca_atualizacao: Optional[str], full_reconcile: bool) -> bool:
+        """
+        Registra uma sincronização bem-sucedida da organização.
+        A marca d'água só avança (nunca é substituída por uma data mais antiga ou nula), e a data da
+        última reconciliação completa só é atualizada quando full_reconcile é verdadeiro.
+        """
+        agora = datetime.now(timezone.utc).isoformat()
+        with self.db_manager as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    INSERT INTO EstadoSincronizacao (organizacao, marca_atualizacao, ultima_sincronizacao, ultima_reconciliacao)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(organizacao) DO UPDATE SET
+                        marca_atualizacao = CASE
+                            WHEN EstadoSincronizacao.marca_atualizacao IS NULL
+                                OR excluded.marca_atualizacao > EstadoSincronizacao.marca_atualizacao
+                            THEN excluded.marca_atualizacao
+                            ELSE EstadoSincronizacao.marca_atualizacao END,
+                        ultima_sincronizacao = excluded.ultima_sincronizacao,
+                        ultima_reconciliacao = COALESCE(excluded.ultima_reconciliacao, EstadoSincronizacao.ultima_reconciliacao)
+                """, (organizacao, marca_atualizacao, agora, agora if full_reconcile else None))
+                conn.commit()
+                return True
+            except sqlite3.Error as e:
+                logger.error(f"Erro ao gravar estado de sincronização da organização '{organizacao}': {e}")
+                return False
+
+sync_state_repository = SyncStateRepository()
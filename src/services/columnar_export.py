@@ -0,0 +1,336 @@
+import os
+import json
+import time
+import shutil
+import sqlite3
+import logging
+import tempfile
+import zipfile
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from src.config.config import settings
+from src.repositories.export_repository import export_repository
+from src.repositories.project_repository import project_repository
+from src.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# numpy (exportação .npz e agregações) e pyarrow (Parquet) são dependências opcionais,
+# importadas sob demanda: veja requirements-analytics.txt.
+
+# Valor usado nas colunas inteiras anuláveis para NULL (no Parquet, vira nulo de verdade).
+NULL_INT = -1
+# Limites (em dias) dos histogramas de idade e de inatividade dos repositórios.
+AGE_BINS_DAYS = (0, 30, 90, 180, 365, 730, 1095, 1825, float("inf"))
+
+
+def _epoch_seconds(column: str) -> str:
+    """Converte no SQLite uma data ISO 8601 em segundos Unix (NULL vira o NaT do numpy)."""
+    # unixepoch() (SQLite 3.38+) evita a formatação em texto e a conversão de volta de strftime('%s').
+    epoch = (f"unixepoch({column})" if sqlite3.sqlite_version_info >= (3, 38, 0)
+             else f"CAST(strftime('%s', {column}) AS INTEGER)")
+    return f"COALESCE({epoch}, -9223372036854775808)"
+
+
+# Colunas exportadas: (nome, expressão SQL, tipo). Tipos:
+#   int64/int8  inteiros; os anuláveis usam NULL_INT ('int64?' / 'int8?')
+#   timestamp   datetime64[s] UTC (NaT para NULL)
+#   dictionary  texto de baixa cardinalidade codificado como índices int32 em um dicionário ('' = NULL)
+#   string      texto livre
+TABLE_COLUMNS: Dict[str, List[Tuple[str, str, str]]] = {
+    "Repositorios": [
+        ("id", "id", "int64"),
+        ("github_id", "github_id", "int64"),
+        ("nome", "nome", "string"),
+        ("visibilidade", "visibilidade", "dictionary"),
+        ("data_criacao", _epoch_seconds("data_criacao"), "timestamp"),
+        ("data_ultima_atualizacao", _epoch_seconds("data_ultima_atualizacao"), "timestamp"),
+        ("estrelas", f"COALESCE(estrelas, {NULL_INT})", "int64?"),
+        ("forks", f"COALESCE(forks, {NULL_INT})", "int64?"),
+        ("url", "url", "string"),
+        ("descricao", "COALESCE(descricao, '')", "string"),
+        ("projeto_id", f"COALESCE(projeto_id, {NULL_INT})", "int64?"),
+        ("linguagem", "COALESCE(linguagem, '')", "dictionary"),
+        ("topicos", "COALESCE(topicos, '')", "string"),
+        ("issues_abertas", f"COALESCE(issues_abertas, {NULL_INT})", "int64?"),
+        ("pull_requests_abertos", f"COALESCE(pull_requests_abertos, {NULL_INT})", "int64?"),
+        ("data_ultimo_commit", _epoch_seconds("data_ultimo_commit"), "timestamp"),
+        ("arquivado", f"COALESCE(arquivado, {NULL_INT})", "int8?"),
+    ],
+    "Projetos": [
+        ("id", "id", "int64"),
+        ("nome", "nome", "string"),
+        ("descricao", "COALESCE(descricao, '')", "string"),
+    ],
+}
+
+
+def _require_numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("A exportação colunar requer o numpy: pip install -r requirements-analytics.txt") from e
+    return numpy
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class DictionaryEncoder:
+    """
+    Codifica uma coluna de texto em índices int32 de um dicionário mantido entre os blocos.
+    Cada bloco é codificado com np.unique; só os valores distintos do bloco passam por Python.
+    O texto vazio representa NULL e recebe o índice -1.
+    """
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def encode(self, column: "numpy.ndarray") -> "numpy.ndarray":
+        np = _require_numpy()
+        uniques, inverse = np.unique(column, return_inverse=True)
+        mapping = np.empty(len(uniques), dtype=np.int32)
+        for position, value in enumerate(uniques.tolist()):
+            if value == "":
+                mapping[position] = NULL_INT
+                continue
+            code = self._codes.get(value)
+            if code is None:
+                code = self._codes[value] = len(self.values)
+                self.values.append(value)
+            mapping[position] = code
+        return mapping[inverse.reshape(-1)]
+
+
+def iter_column_chunks(table: str, chunk_size: Optional[int] = None,
+                       encoders: Optional[Dict[str, DictionaryEncoder]] = None,
+                       columns: Optional[List[str]] = None) -> Iterator[Dict[str, "numpy.ndarray"]]:
+    """
+    Lê a tabela em blocos de chunk_size linhas e converte cada bloco em arrays numpy tipados
+    (um por coluna de TABLE_COLUMNS, ou apenas as informadas em 'columns').
+    As colunas 'dictionary' são codificadas com os DictionaryEncoder de 'encoders' (criados se faltarem).
+    """
+    np = _require_numpy()
+    chunk_size = chunk_size or settings.export_chunk_size
+    spec = [column for column in TABLE_COLUMNS[table] if columns is None or column[0] in columns]
+    encoders = encoders if encoders is not None else {}
+    for rows in export_repository.iter_chunks(table, [expression for _, expression, _ in spec], chunk_size):
+        values = list(zip(*rows))
+        chunk = {}
+        for (name, _, kind), column in zip(spec, values):
+            if kind == "timestamp":
+                chunk[name] = np.array(column, dtype=np.int64).view("datetime64[s]")
+            elif kind.startswith("int"):
+                chunk[name] = np.array(column, dtype=kind.rstrip("?"))
+            elif kind == "dictionary":
+                chunk[name] = encoders.setdefault(name, DictionaryEncoder()).encode(np.array(column, dtype=str))
+            else:
+                chunk[name] = np.array(column, dtype=object)
+        yield chunk
+
+
+class _NpzWriter:
+    """
+    Grava um arquivo .npz sem manter a tabela inteira em memória: cada array é acumulado em um arquivo
+    temporário bloco a bloco e, ao final, copiado para o zip como um .npy com o cabeçalho do tamanho total.
+    Colunas de texto livre viram '<coluna>.offsets' (int64) e '<coluna>.data' (bytes UTF-8).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._spool_dir = tempfile.mkdtemp(prefix="repo_monitor_npz_")
+        self._arrays: Dict[str, Dict[str, Any]] = {}
+        self._string_offsets: Dict[str, int] = {}
+
+    def _append(self, key: str, array: "numpy.ndarray"):
+        entry = self._arrays.get(key)
+        if entry is None:
+            entry = self._arrays[key] = {"dtype": array.dtype, "length": 0,
+                                         "file": open(os.path.join(self._spool_dir, f"{len(self._arrays)}.bin"), "wb")}
+        entry["file"].write(array.tobytes())
+        entry["length"] += len(array)
+
+    def write_chunk(self, chunk: Dict[str, "numpy.ndarray"]):
+        np = _require_numpy()
+        for name, column in chunk.items():
+            if column.dtype != object:
+                self._append(name, column)
+                continue
+            encoded = [value.encode("utf-8") for value in column]
+            lengths = np.fromiter((len(value) for value in encoded), dtype=np.int64, count=len(encoded))
+            base = self._string_offsets.get(name)
+            if base is None:
+                self._append(f"{name}.offsets", np.zeros(1, dtype=np.int64))
+                base = 0
+            offsets = base + np.cumsum(lengths)
+            self._string_offsets[name] = int(offsets[-1]) if len(offsets) else base
+            self._append(f"{name}.offsets", offsets)
+            self._append(f"{name}.data", np.frombuffer(b"".join(encoded), dtype=np.uint8))
+
+    def close(self, extra_arrays: Dict[str, "numpy.ndarray"]):
+        np = _require_numpy()
+        try:
+            # Sem compressão, como np.savez: os arrays podem ser lidos direto do arquivo (np.load com mmap).
+            with zipfile.ZipFile(self.path, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+                for key, entry in self._arrays.items():
+                    entry["file"].close()
+                    with archive.open(f"{key}.npy", "w", force_zip64=True) as npy, \
+                            open(entry["file"].name, "rb") as spool:
+                        np.lib.format.write_array_header_2_0(npy, {
+                            "descr": np.lib.format.dtype_to_descr(entry["dtype"]),
+                            "fortran_order": False,
+                            "shape": (entry["length"],),
+                        })
+                        shutil.copyfileobj(spool, npy, 1024 * 1024)
+                for key, array in extra_arrays.items():
+                    with archive.open(f"{key}.npy", "w", force_zip64=True) as npy:
+                        np.lib.format.write_array(npy, array, allow_pickle=False)
+        finally:
+            for entry in self._arrays.values():
+                entry["file"].close()
+            shutil.rmtree(self._spool_dir, ignore_errors=True)
+
+
+def _arrow_schema(table: str):
+    import pyarrow as pa
+
+    fields = []
+    for name, _, kind in TABLE_COLUMNS[table]:
+        if kind == "timestamp":
+            field_type = pa.timestamp("s", tz="UTC")
+        elif kind.startswith("int"):
+            field_type = pa.int8() if kind.startswith("int8") else pa.int64()
+        elif kind == "dictionary":
+            field_type = pa.dictionary(pa.int32(), pa.string())
+        else:
+            field_type = pa.string()
+        fields.append(pa.field(name, field_type))
+    return pa.schema(fields)
+
+
+def _arrow_batch(table: str, chunk: Dict[str, "numpy.ndarray"], encoders: Dict[str, DictionaryEncoder], schema):
+    import numpy as np
+    import pyarrow as pa
+
+    arrays = []
+    for (name, _, kind), field in zip(TABLE_COLUMNS[table], schema):
+        column = chunk[name]
+        if kind == "timestamp":
+            arrays.append(pa.array(column.view(np.int64), type=field.type, mask=np.isnat(column)))
+        elif kind.endswith("?"):
+            arrays.append(pa.array(column, type=field.type, mask=column == NULL_INT))
+        elif kind == "dictionary":
+            indices = pa.array(column, type=pa.int32(), mask=column == NULL_INT)
+            arrays.append(pa.DictionaryArray.from_arrays(indices, pa.array(encoders[name].values, type=pa.string())))
+        else:
+            arrays.append(pa.array(column, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def export_table(table: str, output_dir: str, file_format: str, chunk_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Exporta a tabela para '<output_dir>/<tabela>.parquet' ou '.npz', bloco a bloco.
+    No Parquet, cada bloco vira um row group, com os textos de baixa cardinalidade como colunas de dicionário.
+    No .npz, as colunas 'dictionary' são gravadas como índices e '<coluna>.dictionary' com os valores.
+    Retorna {"arquivo", "linhas", "tempo_s"}.
+    """
+    started_at = time.perf_counter()
+    path = os.path.join(output_dir, f"{table.lower()}.{file_format}")
+    encoders: Dict[str, DictionaryEncoder] = {}
+    rows = 0
+    if file_format == "parquet":
+        import pyarrow.parquet as pq
+
+        schema = _arrow_schema(table)
+        with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+            for chunk in iter_column_chunks(table, chunk_size, encoders):
+                batch = _arrow_batch(table, chunk, encoders, schema)
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    elif file_format == "npz":
+        np = _require_numpy()
+        writer = _NpzWriter(path)
+        for chunk in iter_column_chunks(table, chunk_size, encoders):
+            writer.write_chunk(chunk)
+            rows += len(chunk["id"])
+        writer.close({f"{name}.dictionary": np.array(encoder.values, dtype=str) for name, encoder in encoders.items()})
+    else:
+        raise ValueError(f"Formato de exportação não suportado: '{file_format}'. Use 'parquet' ou 'npz'.")
+
+    elapsed = time.perf_counter() - started_at
+    metrics.add_stage_time("columnar_export", elapsed)
+    metrics.inc("rows_exported", rows)
+    logger.info(f"Tabela '{table}' exportada para '{path}': {rows} linhas em {elapsed:.2f} s.")
+    return {"arquivo": path, "linhas": rows, "tempo_s": elapsed}
+
+
+def aggregate_repositories(chunk_size: Optional[int] = None, now: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Agregações vetorizadas (numpy) sobre Repositorios, lidas em blocos (memória limitada ao bloco):
+    repositórios, estrelas e forks por projeto (np.bincount) e histogramas da idade e do tempo sem
+    atualização em dias (np.histogram, limites em AGE_BINS_DAYS).
+    """
+    np = _require_numpy()
+    now = time.time() if now is None else now
+    project_slots = (export_repository.max_id("Projetos") or 0) + 1
+    repos_per_project = np.zeros(project_slots, dtype=np.int64)
+    stars_per_project = np.zeros(project_slots, dtype=np.int64)
+    forks_per_project = np.zeros(project_slots, dtype=np.int64)
+    age_counts = np.zeros(len(AGE_BINS_DAYS) - 1, dtype=np.int64)
+    inactivity_counts = np.zeros(len(AGE_BINS_DAYS) - 1, dtype=np.int64)
+    bins = np.array(AGE_BINS_DAYS)
+    now_seconds = np.int64(now)
+
+    for chunk in iter_column_chunks("Repositorios", chunk_size, columns=[
+            "projeto_id", "estrelas", "forks", "data_criacao", "data_ultima_atualizacao"]):
+        assigned = (chunk["projeto_id"] >= 0) & (chunk["projeto_id"] < project_slots)
+        project_ids = chunk["projeto_id"][assigned]
+        repos_per_project += np.bincount(project_ids, minlength=project_slots)
+        stars_per_project += np.bincount(project_ids, weights=np.maximum(chunk["estrelas"][assigned], 0),
+                                         minlength=project_slots).astype(np.int64)
+        forks_per_project += np.bincount(project_ids, weights=np.maximum(chunk["forks"][assigned], 0),
+                                         minlength=project_slots).astype(np.int64)
+        for column, counts in (("data_criacao", age_counts), ("data_ultima_atualizacao", inactivity_counts)):
+            dates = chunk[column]
+            days = (now_seconds - dates[~np.isnat(dates)].view(np.int64)) / 86400
+            counts += np.histogram(days, bins=bins)[0]
+
+    project_names = {project_id: name for name, project_id in project_repository.get_all_project_ids().items()}
+    projects = [{"projeto_id": int(project_id), "projeto": project_names.get(int(project_id)),
+                 "repositorios": int(repos_per_project[project_id]), "estrelas": int(stars_per_project[project_id]),
+                 "forks": int(forks_per_project[project_id])}
+                for project_id in np.flatnonzero(repos_per_project)]
+    limits = [limit if limit != float("inf") else None for limit in AGE_BINS_DAYS]
+    return {
+        "projetos": sorted(projects, key=lambda project: project["estrelas"], reverse=True),
+        "idade_dias": {"limites": limits, "contagens": age_counts.tolist()},
+        "inatividade_dias": {"limites": limits, "contagens": inactivity_counts.tolist()},
+    }
+
+
+def export_analytics(output_dir: str, file_format: Optional[str] = None,
+                     chunk_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Exporta Repositorios e Projetos no formato colunar ('parquet' com pyarrow ou 'npz'; padrão:
+    parquet se o pyarrow estiver instalado) e grava as agregações em '<output_dir>/agregacoes.json'.
+    """
+    _require_numpy()
+    file_format = file_format or ("parquet" if _has_pyarrow() else "npz")
+    if file_format == "parquet" and not _has_pyarrow():
+        raise ImportError("A exportação em Parquet requer o pyarrow: pip install -r requirements-analytics.txt")
+    os.makedirs(output_dir, exist_ok=True)
+    result = {"tabelas": [export_table(table, output_dir, file_format, chunk_size) for table in TABLE_COLUMNS]}
+    with metrics.stage("vectorized_aggregations"):
+        aggregations = aggregate_repositories(chunk_size)
+    aggregations_path = os.path.join(output_dir, "agregacoes.json")
+    with open(aggregations_path, "w", encoding="utf-8") as file:
+        json.dump(aggregations, file, indent=2, ensure_ascii=False)
+    logger.info(f"Agregações gravadas em '{aggregations_path}'.")
+    result["agregacoes"] = aggregations
+    return result
@@ -1,71 +1,501 @@
 
+import re
+import sqlite3
+import zlib
 import requests
-from src.config.config import GITHUB_TOKEN
+from requests.adapters import HTTPAdapter
+from src.config.config import settings
+from src.models.model import RepoRecord
+from src.services.metrics import metrics
+import json
 import time
 import logging
-from typing import List, Dict, Any
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterator, List, Dict, Any, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
-BASE_URL = "https://api.github.com"
 HEADERS = {
-    "Authorization": f"token {GITHUB_TOKEN}",
     "Accept": "application/vnd.github.v3+json"
 }
+PER_PAGE = 100
 
-def get_org_repos(org_name: str) -> List[Dict[str, Any]]:
+_LAST_PAGE_PATTERN = re.compile(r'<([^>]*)>;\s*rel="last"')
+_PAGE_PARAM_PATTERN = re.compile(r'[?&]page=(\d+)')
+
+_session: Optional[requests.Session] = None
+_session_pool_size = 0
+_session_lock = threading.Lock()
+
+
+class ResponseCache:
+    """
+    Cache em disco (SQLite) de respostas da API do GitHub, indexado pela URL.
+    Guarda o ETag/Last-Modified e o corpo da resposta para permitir requisições condicionais:
+    respostas 304 não consomem o rate limit e são servidas a partir do cache.
+    Quando o tamanho total ultrapassa max_bytes, as entradas acessadas há mais tempo são removidas.
+    Sem db_path/max_bytes, usa settings.http_cache_path e settings.http_cache_max_bytes (lidos no primeiro uso).
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_bytes: Optional[int] = None):
+        self._db_path = db_path
+        self._max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def db_path(self) -> str:
+        return self._db_path or settings.http_cache_path
+
+    @db_path.setter
+    def db_path(self, value: str):
+        self._db_path = value
+
+    @property
+    def max_bytes(self) -> int:
+        return settings.http_cache_max_bytes if self._max_bytes is None else self._max_bytes
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS RespostasHttp (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    link TEXT,
+                    corpo BLOB NOT NULL,
+                    tamanho INTEGER NOT NULL,
+                    ultimo_acesso REAL NOT NULL
+                )
+            """)
+            self._conn.commit()
+        return self._conn
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Retorna os cabeçalhos If-None-Match/If-Modified-Since para a URL, se houver entrada em cache."""
+        with self._lock:
+            try:
+                row = self._connection().execute(
+                    "SELECT etag, last_modified FROM RespostasHttp WHERE url = ?", (url,)).fetchone()
+            except sqlite3.Error as e:
+                logger.error(f"Erro ao consultar o cache HTTP: {e}")
+                return {}
+        if not row:
+            return {}
+        headers = {}
+        if row[0]:
+            headers["If-None-Match"] = row[0]
+        if row[1]:
+            headers["If-Modified-Since"] = row[1]
+        return headers
+
+    def get(self, url: str) -> Optional[Tuple[bytes, Optional[str]]]:
+        """Retorna o corpo e o cabeçalho 'Link' guardados para a URL, registrando um acerto de cache."""
+        with self._lock:
+            try:
+                conn = self._connection()
+                row = conn.execute("SELECT corpo, link FROM RespostasHttp WHERE url = ?", (url,)).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE RespostasHttp SET ultimo_acesso = ? WHERE url = ?", (time.time(), url))
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Erro ao ler o cache HTTP: {e}")
+                return None
+            self.hits += 1
+        return zlib.decompress(row[0]), row[1]
+
+    def store(self, url: str, response: requests.Response):
+        """Guarda uma resposta 200 com validadores (ETag/Last-Modified) e aplica o limite de tamanho."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        with self._lock:
+            self.misses += 1
+            if not etag and not last_modified:
+                return
+            body = zlib.compress(response.content)
+            try:
+                conn = self._connection()
+                conn.execute("""
+                    INSERT OR REPLACE INTO RespostasHttp (url, etag, last_modified, link, corpo, tamanho, ultimo_acesso)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (url, etag, last_modified, response.headers.get("Link"), body, len(body), time.time()))
+                self._evict(conn)
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Erro ao gravar no cache HTTP: {e}")
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Remove as entradas menos recentemente usadas até o cache caber em max_bytes."""
+        total = conn.execute("SELECT COALESCE(SUM(tamanho), 0) FROM RespostasHttp").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        evicted = []
+        for url, size in conn.execute("SELECT url, tamanho FROM RespostasHttp ORDER BY ultimo_acesso"):
+            evicted.append((url,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM RespostasHttp WHERE url = ?", evicted)
+        logger.debug(f"Cache HTTP: {len(evicted)} entradas removidas ({freed} bytes).")
+
+    def log_stats(self):
+        """Registra no log a contagem de acertos e falhas do cache."""
+        total = self.hits + self.misses
+        hit_rate = (self.hits / total * 100) if total else 0.0
+        logger.info(f"Cache HTTP: {self.hits} acertos (304), {self.misses} falhas ({hit_rate:.1f}% de acertos).")
+
+
+response_cache = ResponseCache()
+
+
+class _RateLimitGate:
+    """
+    Coordena a espera pelo reset do rate limit entre as threads de busca.
+    Quando uma resposta indica que o limite foi atingido, todas as requisições seguintes aguardam o reset.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+
+    def wait(self):
+        """Bloqueia até que o limite de requisições tenha sido restabelecido."""
+        with self._lock:
+            sleep_duration = self._resume_at - time.time()
+        if sleep_duration > 0:
+            time.sleep(sleep_duration)
+
+    def update(self, response: requests.Response):
+        """Lê os cabeçalhos de rate limit da resposta e agenda a espera se necessário."""
+        remaining_calls = int(response.headers.get('X-RateLimit-Remaining', 0))
+        reset_time = int(response.headers.get('X-RateLimit-Reset', 0))
+        if remaining_calls == 0:
+            sleep_duration = max(0, reset_time - time.time()) + 1
+            logger.warning(f"Limite de requisições atingido. Aguardando {sleep_duration:.0f} segundos.")
+            with self._lock:
+                self._resume_at = max(self._resume_at, time.time() + sleep_duration)
+            self.wait()
+
+
+def get_session(pool_size: int = 10) -> requests.Session:
+    """Retorna uma sessão HTTP compartilhada (keep-alive) para a API do GitHub."""
+    global _session, _session_pool_size
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.headers.update(HEADERS)
+            _session.headers["Authorization"] = f"token {settings.github_token}"
+        if pool_size > _session_pool_size:
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+            _session_pool_size = pool_size
+        return _session
+
+
+def parse_last_page(link_header: Optional[str]) -> Optional[int]:
+    """Extrai o número da última página do cabeçalho 'Link' (rel="last")."""
+    if not link_header:
+        return None
+    last_match = _LAST_PAGE_PATTERN.search(link_header)
+    if not last_match:
+        return None
+    page_match = _PAGE_PARAM_PATTERN.search(last_match.group(1))
+    return int(page_match.group(1)) if page_match else None
+
+
+def fetch_repos_page(session: requests.Session, org_name: str, page: int,
+                     query: str = "") -> Tuple[List[Dict[str, Any]], Optional[str], requests.Response]:
+    """
+    Busca uma única página de repositórios, registrando a latência da requisição.
+    Envia uma requisição condicional quando a página está em cache e, em caso de 304, usa o corpo guardado.
+    Retorna os repositórios da página, o cabeçalho 'Link' correspondente e a resposta HTTP.
+    Não trata o rate limit: cabe ao chamador aguardar o reset a partir dos cabeçalhos da resposta.
+    """
+    url = f"{settings.github_api_url}/orgs/{org_name}/repos?per_page={PER_PAGE}&page={page}{query}"
+    logger.info(f"Buscando repositórios: {url}")
+    started_at = time.perf_counter()
+    response = session.get(url, headers=response_cache.conditional_headers(url), timeout=30)
+    elapsed = time.perf_counter() - started_at
+    elapsed_ms = elapsed * 1000
+    metrics.add_stage_time("api_fetch", elapsed)
+    metrics.observe("http_request_duration_seconds", elapsed)
+    metrics.inc("http_requests")
+    response.raise_for_status()
+
+    cached = response_cache.get(url) if response.status_code == 304 else None
+    if cached is not None:
+        metrics.inc("http_not_modified")
+        body, link_header = cached
+        with metrics.stage("json_decode"):
+            data = json.loads(body)
+        logger.info(f"Página {page} não modificada (304), servida do cache em {elapsed_ms:.0f} ms.")
+    else:
+        if response.status_code == 304:
+            # Entrada removida do cache entre o envio e a resposta: busca a página sem condicional.
+            with metrics.stage("api_fetch"):
+                response = session.get(url, timeout=30)
+            metrics.inc("http_requests")
+            response.raise_for_status()
+        with metrics.stage("json_decode"):
+            data = response.json()
+        link_header = response.headers.get("Link")
+        response_cache.store(url, response)
+        logger.info(f"Página {page} obtida em {elapsed_ms:.0f} ms ({len(data)} repositórios).")
+    return data, link_header, response
+
+
+def _fetch_repos_page(session: requests.Session, org_name: str, page: int, gate: _RateLimitGate,
+                      query: str = "") -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Busca uma página de repositórios respeitando o rate limit compartilhado pelas threads."""
+    gate.wait()
+    data, link_header, response = fetch_repos_page(session, org_name, page, query)
+    gate.update(response)
+    return data, link_header
+
+
+def log_request_error(error: Exception, org_name: str):
+    """Registra um erro de requisição ao GitHub com uma mensagem adequada ao status HTTP."""
+    if isinstance(error, requests.exceptions.Timeout):
+        logger.error("Requisição ao GitHub excedeu o tempo limite.")
+        return
+    status_code = error.response.status_code if getattr(error, "response", None) is not None else None
+    if status_code == 401:
+        logger.error("Erro de autenticação: Verifique seu GITHUB_TOKEN.")
+    elif status_code == 404:
+        logger.error(f"Organização '{org_name}' não encontrada ou sem acesso. Verifique o nome da organização e as permissões do token.")
+    else:
+        logger.error(f"Erro ao buscar repositórios do GitHub: {error}")
+
+
+def get_org_repos(org_name: str, max_workers: int = 1) -> List[Dict[str, Any]]:
     """
     Lista todos os repositórios da organização especificada.
     Lida com paginação e rate limiting.
+    Com max_workers > 1, após a primeira página as demais são buscadas em paralelo,
+    usando o número da última página informado no cabeçalho 'Link'.
+    Mantém todos os objetos JSON em memória; para gravar à medida que as páginas chegam, use stream_org_repos.
+    """
+    repos, _ = fetch_org_repos(org_name, max_workers)
+    return repos
+
+
+def fetch_org_repos(org_name: str, max_workers: int = 1) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Igual a get_org_repos, mas também indica se a listagem foi completa (sem erros de requisição).
+    Uma listagem parcial não deve ser usada para detectar repositórios removidos.
+    """
+    started_at = time.perf_counter()
+    repos = []
+    complete = True
+    for data in _iter_org_repo_pages(org_name, max_workers):
+        if data is None:
+            complete = False
+            break
+        repos.extend(data)
+    logger.info(f"{len(repos)} repositórios obtidos em {time.perf_counter() - started_at:.2f} s.")
+    return repos, complete
+
+
+def get_org_repos_updated_since(org_name: str, since: str) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Lista os repositórios da organização atualizados a partir de 'since' (data ISO 8601 do GitHub).
+    Pede os repositórios ordenados por atualização (mais recentes primeiro) e para de paginar
+    ao encontrar o primeiro repositório mais antigo que a marca d'água.
+    Retorna os repositórios alterados e se a busca terminou sem erros.
+    """
+    repos = []
+    for data in _iter_repo_pages_updated_since(org_name, since):
+        if data is None:
+            return repos, False
+        repos.extend(data)
+    return repos, True
+
+
+def stream_org_repos(org_name: str, max_workers: int = 1) -> "RepoPageStream":
+    """
+    Versão em fluxo de fetch_org_repos: as páginas chegam como listas de RepoRecord, uma de cada vez,
+    e podem ser gravadas antes que a listagem termine. Ver RepoPageStream.
+    """
+    return RepoPageStream(_iter_org_repo_pages(org_name, max_workers))
+
+
+def stream_org_repos_updated_since(org_name: str, since: str) -> "RepoPageStream":
+    """Versão em fluxo de get_org_repos_updated_since (páginas de RepoRecord, ver RepoPageStream)."""
+    return RepoPageStream(_iter_repo_pages_updated_since(org_name, since))
+
+
+class RepoPageStream:
+    """
+    Páginas de uma listagem de repositórios, convertidas em RepoRecord à medida que chegam.
+    O JSON bruto de cada página é descartado logo após a conversão, de modo que a memória usada
+    não depende do tamanho da organização.
+    Após a iteração, 'complete' indica se a listagem terminou sem erros de requisição (uma listagem
+    parcial não deve ser usada para detectar repositórios removidos).
+    """
+
+    def __init__(self, raw_pages: Iterator[Optional[List[Dict[str, Any]]]]):
+        self._raw_pages = raw_pages
+        self.complete = True
+        self.pages = 0
+        self.repositories = 0
+
+    def __iter__(self) -> Iterator[List[RepoRecord]]:
+        started_at = time.perf_counter()
+        try:
+            for data in self._raw_pages:
+                if data is None:
+                    self.complete = False
+                    return
+                records = extract_repo_records(data)
+                del data
+                self.pages += 1
+                self.repositories += len(records)
+                yield records
+        finally:
+            logger.info(f"{self.repositories} repositórios obtidos em {time.perf_counter() - started_at:.2f} s "
+                        f"({self.pages} páginas).")
+
+
+def _iter_org_repo_pages(org_name: str, max_workers: int = 1) -> Iterator[Optional[List[Dict[str, Any]]]]:
+    """
+    Gera as páginas de repositórios da organização à medida que são obtidas.
+    Um None indica um erro de requisição: a listagem termina ali, incompleta.
+    Com max_workers > 1, a primeira página informa a última (cabeçalho 'Link') e as demais são
+    buscadas em paralelo por _iter_pages_concurrently.
     """
     if not org_name:
         logger.error("Nome da organização não fornecido para a API do GitHub.")
-        return []
+        yield None
+        return
 
-    repos = []
+    session = get_session(max_workers)
+    gate = _RateLimitGate()
     page = 1
-    per_page = 100
     while True:
-        url = f"{BASE_URL}/orgs/{org_name}/repos?per_page={per_page}&page={page}"
-        logger.info(f"Buscando repositórios: {url}")
         try:
-            response = requests.get(url, headers=HEADERS, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            if not data:
-                break
-            repos.extend(data)
-
-            remaining_calls = int(response.headers.get('X-RateLimit-Remaining', 0))
-            reset_time = int(response.headers.get('X-RateLimit-Reset', 0))
-            if remaining_calls == 0:
-                sleep_duration = max(0, reset_time - time.time()) + 1
-                logger.warning(f"Limite de requisições atingido. Aguardando {sleep_duration:.0f} segundos.")
-                time.sleep(sleep_duration)
-
-            page += 1
-        except requests.exceptions.Timeout:
-            logger.error("Requisição ao GitHub excedeu o tempo limite.")
-            break
+            data, link_header = _fetch_repos_page(session, org_name, page, gate)
         except requests.exceptions.RequestException as e:
-            if response.status_code == 401:
-                logger.error("Erro de autenticação: Verifique seu GITHUB_TOKEN.")
-            elif response.status_code == 404:
-                logger.error(f"Organização '{org_name}' não encontrada ou sem acesso. Verifique o nome da organização e as permissões do token.")
-            else:
-                logger.error(f"Erro ao buscar repositórios do GitHub: {e}")
-            break
-    return repos
+            log_request_error(e, org_name)
+            yield None
+            return
+        if not data:
+            return
+        yield data
+        page += 1
+
+        if max_workers > 1 and page == 2:
+            last_page = parse_last_page(link_header)
+            if last_page is not None:
+                # Sem rel="last", a primeira página já é a única.
+                yield from _iter_pages_concurrently(session, org_name, range(2, last_page + 1), max_workers, gate)
+            return
+
+
+def _iter_repo_pages_updated_since(org_name: str, since: str) -> Iterator[Optional[List[Dict[str, Any]]]]:
+    """
+    Gera as páginas de repositórios atualizados a partir de 'since', dos mais recentes para os mais
+    antigos, cortando a última página no primeiro repositório mais antigo que a marca d'água.
+    Um None indica um erro de requisição.
+    """
+    if not org_name:
+        logger.error("Nome da organização não fornecido para a API do GitHub.")
+        yield None
+        return
+
+    session = get_session()
+    gate = _RateLimitGate()
+    page = 1
+    while True:
+        try:
+            data, _ = _fetch_repos_page(session, org_name, page, gate, query="&sort=updated&direction=desc")
+        except requests.exceptions.RequestException as e:
+            log_request_error(e, org_name)
+            yield None
+            return
+        for index, repo_json in enumerate(data):
+            if repo_json["updated_at"] < since:
+                if index:
+                    yield data[:index]
+                return
+        if data:
+            yield data
+        if len(data) < PER_PAGE:
+            return
+        page += 1
+
+
+def _iter_pages_concurrently(session: requests.Session, org_name: str, pages: range, max_workers: int,
+                             gate: _RateLimitGate) -> Iterator[Optional[List[Dict[str, Any]]]]:
+    """
+    Busca as páginas informadas em paralelo e as gera na ordem das páginas.
+    No máximo 2 * max_workers páginas ficam em andamento ou à espera do consumidor, então a memória
+    não cresce com o número de páginas. Em caso de erro, gera None e descarta as páginas posteriores,
+    como no modo sequencial.
+    """
+    def fetch(page: int) -> Optional[List[Dict[str, Any]]]:
+        try:
+            data, _ = _fetch_repos_page(session, org_name, page, gate)
+            return data
+        except requests.exceptions.RequestException as e:
+            log_request_error(e, org_name)
+            return None
+
+    remaining_pages = iter(pages)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="github-page") as executor:
+        try:
+            for page in islice(remaining_pages, 2 * max_workers):
+                pending.append(executor.submit(fetch, page))
+            while pending:
+                data = pending.popleft().result()
+                if data is None:
+                    yield None
+                    return
+                if not data:
+                    return
+                next_page = next(remaining_pages, None)
+                if next_page is not None:
+                    pending.append(executor.submit(fetch, next_page))
+                yield data
+        finally:
+            # Consumidor interrompido ou erro: não busca as páginas que ainda não começaram.
+            for future in pending:
+                future.cancel()
+
+
+def extract_repo_record(repo_json: Dict[str, Any]) -> RepoRecord:
+    """Extrai informações relevantes de um objeto JSON de repositório do GitHub em um RepoRecord (sem projeto)."""
+    return RepoRecord(
+        repo_json["id"],
+        repo_json["name"],
+        "público" if not repo_json["private"] else "privado",
+        repo_json["created_at"],
+        repo_json["updated_at"],
+        repo_json["stargazers_count"],
+        repo_json["forks_count"],
+        repo_json["html_url"],
+        repo_json.get("description"),
+    )
+
+
+def extract_repo_records(repos_json: List[Dict[str, Any]]) -> List[RepoRecord]:
+    """Converte uma página de objetos JSON em RepoRecord, registrando o tempo no estágio 'extract_repo_info'."""
+    started_at = time.perf_counter()
+    records = [extract_repo_record(repo_json) for repo_json in repos_json]
+    metrics.add_stage_time("extract_repo_info", time.perf_counter() - started_at, len(records))
+    return records
+
 
 def extract_repo_info(repo_json: Dict[str, Any]) -> Dict[str, Any]:
-    """Extrai informações relevantes de um objeto JSON de repositório do GitHub."""
-    return {
-        "github_id": repo_json["id"],
-        "nome": repo_json["name"],
-        "visibilidade": "público" if not repo_json["private"] else "privado",
-        "data_criacao": repo_json["created_at"],
-        "data_ultima_atualizacao": repo_json["updated_at"],
-        "estrelas": repo_json["stargazers_count"],
-        "forks": repo_json["forks_count"],
-        "url": repo_json["html_url"],
-    }
\ No newline at end of file
+    """Extrai informações relevantes de um objeto JSON de repositório do GitHub (como dicionário, com 'projeto_id' nulo)."""
+    return extract_repo_record(repo_json)._asdict()
@@ -0,0 +1,175 @@
+import asyncio
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Any, Optional, Mapping, Tuple
+
+import requests
+
+from src.config.config import settings
+from src.models.model import RepoRecord
+from src.services.github_api import (get_session, fetch_repos_page, parse_last_page, log_request_error,
+                                     extract_repo_records)
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitGovernor:
+    """
+    Token bucket compartilhado por todas as tarefas de coleta, alimentado pelos cabeçalhos
+    X-RateLimit-Remaining/X-RateLimit-Reset das respostas do GitHub.
+    Cada requisição consome um token; quando restam apenas 'reserve' tokens, todas as tarefas
+    aguardam o reset da janela antes de continuar.
+    """
+
+    def __init__(self, reserve: Optional[int] = None):
+        self.reserve = settings.github_rate_limit_reserve if reserve is None else reserve
+        self.remaining: Optional[int] = None
+        self.reset_at = 0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Reserva um token para uma requisição, aguardando o reset se o orçamento tiver acabado."""
+        async with self._lock:
+            if self.remaining is not None and self.remaining <= self.reserve:
+                sleep_duration = max(0, self.reset_at - time.time()) + 1
+                logger.warning(f"Limite de requisições atingido. Aguardando {sleep_duration:.0f} segundos.")
+                await asyncio.sleep(sleep_duration)
+                # Nova janela: o saldo real chega com a próxima resposta.
+                self.remaining = None
+            if self.remaining is not None:
+                self.remaining -= 1
+
+    def update(self, headers: Mapping[str, str]):
+        """Atualiza o saldo a partir dos cabeçalhos de rate limit de uma resposta."""
+        if "X-RateLimit-Remaining" not in headers:
+            return
+        remaining = int(headers["X-RateLimit-Remaining"])
+        reset_at = int(headers.get("X-RateLimit-Reset", 0))
+        if self.remaining is None or reset_at != self.reset_at:
+            self.remaining = remaining
+        else:
+            # Respostas concorrentes chegam fora de ordem: o menor saldo é o mais recente.
+            self.remaining = min(self.remaining, remaining)
+        self.reset_at = reset_at
+
+
+class OrganizationCollector:
+    """
+    Coleta os repositórios de várias organizações concorrentemente com asyncio.
+    As requisições HTTP (síncronas, via requests) rodam em um pool de threads, limitadas por um
+    semáforo global de concorrência e pelo RateLimitGovernor compartilhado.
+    Cada página, convertida em RepoRecord, é entregue a on_page(organização, registros) assim que
+    chega e não fica guardada: o resultado de cada organização traz apenas as contagens.
+    on_page roda em uma única thread de gravação, uma página por vez, para que a gravação no SQLite
+    não bloqueie o laço de eventos; no máximo 2 * max_concurrency páginas ficam em memória
+    aguardando essa thread.
+    """
+
+    def __init__(self, on_page: Callable[[str, List[RepoRecord]], None], max_concurrency: Optional[int] = None,
+                 governor: Optional[RateLimitGovernor] = None):
+        self.on_page = on_page
+        self.max_concurrency = max_concurrency or settings.github_max_concurrency
+        self.governor = governor
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._buffered: Optional[asyncio.Semaphore] = None
+        self._session: Optional[requests.Session] = None
+
+    async def _fetch_page(self, org_name: str, page: int) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
+        """Busca uma página de repositórios e seu cabeçalho 'Link'; em caso de erro, retorna (None, None)."""
+        async with self._semaphore:
+            await self.governor.acquire()
+            loop = asyncio.get_running_loop()
+            try:
+                data, link_header, response = await loop.run_in_executor(
+                    self._executor, fetch_repos_page, self._session, org_name, page)
+            except requests.exceptions.RequestException as e:
+                log_request_error(e, org_name)
+                return None, None
+            self.governor.update(response.headers)
+            return data, link_header
+
+    def _write_page(self, result: Dict[str, Any], data: List[Dict[str, Any]]):
+        """Converte a página em RepoRecord, entrega a on_page e atualiza as contagens (thread de gravação)."""
+        records = extract_repo_records(data)
+        result["paginas"] += 1
+        result["repositorios"] += len(records)
+        self.on_page(result["organizacao"], records)
+
+    async def _deliver(self, result: Dict[str, Any], data: List[Dict[str, Any]]):
+        """Entrega a página à thread de gravação e aguarda a gravação terminar."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._writer, self._write_page, result, data)
+
+    async def _collect_page(self, result: Dict[str, Any], page: int) -> bool:
+        """Busca e entrega uma página; retorna False se a requisição falhou."""
+        async with self._buffered:
+            data, _ = await self._fetch_page(result["organizacao"], page)
+            if data is None:
+                return False
+            await self._deliver(result, data)
+            return True
+
+    async def collect_organization(self, org_name: str) -> Dict[str, Any]:
+        """
+        Coleta todos os repositórios de uma organização: a primeira página informa a última página
+        (cabeçalho 'Link'), e as demais são buscadas concorrentemente e entregues na ordem em que chegam.
+        Com uma página com erro, as demais ainda são gravadas, mas a coleta fica incompleta.
+        """
+        started_at = time.perf_counter()
+        result = {"organizacao": org_name, "repositorios": 0, "completa": True, "paginas": 0}
+
+        async with self._buffered:
+            data, link_header = await self._fetch_page(org_name, 1)
+            fetched_first = data is not None
+            last_page = parse_last_page(link_header) if data else None
+            if fetched_first:
+                await self._deliver(result, data)
+            del data
+        if not fetched_first:
+            result["completa"] = False
+        elif last_page:
+            fetched = await asyncio.gather(
+                *(self._collect_page(result, page) for page in range(2, last_page + 1)))
+            result["completa"] = all(fetched)
+
+        result["tempo_s"] = time.perf_counter() - started_at
+        return result
+
+    async def collect(self, org_names: List[str]) -> List[Dict[str, Any]]:
+        """Coleta as organizações informadas concorrentemente, retornando os resultados na mesma ordem."""
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._buffered = asyncio.Semaphore(2 * self.max_concurrency)
+        if self.governor is None:
+            self.governor = RateLimitGovernor()
+        self._session = get_session(self.max_concurrency)
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="github-collector") as executor, \
+                ThreadPoolExecutor(max_workers=1, thread_name_prefix="github-writer") as writer:
+            self._executor = executor
+            self._writer = writer
+            return await asyncio.gather(*(self.collect_organization(org_name) for org_name in org_names))
+
+
+def log_collection_summary(results: List[Dict[str, Any]]):
+    """Registra no log o resumo de tempo por organização."""
+    for result in results:
+        status = "completa" if result["completa"] else "incompleta"
+        logger.info(
+            f"Organização '{result['organizacao']}': {result['repositorios']} repositórios, "
+            f"{result['paginas']} páginas em {result['tempo_s']:.2f} s (coleta {status}).")
+
+
+def collect_organizations(org_names: List[str], on_page: Callable[[str, List[RepoRecord]], None],
+                          max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Coleta os repositórios de várias organizações concorrentemente, entregando cada página a
+    on_page(organização, registros) assim que chega, em uma única thread de gravação, e registra o
+    resumo de tempos.
+    """
+    started_at = time.perf_counter()
+    results = asyncio.run(OrganizationCollector(on_page, max_concurrency).collect(org_names))
+    log_collection_summary(results)
+    logger.info(f"{len(org_names)} organizações coletadas em {time.perf_counter() - started_at:.2f} s.")
+    return results
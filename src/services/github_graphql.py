@@ -0,0 +1,144 @@
+import json
+import time
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
+
+import requests
+
+from src.config.config import settings
+from src.repositories.github_repository import github_repository
+from src.services.github_api import get_session, log_request_error
+from src.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Limite do GitHub para 'first' em uma conexão GraphQL.
+MAX_PAGE_SIZE = 100
+# Tópicos lidos por repositório.
+MAX_TOPICS = 20
+
+ORG_REPOSITORIES_QUERY = """
+query($org: String!, $first: Int!, $after: String) {
+  organization(login: $org) {
+    repositories(first: $first, after: $after, orderBy: {field: CREATED_AT, direction: ASC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        databaseId
+        name
+        isArchived
+        primaryLanguage { name }
+        repositoryTopics(first: %d) { nodes { topic { name } } }
+        issues(states: OPEN) { totalCount }
+        pullRequests(states: OPEN) { totalCount }
+        defaultBranchRef { target { ... on Commit { committedDate } } }
+      }
+    }
+  }
+  rateLimit { cost remaining resetAt }
+}
+""" % MAX_TOPICS
+
+
+class GraphQLError(Exception):
+    """Erro retornado no corpo de uma resposta GraphQL (campo 'errors')."""
+
+
+def run_graphql_query(session: requests.Session, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Executa uma consulta na API GraphQL do GitHub (settings.github_graphql_url) e retorna o campo 'data'.
+    Lança requests.RequestException em erros HTTP e GraphQLError se a resposta trouxer 'errors'.
+    """
+    started_at = time.perf_counter()
+    response = session.post(settings.github_graphql_url, json={"query": query, "variables": variables}, timeout=60)
+    elapsed = time.perf_counter() - started_at
+    metrics.add_stage_time("graphql_fetch", elapsed)
+    metrics.observe("http_request_duration_seconds", elapsed)
+    metrics.inc("graphql_requests")
+    response.raise_for_status()
+
+    with metrics.stage("json_decode"):
+        body = response.json()
+    if body.get("errors"):
+        raise GraphQLError("; ".join(error.get("message", str(error)) for error in body["errors"]))
+    return body.get("data") or {}
+
+
+def _wait_for_rate_limit(rate_limit: Optional[Dict[str, Any]]):
+    """Aguarda o reset da janela quando os pontos restantes não cobrem mais uma consulta do mesmo custo."""
+    if not rate_limit or rate_limit.get("remaining") is None:
+        return
+    metrics.inc("graphql_rate_limit_cost", rate_limit.get("cost") or 0)
+    if rate_limit["remaining"] >= (rate_limit.get("cost") or 1):
+        return
+    reset_at = datetime.fromisoformat(rate_limit["resetAt"].replace("Z", "+00:00")).timestamp()
+    sleep_duration = max(0, reset_at - time.time()) + 1
+    logger.warning(f"Limite de pontos da API GraphQL atingido. Aguardando {sleep_duration:.0f} segundos.")
+    time.sleep(sleep_duration)
+
+
+def extract_enrichment(node: Dict[str, Any], enriched_at: str) -> Dict[str, Any]:
+    """Converte um nó 'Repository' da consulta GraphQL nos campos de enriquecimento de Repositorios."""
+    topics = [topic_node["topic"]["name"] for topic_node in (node.get("repositoryTopics") or {}).get("nodes", [])]
+    target = (node.get("defaultBranchRef") or {}).get("target") or {}
+    return {
+        "github_id": node["databaseId"],
+        "linguagem": (node.get("primaryLanguage") or {}).get("name"),
+        "topicos": json.dumps(topics, ensure_ascii=False),
+        "issues_abertas": node["issues"]["totalCount"],
+        "pull_requests_abertos": node["pullRequests"]["totalCount"],
+        "data_ultimo_commit": target.get("committedDate"),
+        "arquivado": int(bool(node.get("isArchived"))),
+        "enriquecido_em": enriched_at,
+    }
+
+
+def enrich_organization(org_name: str, page_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Enriquece os repositórios já gravados da organização com linguagem principal, tópicos,
+    issues e pull requests abertos, data do último commit do branch padrão e status de arquivado.
+    Usa a API GraphQL em lotes de até 100 repositórios por requisição (paginação por cursor) e grava
+    cada página assim que ela chega. Retorna {"repositorios", "atualizados", "requisicoes", "completo"}.
+    """
+    page_size = min(page_size or settings.graphql_page_size, MAX_PAGE_SIZE)
+    session = get_session()
+    enriched_at = datetime.now(timezone.utc).isoformat()
+    result = {"repositorios": 0, "atualizados": 0, "requisicoes": 0, "completo": False}
+    cursor: Optional[str] = None
+    started_at = time.perf_counter()
+
+    while True:
+        try:
+            data = run_graphql_query(session, ORG_REPOSITORIES_QUERY,
+                                     {"org": org_name, "first": page_size, "after": cursor})
+        except requests.exceptions.RequestException as e:
+            log_request_error(e, org_name)
+            break
+        except GraphQLError as e:
+            logger.error(f"Erro na consulta GraphQL da organização '{org_name}': {e}")
+            break
+        finally:
+            result["requisicoes"] += 1
+
+        organization = data.get("organization")
+        if organization is None:
+            logger.error(f"Organização '{org_name}' não encontrada na API GraphQL.")
+            break
+        connection = organization["repositories"]
+        enrichments = [extract_enrichment(node, enriched_at) for node in connection["nodes"] if node]
+        result["repositorios"] += len(enrichments)
+        with metrics.stage("db_enrichment"):
+            result["atualizados"] += github_repository.update_enrichment(enrichments)
+
+        _wait_for_rate_limit(data.get("rateLimit"))
+        page_info = connection["pageInfo"]
+        if not page_info["hasNextPage"]:
+            result["completo"] = True
+            break
+        cursor = page_info["endCursor"]
+
+    logger.info(
+        f"Enriquecimento GraphQL da organização '{org_name}': {result['repositorios']} repositórios "
+        f"({result['atualizados']} atualizados) em {result['requisicoes']} requisições, "
+        f"{time.perf_counter() - started_at:.2f} s.")
+    return result
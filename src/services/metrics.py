@@ -0,0 +1,214 @@
+import os
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Sequence
+
+from src.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = "repo_monitor"
+
+HTTP_LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ROWS_PER_SECOND_BUCKETS = (100, 1000, 5000, 10000, 50000, 100000, 500000, 1000000)
+
+
+class Histogram:
+    """Histograma com buckets cumulativos no formato do Prometheus."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.bucket_counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        for i, upper_bound in enumerate(self.buckets):
+            if value <= upper_bound:
+                self.bucket_counts[i] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "contagem": self.count,
+            "soma": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "media": self.sum / self.count if self.count else None,
+            "buckets": {str(upper_bound): count for upper_bound, count in zip(self.buckets, self.bucket_counts)},
+        }
+
+
+class MetricsRegistry:
+    """
+    Coleta métricas de uma execução do monitoramento: tempo e chamadas por estágio, contadores e
+    histogramas (latência HTTP, linhas gravadas por segundo). Segura para uso a partir de várias threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Zera todas as métricas (início de uma nova execução)."""
+        with self._lock:
+            self.started_at = time.time()
+            self.stage_seconds: Dict[str, float] = {}
+            self.stage_calls: Dict[str, int] = {}
+            self.counters: Dict[str, float] = {}
+            self.histograms: Dict[str, Histogram] = {
+                "http_request_duration_seconds": Histogram(HTTP_LATENCY_BUCKETS),
+                "db_upsert_rows_per_second": Histogram(ROWS_PER_SECOND_BUCKETS),
+            }
+
+    def add_stage_time(self, stage: str, seconds: float, calls: int = 1):
+        """Acumula o tempo gasto em um estágio."""
+        with self._lock:
+            self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+            self.stage_calls[stage] = self.stage_calls.get(stage, 0) + calls
+
+    @contextmanager
+    def stage(self, stage: str):
+        """Mede o tempo de um bloco e o acumula no estágio informado."""
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage_time(stage, time.perf_counter() - started_at)
+
+    def inc(self, counter: str, value: float = 1):
+        """Incrementa um contador."""
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def counter(self, counter: str) -> float:
+        """Valor atual de um contador (0 se ainda não incrementado)."""
+        with self._lock:
+            return self.counters.get(counter, 0)
+
+    def observe(self, histogram: str, value: float):
+        """Registra uma observação em um histograma."""
+        with self._lock:
+            self.histograms[histogram].observe(value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Resumo JSON da execução."""
+        with self._lock:
+            return {
+                "inicio": self.started_at,
+                "duracao_s": time.time() - self.started_at,
+                "estagios": {stage: {"tempo_s": seconds, "chamadas": self.stage_calls[stage]}
+                             for stage, seconds in self.stage_seconds.items()},
+                "contadores": dict(self.counters),
+                "histogramas": {name: histogram.to_dict() for name, histogram in self.histograms.items()},
+            }
+
+    def to_prometheus(self) -> str:
+        """Métricas no formato de texto do Prometheus (para o textfile collector do node_exporter)."""
+        lines = []
+        with self._lock:
+            lines.append(f"# HELP {METRIC_PREFIX}_stage_seconds_total Tempo gasto em cada estágio na última execução.")
+            lines.append(f"# TYPE {METRIC_PREFIX}_stage_seconds_total counter")
+            for stage, seconds in sorted(self.stage_seconds.items()):
+                lines.append(f'{METRIC_PREFIX}_stage_seconds_total{{stage="{stage}"}} {seconds:.6f}')
+            lines.append(f"# HELP {METRIC_PREFIX}_stage_calls_total Chamadas de cada estágio na última execução.")
+            lines.append(f"# TYPE {METRIC_PREFIX}_stage_calls_total counter")
+            for stage, calls in sorted(self.stage_calls.items()):
+                lines.append(f'{METRIC_PREFIX}_stage_calls_total{{stage="{stage}"}} {calls}')
+            for counter, value in sorted(self.counters.items()):
+                lines.append(f"# TYPE {METRIC_PREFIX}_{counter}_total counter")
+                lines.append(f"{METRIC_PREFIX}_{counter}_total {value:g}")
+            for name, histogram in sorted(self.histograms.items()):
+                metric = f"{METRIC_PREFIX}_{name}"
+                lines.append(f"# TYPE {metric} histogram")
+                for upper_bound, count in zip(histogram.buckets, histogram.bucket_counts):
+                    lines.append(f'{metric}_bucket{{le="{upper_bound:g}"}} {count}')
+                lines.append(f'{metric}_bucket{{le="+Inf"}} {histogram.count}')
+                lines.append(f"{metric}_sum {histogram.sum:.6f}")
+                lines.append(f"{metric}_count {histogram.count}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_last_run_timestamp_seconds gauge")
+            lines.append(f"{METRIC_PREFIX}_last_run_timestamp_seconds {self.started_at:.0f}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, json_path: Optional[str] = None, prometheus_path: Optional[str] = None):
+        """
+        Grava o resumo JSON e o arquivo do Prometheus (de forma atômica) e registra o resumo no log.
+        Sem caminhos explícitos, usa os de settings; um caminho vazio desativa o respectivo arquivo.
+        """
+        json_path = settings.metrics_json_path if json_path is None else json_path
+        prometheus_path = settings.metrics_prometheus_path if prometheus_path is None else prometheus_path
+        summary = self.to_dict()
+        for path, content in ((json_path, json.dumps(summary, indent=2, ensure_ascii=False)),
+                              (prometheus_path, self.to_prometheus())):
+            if not path:
+                continue
+            try:
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as file:
+                    file.write(content)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.error(f"Erro ao gravar métricas em '{path}': {e}")
+
+        stages = ", ".join(f"{stage}={data['tempo_s']:.3f}s" for stage, data in summary["estagios"].items())
+        logger.info(f"Métricas da execução ({summary['duracao_s']:.2f} s): {stages}")
+
+
+metrics = MetricsRegistry()
+
+
+@contextmanager
+def profiling(mode: Optional[str] = None, output_dir: Optional[str] = None):
+    """
+    Perfila o bloco com cProfile e/ou tracemalloc, conforme 'mode' ("cprofile", "tracemalloc"
+    ou ambos separados por vírgula; vazio desativa). Os resultados vão para o log e para output_dir.
+    Sem argumentos, usa settings.profile_mode e settings.profile_output_dir.
+    """
+    mode = settings.profile_mode if mode is None else mode
+    output_dir = output_dir or settings.profile_output_dir
+    modes = {item.strip().lower() for item in (mode or "").split(",") if item.strip()}
+    if not modes:
+        yield
+        return
+
+    profiler = None
+    if "cprofile" in modes:
+        import cProfile
+        profiler = cProfile.Profile()
+    if "tracemalloc" in modes:
+        import tracemalloc
+        tracemalloc.start(25)
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        os.makedirs(output_dir, exist_ok=True)
+        if profiler:
+            import io
+            import pstats
+            profiler.disable()
+            stats_path = os.path.join(output_dir, "profile.pstats")
+            profiler.dump_stats(stats_path)
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(20)
+            logger.info(f"Perfil cProfile gravado em '{stats_path}'. Funções mais custosas:\n{stream.getvalue()}")
+        if "tracemalloc" in modes:
+            import tracemalloc
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            snapshot_path = os.path.join(output_dir, "memory.tracemalloc")
+            snapshot.dump(snapshot_path)
+            top = "\n".join(str(stat) for stat in snapshot.statistics("lineno")[:10])
+            logger.info(
+                f"tracemalloc: pico de {peak / 1024 / 1024:.1f} MiB (atual {current / 1024 / 1024:.1f} MiB), "
+                f"snapshot em '{snapshot_path}'. Maiores alocações:\n{top}")
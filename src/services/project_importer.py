@@ -1,78 +1,183 @@
 import csv
 import json
 import os
+import time
 import logging
-from typing import Optional
+from typing import Optional, List, Dict, Any, Iterator, Iterable, TextIO, Tuple
 
 from src.repositories.project_repository import project_repository
-from src.config.config import PROJECTS_CSV_PATH, PROJECTS_JSON_PATH
+from src.services.metrics import metrics
+from src.config.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Tamanho dos blocos lidos do arquivo JSON pelo parser incremental.
+JSON_READ_CHUNK_SIZE = 64 * 1024
+_JSON_WHITESPACE = " \t\n\r"
 
-def import_projects_from_csv() -> Optional[str]:
-    """Importa projetos de um arquivo CSV e retorna o nome da organização."""
-    organization_name = None
-    projects_to_insert = []
-    try:
-        if not os.path.exists(PROJECTS_CSV_PATH):
-            logger.error(f"Arquivo CSV de projetos '{PROJECTS_CSV_PATH}' não encontrado.")
-            return None
-
-        with open(PROJECTS_CSV_PATH, mode='r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            for i, row in enumerate(reader):
-                if i == 0:
-                    organization_name = row.get("organizacao_github")
-                    if not organization_name:
-                        logger.warning("Campo 'organizacao_github' não encontrado na primeira linha do CSV.")
-
-                nome = row.get("nome")
-                descricao = row.get("descricao")
-
-                if nome:
-                    projects_to_insert.append({"nome": nome, "descricao": descricao})
-                else:
-                    logger.warning(f"Linha ignorada no CSV por falta de 'nome': {row}")
-
-            for project in projects_to_insert:
-                project_repository.insert_project(project["nome"],
-                                                  project["descricao"])  # Chama o método do repositório
 
-    except Exception as e:
-        logger.error(f"Erro ao importar projetos do CSV: {e}")
+def iter_json_array(file: TextIO, chunk_size: int = JSON_READ_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Lê os itens de um array JSON de forma incremental, sem carregar o arquivo inteiro em memória.
+    O arquivo é lido em blocos de chunk_size caracteres e cada item é decodificado com
+    JSONDecoder.raw_decode; só o item corrente e o bloco em leitura ficam no buffer.
+    Lança ValueError se o conteúdo não for um array e json.JSONDecodeError se for um JSON inválido.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    state = "inicio"  # inicio -> item_ou_fim -> separador -> item -> separador ...
 
-    return organization_name
+    while True:
+        while pos < len(buffer) and buffer[pos] in _JSON_WHITESPACE:
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                raise json.JSONDecodeError("Array JSON incompleto", buffer, pos)
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
 
+        char = buffer[pos]
+        if state == "inicio":
+            if char != "[":
+                raise ValueError("Esperado um array JSON.")
+            pos += 1
+            state = "item_ou_fim"
+            continue
+        if state == "separador":
+            if char == ",":
+                pos += 1
+                state = "item"
+                continue
+            if char == "]":
+                return
+            raise json.JSONDecodeError("Esperado ',' ou ']'", buffer, pos)
+        if state == "item_ou_fim" and char == "]":
+            return
 
-def import_projects_from_json() -> Optional[str]:
-    """Importa projetos de um arquivo JSON e retorna o nome da organização."""
-    organization_name = None
-    try:
-        if not os.path.exists(PROJECTS_JSON_PATH):
-            logger.error(f"Arquivo JSON de projetos '{PROJECTS_JSON_PATH}' não encontrado.")
-            return None
-
-        with open(PROJECTS_JSON_PATH, mode='r', encoding='utf-8') as file:
-            data = json.load(file)
-            if isinstance(data, list) and data:
-                first_item = data[0]
-                organization_name = first_item.get("organizacao_github")
-                if not organization_name:
-                    logger.warning("Campo 'organizacao_github' não encontrado no primeiro objeto do JSON.")
-
-                for item in data:
-                    nome = item.get("nome")
-                    descricao = item.get("descricao")
-                    if nome:
-                        project_repository.insert_project(nome, descricao)  # Chama o método do repositório
-                    else:
-                        logger.warning(f"Item ignorado no JSON por falta de 'nome': {item}")
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+            next_pos = end
+            while next_pos < len(buffer) and buffer[next_pos] in _JSON_WHITESPACE:
+                next_pos += 1
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            end = None
+        # Um item só é aceito quando o delimitador seguinte já está no buffer: sem isso, um número
+        # cortado no fim do bloco (ex.: "-1.5e" de "-1.5e10") seria decodificado pela metade.
+        if not eof and (end is None or next_pos == len(buffer) or buffer[next_pos] not in ",]"):
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        yield item
+        pos = end
+        state = "separador"
+
+
+def _iter_csv_records(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, mode='r', encoding='utf-8', newline='') as file:
+        yield from csv.DictReader(file)
+
+
+def _iter_json_records(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, mode='r', encoding='utf-8') as file:
+        for item in iter_json_array(file):
+            if isinstance(item, dict):
+                yield item
             else:
-                logger.error("Formato JSON inválido: Esperado uma lista de objetos não vazia.")
+                logger.warning(f"Item ignorado no JSON por não ser um objeto: {item}")
+
+
+def _project_rows(records: Iterable[Dict[str, Any]], source: str,
+                  result: Dict[str, Any]) -> Iterator[Tuple[str, Optional[str]]]:
+    """Converte os registros em (nome, descricao), guardando em result a organização do primeiro registro."""
+    for i, record in enumerate(records):
+        if i == 0:
+            result["organizacao"] = record.get("organizacao_github")
+            if not result["organizacao"]:
+                logger.warning(f"Campo 'organizacao_github' não encontrado no primeiro registro do {source}.")
+
+        nome = record.get("nome")
+        if nome:
+            yield nome, record.get("descricao")
+        else:
+            logger.warning(f"Registro ignorado no {source} por falta de 'nome': {record}")
+
+
+def bulk_import_projects(path: str, file_format: Optional[str] = None,
+                         batch_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Importa um catálogo de projetos CSV ou JSON (formato deduzido da extensão, se não informado)
+    lendo os registros em streaming e gravando-os em lotes com INSERT OR IGNORE.
+    Retorna a organização do primeiro registro, o mapa nome -> ID dos projetos (obtido em uma única
+    consulta ao fim da importação) e as contagens e a vazão (linhas/s) da importação.
+    """
+    file_format = (file_format or os.path.splitext(path)[1].lstrip(".")).lower()
+    source = file_format.upper()
+    result: Dict[str, Any] = {"organizacao": None, "projetos": {}, "linhas": 0, "inseridos": 0,
+                              "falhas": 0, "tempo_s": 0.0, "linhas_por_s": 0.0}
+    if not os.path.exists(path):
+        logger.error(f"Arquivo {source} de projetos '{path}' não encontrado.")
+        return result
+
+    records = _iter_csv_records(path) if file_format == "csv" else _iter_json_records(path)
+    started_at = time.perf_counter()
+    try:
+        result.update(project_repository.insert_projects(_project_rows(records, source, result), batch_size))
     except json.JSONDecodeError:
-        logger.error(f"Arquivo '{PROJECTS_JSON_PATH}' não é um JSON válido.")
+        logger.error(f"Arquivo '{path}' não é um JSON válido.")
+    except ValueError:
+        logger.error("Formato JSON inválido: Esperado uma lista de objetos não vazia.")
     except Exception as e:
-        logger.error(f"Erro ao importar projetos do JSON: {e}")
+        logger.error(f"Erro ao importar projetos do {source}: {e}")
+    else:
+        if file_format == "json" and not result["linhas"]:
+            logger.error("Formato JSON inválido: Esperado uma lista de objetos não vazia.")
+    elapsed = time.perf_counter() - started_at
+
+    result["projetos"] = project_repository.get_all_project_ids()
+    result["tempo_s"] = elapsed
+    result["linhas_por_s"] = result["linhas"] / elapsed if elapsed else 0.0
+    metrics.add_stage_time("project_import", elapsed)
+    metrics.inc("projects_imported", result["inseridos"])
+    logger.info(
+        f"Importação de projetos ({source}): {result['linhas']} linhas, {result['inseridos']} inseridas, "
+        f"{result['falhas']} falhas em {elapsed:.2f} s ({result['linhas_por_s']:,.0f} linhas/s).")
+    return result
+
+
+def import_projects_from_csv() -> Optional[str]:
+    """Importa projetos de um arquivo CSV e retorna o nome da organização."""
+    return bulk_import_projects(settings.projects_csv_path, "csv")["organizacao"]
+
 
-    return organization_name
\ No newline at end of file
+def import_projects_from_json() -> Optional[str]:
+    """Importa projetos de um arquivo JSON e retorna o nome da organização."""
+    return bulk_import_projects(settings.projects_json_path, "json")["organizacao"]
+
+
+def load_organization_names() -> List[str]:
+    """
+    Lê todas as organizações (coluna/campo 'organizacao_github') do arquivo de projetos CSV ou JSON,
+    sem duplicatas e na ordem em que aparecem.
+    """
+    organizations: Dict[str, None] = {}
+    try:
+        if os.path.exists(settings.projects_csv_path):
+            records = _iter_csv_records(settings.projects_csv_path)
+        elif os.path.exists(settings.projects_json_path):
+            records = _iter_json_records(settings.projects_json_path)
+        else:
+            return []
+        for record in records:
+            org = (record.get("organizacao_github") or "").strip()
+            if org:
+                organizations.setdefault(org)
+    except (OSError, ValueError) as e:
+        logger.error(f"Erro ao ler as organizações do arquivo de projetos: {e}")
+    return list(organizations)
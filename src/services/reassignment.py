@@ -0,0 +1,102 @@
+import time
+import logging
+from collections import Counter, defaultdict
+from typing import Dict, Any, List, Optional, Tuple
+
+from src.repositories.github_repository import github_repository
+from src.repositories.project_repository import project_repository
+from src.repositories.search_repository import search_repository
+from src.services.metrics import metrics
+from src.services.rule_matcher import ProjectRuleMatcher
+
+logger = logging.getLogger(__name__)
+
+# Quantidade de repositórios movidos listados por par (origem -> destino) no relatório.
+REPORT_EXAMPLES = 5
+
+
+def plan_reassignment(matcher: ProjectRuleMatcher,
+                      assignments: Optional[List[Tuple[int, str, Optional[int]]]] = None) -> Dict[str, Any]:
+    """
+    Avalia as regras de atribuição sobre os nomes dos repositórios já gravados, sem acessar a API.
+    Repositórios que não casam com nenhuma regra vão para o projeto padrão, como na coleta.
+    'assignments' limita a avaliação a esses (id, nome, projeto atual); por padrão, todos os repositórios.
+    Retorna {"repositorios": total avaliado, "movimentos": {projeto destino: [IDs de Repositorios]},
+    "detalhes": [(nome, projeto atual, projeto destino)]}.
+    """
+    started_at = time.perf_counter()
+    if assignments is None:
+        assignments = github_repository.get_project_assignments()
+    moves: Dict[int, List[int]] = defaultdict(list)
+    details: List[Tuple[str, Optional[int], int]] = []
+    for repo_id, repo_name, current_project_id in assignments:
+        target_project_id = matcher.match(repo_name) or matcher.default_project_id
+        if target_project_id and target_project_id != current_project_id:
+            moves[target_project_id].append(repo_id)
+            details.append((repo_name, current_project_id, target_project_id))
+    metrics.add_stage_time("rule_assignment", time.perf_counter() - started_at, len(assignments))
+    return {"repositorios": len(assignments), "movimentos": dict(moves), "detalhes": details}
+
+
+def log_reassignment_report(plan: Dict[str, Any]):
+    """Registra o diff da reatribuição: entradas e saídas por projeto e exemplos de cada movimento."""
+    project_names = {project_id: name for name, project_id in project_repository.get_all_project_ids().items()}
+
+    def project_label(project_id: Optional[int]) -> str:
+        return project_names.get(project_id, f"#{project_id}") if project_id is not None else "(sem projeto)"
+
+    details = plan["detalhes"]
+    logger.info(f"Reatribuição: {len(details)} de {plan['repositorios']} repositórios mudariam de projeto.")
+    incoming = Counter(target for _, _, target in details)
+    outgoing = Counter(current for _, current, _ in details)
+    for project_id in sorted(set(incoming) | set(outgoing), key=lambda project_id: project_label(project_id)):
+        logger.info(f"  {project_label(project_id)}: +{incoming[project_id]} / -{outgoing[project_id]}")
+
+    examples: Dict[Tuple[Optional[int], int], List[str]] = defaultdict(list)
+    pair_counts = Counter()
+    for repo_name, current, target in details:
+        pair_counts[(current, target)] += 1
+        if len(examples[(current, target)]) < REPORT_EXAMPLES:
+            examples[(current, target)].append(repo_name)
+    for (current, target), count in pair_counts.most_common():
+        names = ", ".join(examples[(current, target)]) + (", ..." if count > REPORT_EXAMPLES else "")
+        logger.info(f"  {project_label(current)} -> {project_label(target)}: {count} ({names})")
+
+
+def reassign_repositories(matcher: ProjectRuleMatcher, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Reaplica as regras de atribuição aos repositórios gravados e grava as mudanças com um UPDATE por
+    projeto de destino, em uma única transação. Com dry_run=True, apenas registra o diff.
+    Retorna {"repositorios", "movidos", "atualizados"}.
+    """
+    plan = plan_reassignment(matcher)
+    log_reassignment_report(plan)
+    result = {"repositorios": plan["repositorios"], "movidos": len(plan["detalhes"]), "atualizados": 0}
+    if dry_run or not plan["movimentos"]:
+        return result
+    with metrics.stage("db_reassign"):
+        result["atualizados"] = github_repository.reassign_projects(plan["movimentos"])
+    logger.info(f"Reatribuição aplicada: {result['atualizados']} repositórios atualizados "
+                f"em {len(plan['movimentos'])} UPDATEs.")
+    return result
+
+
+def preview_keyword(keyword: str, matcher: ProjectRuleMatcher) -> Dict[str, Any]:
+    """
+    Prévia de uma palavra-chave nova em project_assignment_rules.yaml, sem gravar nada: encontra pelo
+    índice de busca os repositórios cujo nome contém a palavra-chave e avalia, apenas sobre eles, as regras
+    já com a palavra-chave acrescentada ('matcher'). Registra os repositórios encontrados e o diff por projeto.
+    Retorna o plano de plan_reassignment, com "palavra_chave" e "busca_ms".
+    """
+    started_at = time.perf_counter()
+    matches = search_repository.find_by_name_fragment(keyword)
+    search_ms = (time.perf_counter() - started_at) * 1000
+    names = ", ".join(match["nome"] for match in matches[:REPORT_EXAMPLES])
+    if len(matches) > REPORT_EXAMPLES:
+        names += ", ..."
+    logger.info(f"Palavra-chave '{keyword}': {len(matches)} repositórios com o trecho no nome "
+                f"(busca em {search_ms:.1f} ms){': ' + names if matches else '.'}")
+
+    plan = plan_reassignment(matcher, [(match["id"], match["nome"], match["projeto_id"]) for match in matches])
+    log_reassignment_report(plan)
+    return {**plan, "palavra_chave": keyword, "busca_ms": search_ms}
@@ -0,0 +1,88 @@
+import time
+import logging
+from array import array
+from typing import Callable, Dict, List, Optional
+
+from src.models.model import RepoRecord
+from src.repositories.github_repository import github_repository
+from src.repositories.search_repository import search_repository
+from src.repositories.sync_state_repository import sync_state_repository
+from src.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class OrganizationSync:
+    """
+    Grava os repositórios de uma organização página a página, à medida que a coleta avança.
+    Cada página (lista de RepoRecord) recebe os projetos pela função assign_project e é gravada em
+    seguida, junto com a atualização do índice de busca; da página só sobram o id do GitHub de cada
+    repositório (para a reconciliação, em um array compacto) e a maior data de atualização (marca d'água).
+    finish() conclui a sincronização depois da última página.
+    """
+
+    def __init__(self, org_name: str, assign_project: Callable[[str], Optional[int]], full_reconcile: bool):
+        self.org_name = org_name
+        self.assign_project = assign_project
+        self.full_reconcile = full_reconcile
+        self.counts = {"inseridos": 0, "atualizados": 0, "inalterados": 0, "falhas": 0}
+        self.repositories = 0
+        self.pages = 0
+        self.watermark: Optional[str] = None
+        # Prefixo das URLs da organização, tirado do html_url devolvido pela API (host e login canônicos).
+        self.url_prefix: Optional[str] = None
+        self._github_ids = array("q")
+
+    def write_page(self, records: List[RepoRecord]):
+        """Associa os projetos dos repositórios da página e grava a página em seguida."""
+        started_at = time.perf_counter()
+        rows = []
+        for record in records:
+            projeto_id = self.assign_project(record.nome)
+            if projeto_id:
+                rows.append(record._replace(projeto_id=projeto_id))
+            else:
+                logger.critical(
+                    f"Repositório '{record.nome}' não pôde ser associado a nenhum projeto (nem mesmo o padrão). Isso é um erro inesperado e indica um problema na lógica de atribuição ou no projeto padrão.")
+        metrics.add_stage_time("rule_assignment", time.perf_counter() - started_at, len(records))
+
+        counts = github_repository.upsert_repositories(rows)
+        started_at = time.perf_counter()
+        search_repository.apply_pending_changes()
+        metrics.add_stage_time("search_index", time.perf_counter() - started_at)
+        for key, value in counts.items():
+            self.counts[key] += value
+        self.pages += 1
+        self.repositories += len(records)
+        if self.full_reconcile:
+            self._github_ids.extend(record.github_id for record in records)
+            if self.url_prefix is None and records:
+                self.url_prefix = records[0].url.rsplit("/", 1)[0] + "/"
+        page_watermark = max((record.data_ultima_atualizacao for record in records), default=None)
+        if page_watermark and (self.watermark is None or page_watermark > self.watermark):
+            self.watermark = page_watermark
+        logger.debug(f"Página {self.pages} da organização '{self.org_name}' gravada ({len(rows)} repositórios).")
+
+    def finish(self, complete: bool) -> Dict[str, int]:
+        """
+        Conclui a sincronização: após uma coleta completa e sem falhas de gravação, remove os repositórios
+        ausentes (reconciliação) e avança a marca d'água.
+        Retorna a contagem de inseridos/atualizados/inalterados/falhas.
+        """
+        if self.full_reconcile and not self.repositories:
+            logger.warning(
+                f"Nenhum repositório encontrado ou erro ao acessar a API do GitHub para a organização '{self.org_name}'.")
+            return self.counts
+
+        logger.info(f"Encontrados {self.repositories} repositórios na organização '{self.org_name}'.")
+        logger.info(
+            f"Repositórios armazenados: {self.counts['inseridos']} inseridos, {self.counts['atualizados']} atualizados, "
+            f"{self.counts['inalterados']} inalterados, {self.counts['falhas']} falhas.")
+
+        if complete and not self.counts["falhas"]:
+            if self.full_reconcile:
+                github_repository.delete_missing_repositories(self.org_name, self._github_ids, self.url_prefix)
+            sync_state_repository.save_state(self.org_name, self.watermark, self.full_reconcile)
+        else:
+            logger.warning(f"Sincronização incompleta: a marca d'água da organização '{self.org_name}' não foi atualizada.")
+        return self.counts
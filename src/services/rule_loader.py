@@ -1,38 +1,105 @@
 
 import os
-import yaml
+import pickle
+import hashlib
 import logging
 # --- ADICIONE ESTA LINHA ---
 from typing import Optional, List, Dict, Any
 # --- FIM DA LINHA ADICIONADA ---
 
-from src.config.config import PROJECT_ASSIGNMENT_RULES_PATH
+from src.config.config import settings
+from src.services.rule_matcher import CompiledRuleSet
 
 logger = logging.getLogger(__name__)
 
+# Versão do formato do cache de regras compiladas; altere ao mudar CompiledRuleSet.
+RULES_CACHE_VERSION = 1
+
+
+def _parse_rules_yaml(content: bytes, rules_path: str) -> Optional[List[Dict[str, Any]]]:
+    """Analisa o conteúdo do arquivo de regras YAML; retorna a lista de regras ou None em caso de falha."""
+    import yaml  # Importado sob demanda: o PyYAML só é necessário ao analisar o arquivo de regras.
 
-def load_assignment_rules_from_yaml() -> Optional[List[Dict[str, Any]]]:
-    """
-    Carrega as regras de atribuição de projetos de um arquivo YAML.
-    Retorna uma lista de dicionários de regras ou None em caso de falha.
-    """
     try:
-        if not os.path.exists(PROJECT_ASSIGNMENT_RULES_PATH):
-            logger.error(f"Arquivo de regras de atribuição '{PROJECT_ASSIGNMENT_RULES_PATH}' não encontrado.")
+        data = yaml.safe_load(content)
+        if data and 'rules' in data and isinstance(data['rules'], list):
+            logger.info(f"Regras de atribuição carregadas com sucesso de '{rules_path}'.")
+            return data['rules']
+        else:
+            logger.error(
+                f"Formato inválido no arquivo de regras YAML '{rules_path}'. Esperado 'rules' como uma lista.")
             return None
-
-        with open(PROJECT_ASSIGNMENT_RULES_PATH, 'r', encoding='utf-8') as file:
-            data = yaml.safe_load(file)
-            if data and 'rules' in data and isinstance(data['rules'], list):
-                logger.info(f"Regras de atribuição carregadas com sucesso de '{PROJECT_ASSIGNMENT_RULES_PATH}'.")
-                return data['rules']
-            else:
-                logger.error(
-                    f"Formato inválido no arquivo de regras YAML '{PROJECT_ASSIGNMENT_RULES_PATH}'. Esperado 'rules' como uma lista.")
-                return None
     except yaml.YAMLError as e:
-        logger.error(f"Erro ao analisar o arquivo YAML '{PROJECT_ASSIGNMENT_RULES_PATH}': {e}")
+        logger.error(f"Erro ao analisar o arquivo YAML '{rules_path}': {e}")
         return None
     except Exception as e:
         logger.error(f"Erro inesperado ao carregar regras de atribuição: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+def get_rules_cache_path() -> str:
+    """Caminho do cache das regras compiladas: RULES_CACHE_PATH ou um arquivo ao lado do banco de dados."""
+    return settings.rules_cache_path or f"{os.path.splitext(settings.database_name)[0]}.rules.pickle"
+
+
+def _read_rules_cache(cache_path: str, content_hash: str) -> Optional[CompiledRuleSet]:
+    try:
+        with open(cache_path, 'rb') as file:
+            cached = pickle.load(file)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Cache de regras '{cache_path}' ilegível ({e}). Recompilando as regras.")
+        return None
+    if (not isinstance(cached, dict) or cached.get("versao") != RULES_CACHE_VERSION
+            or cached.get("hash") != content_hash or not isinstance(cached.get("regras"), CompiledRuleSet)):
+        return None
+    return cached["regras"]
+
+
+def _write_rules_cache(cache_path: str, content_hash: str, rule_set: CompiledRuleSet):
+    tmp_path = f"{cache_path}.tmp"
+    try:
+        with open(tmp_path, 'wb') as file:
+            pickle.dump({"versao": RULES_CACHE_VERSION, "hash": content_hash, "regras": rule_set},
+                        file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Não foi possível gravar o cache de regras em '{cache_path}': {e}")
+
+
+def load_compiled_rules(write_cache: bool = True) -> Optional[CompiledRuleSet]:
+    """
+    Carrega as regras de atribuição já validadas e compiladas.
+    O conjunto compilado é guardado em um cache binário (pickle) ao lado do banco de dados, identificado
+    pelo hash SHA-256 do conteúdo do arquivo YAML: enquanto o arquivo não muda, as execuções seguintes
+    leem o cache sem analisar o YAML. Com write_cache=False, o cache é só lido, nunca gravado.
+    Retorna None se o arquivo de regras não puder ser carregado.
+    """
+    rules_path = settings.project_assignment_rules_path
+    try:
+        with open(rules_path, 'rb') as file:
+            content = file.read()
+    except FileNotFoundError:
+        logger.error(f"Arquivo de regras de atribuição '{rules_path}' não encontrado.")
+        return None
+    except OSError as e:
+        logger.error(f"Erro ao ler o arquivo de regras '{rules_path}': {e}")
+        return None
+
+    content_hash = hashlib.sha256(content).hexdigest()
+    cache_path = get_rules_cache_path()
+    rule_set = _read_rules_cache(cache_path, content_hash)
+    if rule_set is not None:
+        logger.info(f"{len(rule_set)} regras de atribuição carregadas do cache '{cache_path}'.")
+        return rule_set
+
+    rules = _parse_rules_yaml(content, rules_path)
+    if rules is None:
+        return None
+    rule_set = CompiledRuleSet(rules)
+    if rule_set.invalid_rules:
+        logger.warning(f"{rule_set.invalid_rules} regras de atribuição inválidas foram descartadas na compilação.")
+    if write_cache:
+        _write_rules_cache(cache_path, content_hash, rule_set)
+    return rule_set
@@ -0,0 +1,143 @@
+import re
+import logging
+from typing import Optional, List, Dict, Any, Iterable, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+class CompiledRuleSet:
+    """
+    Regras de atribuição validadas e compiladas em um único padrão.
+    Todas as palavras-chave são combinadas em uma expressão regular, ordenadas pela prioridade da regra
+    (a ordem do arquivo). Guarda os nomes dos projetos, e não seus IDs, para poder ser serializada
+    em cache independentemente do banco de dados.
+    Regras inválidas são descartadas (com um aviso) uma única vez, na compilação.
+    """
+
+    def __init__(self, rules: Iterable[Any]):
+        self.rules: List[Tuple[str, Tuple[str, ...]]] = []
+        self.invalid_rules = 0
+        for rule in rules:
+            compiled = self._validate(rule)
+            if compiled is None:
+                self.invalid_rules += 1
+                logger.warning(f"Regra de atribuição inválida: {rule}. Ignorando.")
+                continue
+            self.rules.append(compiled)
+        self._compile()
+
+    @staticmethod
+    def _validate(rule: Any) -> Optional[Tuple[str, Tuple[str, ...]]]:
+        """Retorna (projeto, palavras-chave normalizadas) ou None se a regra for inválida."""
+        if not isinstance(rule, dict):
+            return None
+        project_name = rule.get("project_name")
+        keywords = rule.get("keywords", [])
+        if not project_name or not isinstance(project_name, str) or not isinstance(keywords, list):
+            return None
+        if any(isinstance(keyword, (dict, list)) for keyword in keywords):
+            return None
+        # Uma palavra-chave vazia casaria com qualquer nome de repositório.
+        return project_name, tuple(str(keyword).lower() for keyword in keywords if keyword is not None and str(keyword))
+
+    def _compile(self):
+        self._keyword_priority: Dict[str, int] = {}
+        for priority, (_, keywords) in enumerate(self.rules):
+            for keyword in keywords:
+                self._keyword_priority.setdefault(keyword, priority)
+
+        ordered_keywords = sorted(self._keyword_priority, key=self._keyword_priority.__getitem__)
+        # O lookahead permite encontrar palavras-chave sobrepostas: em cada posição do nome, a alternativa
+        # capturada é a de maior prioridade que começa ali.
+        self._pattern = re.compile(
+            "(?=(" + "|".join(re.escape(keyword) for keyword in ordered_keywords) + "))"
+        ) if ordered_keywords else None
+
+    @property
+    def project_names(self) -> List[str]:
+        """Nomes dos projetos referenciados pelas regras, na ordem de prioridade."""
+        return [project_name for project_name, _ in self.rules]
+
+    @property
+    def has_rules(self) -> bool:
+        """Indica se há ao menos uma regra válida com palavras-chave."""
+        return self._pattern is not None
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def without_projects(self, project_names: Iterable[str]) -> "CompiledRuleSet":
+        """Retorna um novo conjunto compilado sem as regras dos projetos informados."""
+        excluded = set(project_names)
+        rule_set = CompiledRuleSet([])
+        rule_set.rules = [rule for rule in self.rules if rule[0] not in excluded]
+        rule_set.invalid_rules = self.invalid_rules
+        rule_set._compile()
+        return rule_set
+
+    def with_keyword(self, project_name: str, keyword: str) -> "CompiledRuleSet":
+        """
+        Retorna um novo conjunto compilado com a palavra-chave acrescentada à regra do projeto
+        (ou a uma nova regra, de menor prioridade, se o projeto ainda não tiver regra).
+        """
+        keyword = keyword.lower()
+        rules = list(self.rules)
+        for index, (rule_project, keywords) in enumerate(rules):
+            if rule_project == project_name:
+                rules[index] = (rule_project, keywords + (keyword,))
+                break
+        else:
+            rules.append((project_name, (keyword,)))
+        rule_set = CompiledRuleSet([])
+        rule_set.rules = rules
+        rule_set.invalid_rules = self.invalid_rules
+        rule_set._compile()
+        return rule_set
+
+    def match_priority(self, repo_name: str) -> Optional[int]:
+        """Retorna a posição da regra de maior prioridade que casa com o nome, ou None."""
+        if self._pattern is None:
+            return None
+        best_priority = None
+        for found in self._pattern.finditer(repo_name.lower()):
+            priority = self._keyword_priority[found.group(1)]
+            if best_priority is None or priority < best_priority:
+                best_priority = priority
+                if priority == 0:
+                    break
+        return best_priority
+
+
+class ProjectRuleMatcher:
+    """
+    Atribui repositórios a projetos usando as regras de atribuição compiladas (CompiledRuleSet).
+    Os nomes dos projetos são resolvidos para IDs uma única vez, na construção.
+    Mantém a semântica original: vence a primeira regra (na ordem do arquivo) com alguma palavra-chave
+    contida no nome do repositório, sem diferenciar maiúsculas de minúsculas.
+    """
+
+    def __init__(self, rules: Union[CompiledRuleSet, List[Dict[str, Any]]], project_ids: Dict[str, int],
+                 default_project_id: Optional[int] = None):
+        rule_set = rules if isinstance(rules, CompiledRuleSet) else CompiledRuleSet(rules)
+        self.default_project_id = default_project_id
+
+        unknown_projects = [project_name for project_name in dict.fromkeys(rule_set.project_names)
+                            if project_name not in project_ids]
+        for project_name in unknown_projects:
+            logger.warning(
+                f"Projeto '{project_name}' das regras de atribuição não encontrado no banco de dados. Verifique o arquivo de projetos. As regras serão ignoradas.")
+        if unknown_projects:
+            rule_set = rule_set.without_projects(unknown_projects)
+
+        self._rule_set = rule_set
+        self._rule_project_ids: List[int] = [project_ids[project_name] for project_name in rule_set.project_names]
+
+    @property
+    def has_rules(self) -> bool:
+        """Indica se há ao menos uma regra válida compilada."""
+        return self._rule_set.has_rules
+
+    def match(self, repo_name: str) -> Optional[int]:
+        """Retorna o ID do projeto da regra de maior prioridade que casa com o nome, ou None."""
+        priority = self._rule_set.match_priority(repo_name)
+        return self._rule_project_ids[priority] if priority is not None else None
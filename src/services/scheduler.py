@@ -0,0 +1,184 @@
+import signal
+import threading
+import time
+import logging
+from collections import deque
+from typing import Callable, Deque, Dict, Any, List, Optional, Tuple
+
+from src.config.config import settings
+from src.repositories.schedule_repository import schedule_repository, ScheduleRepository
+
+logger = logging.getLogger(__name__)
+
+_SECONDS_PER_HOUR = 3600
+
+
+class AdaptiveInterval:
+    """
+    Política de intervalo adaptativo entre coletas de uma organização:
+    quando a coleta encontra alterações o intervalo cai pela metade (até min_seconds);
+    quando não encontra, dobra (backoff exponencial até max_seconds).
+    """
+
+    def __init__(self, min_seconds: Optional[float] = None, max_seconds: Optional[float] = None):
+        self.min_seconds = settings.daemon_min_interval_seconds if min_seconds is None else min_seconds
+        self.max_seconds = settings.daemon_max_interval_seconds if max_seconds is None else max_seconds
+
+    def initial(self) -> float:
+        return self.min_seconds
+
+    def next(self, current: float, changes: int) -> float:
+        interval = current / 2 if changes else current * 2
+        return min(self.max_seconds, max(self.min_seconds, interval))
+
+
+class ApiBudget:
+    """
+    Orçamento de requisições à API do GitHub em uma janela deslizante de uma hora.
+    As requisições consumidas são registradas com o horário; as que saem da janela voltam ao orçamento.
+    """
+
+    def __init__(self, requests_per_hour: Optional[int] = None, clock: Callable[[], float] = time.time):
+        self.requests_per_hour = settings.daemon_api_budget_per_hour if requests_per_hour is None else requests_per_hour
+        self._clock = clock
+        self._spent: Deque[Tuple[float, int]] = deque()
+        self._spent_total = 0
+
+    def _expire(self, now: float):
+        while self._spent and self._spent[0][0] <= now - _SECONDS_PER_HOUR:
+            self._spent_total -= self._spent.popleft()[1]
+
+    def available(self) -> int:
+        """Requisições ainda disponíveis na janela atual."""
+        self._expire(self._clock())
+        return max(0, self.requests_per_hour - self._spent_total)
+
+    def consume(self, count: int):
+        """Registra 'count' requisições feitas agora."""
+        if count > 0:
+            self._spent.append((self._clock(), count))
+            self._spent_total += count
+
+    def wait_time(self, count: int) -> float:
+        """Segundos até haver 'count' requisições disponíveis (0 se já houver)."""
+        now = self._clock()
+        self._expire(now)
+        excess = self._spent_total + min(count, self.requests_per_hour) - self.requests_per_hour
+        if excess <= 0:
+            return 0.0
+        freed = 0
+        for spent_at, spent in self._spent:
+            freed += spent
+            if freed >= excess:
+                return max(0.0, spent_at + _SECONDS_PER_HOUR - now)
+        return float(_SECONDS_PER_HOUR)
+
+
+class PollingScheduler:
+    """
+    Laço do modo daemon: coleta cada organização quando vence o seu horário, ajusta o intervalo
+    conforme as alterações encontradas (AdaptiveInterval) e respeita o orçamento horário de
+    requisições (ApiBudget). O agendamento é gravado no SQLite após cada coleta, de modo que um
+    reinício retoma os horários de onde parou. SIGTERM/SIGINT encerram o laço após a coleta em curso.
+
+    'poll' recebe o nome da organização e retorna {"alteracoes": int, "requisicoes": int}.
+    """
+
+    def __init__(self, organizations: List[str], poll: Callable[[str], Dict[str, int]],
+                 budget: Optional[ApiBudget] = None, policy: Optional[AdaptiveInterval] = None,
+                 repository: ScheduleRepository = schedule_repository,
+                 on_cycle: Optional[Callable[[], None]] = None,
+                 clock: Callable[[], float] = time.time):
+        self.organizations = list(dict.fromkeys(organizations))
+        self.poll = poll
+        self.budget = budget or ApiBudget(clock=clock)
+        self.policy = policy or AdaptiveInterval()
+        self.repository = repository
+        self.on_cycle = on_cycle
+        self._clock = clock
+        self._stop = threading.Event()
+        self._schedule: Dict[str, Dict[str, Any]] = {}
+
+    def load(self):
+        """Carrega o agendamento persistido; organizações novas são agendadas para agora."""
+        persisted = self.repository.get_all()
+        now = self._clock()
+        for org_name in self.organizations:
+            entry = persisted.get(org_name)
+            if entry is None:
+                entry = {"organizacao": org_name, "intervalo_s": self.policy.initial(), "proxima_execucao": now,
+                         "ultima_execucao": None, "ultimas_alteracoes": 0, "ultimo_custo": 1}
+            self._schedule[org_name] = entry
+        resumed = sum(1 for org_name in self.organizations if org_name in persisted)
+        logger.info(f"Agendamento carregado: {len(self.organizations)} organizações ({resumed} retomadas do banco).")
+
+    def stop(self, *_):
+        """Solicita o encerramento do laço (também usado como tratador de sinal)."""
+        if not self._stop.is_set():
+            logger.info("Encerramento solicitado. Finalizando após a coleta em andamento...")
+        self._stop.set()
+
+    def install_signal_handlers(self) -> Dict[int, Any]:
+        """Instala os tratadores de SIGTERM/SIGINT e retorna os anteriores (para restaurá-los)."""
+        previous = {}
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            previous[signum] = signal.signal(signum, self.stop)
+        return previous
+
+    def _next_due(self) -> Dict[str, Any]:
+        return min(self._schedule.values(), key=lambda entry: entry["proxima_execucao"])
+
+    def _wait(self, seconds: float) -> bool:
+        """Aguarda até 'seconds' segundos; retorna False se o encerramento foi solicitado."""
+        if seconds > 0:
+            self._stop.wait(seconds)
+        return not self._stop.is_set()
+
+    def run_once(self) -> Optional[Dict[str, Any]]:
+        """Aguarda a próxima organização vencida e o orçamento necessário e faz uma coleta."""
+        entry = self._next_due()
+        if not self._wait(entry["proxima_execucao"] - self._clock()):
+            return None
+        estimated_cost = max(1, entry["ultimo_custo"])
+        budget_wait = self.budget.wait_time(estimated_cost)
+        if budget_wait > 0:
+            logger.warning(f"Orçamento de {self.budget.requests_per_hour} requisições/hora esgotado. "
+                           f"Aguardando {budget_wait:.0f} segundos.")
+            if not self._wait(budget_wait):
+                return None
+
+        org_name = entry["organizacao"]
+        started_at = self._clock()
+        try:
+            result = self.poll(org_name)
+        except Exception as e:
+            logger.error(f"Erro na coleta agendada da organização '{org_name}': {e}")
+            result = {"alteracoes": 0, "requisicoes": estimated_cost}
+        self.budget.consume(result["requisicoes"])
+
+        entry["intervalo_s"] = self.policy.next(entry["intervalo_s"], result["alteracoes"])
+        entry["ultima_execucao"] = started_at
+        entry["proxima_execucao"] = self._clock() + entry["intervalo_s"]
+        entry["ultimas_alteracoes"] = result["alteracoes"]
+        entry["ultimo_custo"] = result["requisicoes"]
+        self.repository.save(entry)
+        logger.info(
+            f"Organização '{org_name}': {result['alteracoes']} alterações, {result['requisicoes']} requisições; "
+            f"próxima coleta em {entry['intervalo_s']:.0f} s ({self.budget.available()} requisições disponíveis na hora).")
+        if self.on_cycle:
+            self.on_cycle()
+        return entry
+
+    def run(self, max_polls: Optional[int] = None):
+        """Executa o laço até SIGTERM/SIGINT (ou até max_polls coletas)."""
+        if not self._schedule:
+            self.load()
+        if not self._schedule:
+            logger.error("Nenhuma organização para agendar.")
+            return
+        polls = 0
+        while not self._stop.is_set() and (max_polls is None or polls < max_polls):
+            if self.run_once() is not None:
+                polls += 1
+        logger.info(f"Daemon encerrado após {polls} coletas.")
+
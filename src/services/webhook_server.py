@@ -0,0 +1,373 @@
+import hmac
+import json
+import queue
+import hashlib
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
+
+from src.config.config import settings
+from src.repositories.github_repository import github_repository
+from src.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Eventos de webhook da organização que alteram dados da tabela Repositorios.
+WEBHOOK_EVENTS = ("repository", "star", "fork", "push")
+
+SIGNATURE_HEADER = "X-Hub-Signature-256"
+
+# Tamanho máximo aceito para o corpo de uma entrega (o GitHub limita os payloads a 25 MB). O corpo só é
+# lido depois dessa verificação, antes mesmo da assinatura.
+MAX_PAYLOAD_BYTES = 25 * 1024 * 1024
+
+
+def compute_signature(secret: str, body: bytes) -> str:
+    """Assinatura HMAC-SHA256 do corpo no formato do cabeçalho X-Hub-Signature-256 ('sha256=<hex>')."""
+    return "sha256=" + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """Confere a assinatura enviada pelo GitHub com o segredo do webhook (comparação em tempo constante)."""
+    if not signature:
+        return False
+    return hmac.compare_digest(compute_signature(secret, body), signature)
+
+
+def _github_timestamp(value: Any) -> Any:
+    """Normaliza datas para o formato ISO da API REST (os payloads de 'push' trazem timestamps Unix)."""
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return value
+
+
+def repository_update(event_name: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Converte um evento de webhook na alteração correspondente de uma linha de Repositorios:
+    {"acao": "upsert" | "delete", "github_id", "repositorio" (campos de extract_repo_info), "renomeado"}.
+    Retorna None para eventos e ações que não alteram repositórios.
+    Em 'fork', o repositório do payload é o de origem, cujo total de forks aumentou.
+    """
+    from src.services.github_api import extract_repo_info
+
+    repo_json = payload.get("repository")
+    if event_name not in WEBHOOK_EVENTS or not isinstance(repo_json, dict) or "id" not in repo_json:
+        return None
+    action = payload.get("action")
+    if event_name == "repository" and action == "deleted":
+        return {"acao": "delete", "github_id": repo_json["id"], "repositorio": None, "renomeado": False}
+
+    repo_json = dict(repo_json, created_at=_github_timestamp(repo_json.get("created_at")),
+                     updated_at=_github_timestamp(repo_json.get("updated_at")))
+    try:
+        repo_data = extract_repo_info(repo_json)
+    except KeyError as e:
+        logger.warning(f"Evento '{event_name}' sem o campo {e} no repositório. Ignorando.")
+        return None
+    return {"acao": "upsert", "github_id": repo_data["github_id"], "repositorio": repo_data,
+            "renomeado": event_name == "repository" and action == "renamed"}
+
+
+class WebhookProcessor:
+    """
+    Fila dos eventos recebidos, aplicada ao banco em micro-lotes: uma thread acumula eventos por até
+    flush_seconds (ou batch_size eventos) e grava o lote em uma única transação, de modo que uma rajada
+    de eventos não custe um commit por evento. Eventos do mesmo repositório no lote são consolidados
+    (vale o último, que traz os contadores mais recentes).
+    Repositórios novos ou renomeados passam pelas regras de atribuição ('assign_project');
+    os demais mantêm o projeto já gravado.
+    """
+
+    def __init__(self, assign_project: Callable[[str], Optional[int]],
+                 organizations: Optional[List[str]] = None,
+                 batch_size: Optional[int] = None, flush_seconds: Optional[float] = None):
+        self.assign_project = assign_project
+        self.organizations = {org_name.lower() for org_name in organizations} if organizations else None
+        self.batch_size = batch_size or settings.webhook_batch_size
+        self.flush_seconds = settings.webhook_flush_seconds if flush_seconds is None else flush_seconds
+        self.stats = {"recebidos": 0, "ignorados": 0, "aplicados": 0, "removidos": 0, "lotes": 0}
+        # submit() roda nas threads do ThreadingHTTPServer: as contagens só mudam sob esta trava.
+        self._stats_lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, event_name: str, payload: Dict[str, Any]) -> bool:
+        """Enfileira o evento se ele alterar um repositório monitorado. Retorna se o evento foi aceito."""
+        self._count(recebidos=1)
+        metrics.inc("webhook_events_received")
+        update = repository_update(event_name, payload)
+        org_login = (payload.get("organization") or (payload.get("repository") or {}).get("owner") or {}).get("login")
+        if update is None or (self.organizations is not None and (org_login or "").lower() not in self.organizations):
+            self._count(ignorados=1)
+            return False
+        self._queue.put(update)
+        return True
+
+    def _count(self, **increments: int):
+        """Soma os incrementos às contagens de self.stats."""
+        with self._stats_lock:
+            for key, value in increments.items():
+                self.stats[key] += value
+
+    def start(self):
+        """Inicia a thread que aplica os micro-lotes."""
+        self._thread = threading.Thread(target=self._run, name="webhook-processor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Aplica os eventos ainda na fila e encerra a thread."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        else:
+            self.flush()
+
+    def flush(self):
+        """Aplica de forma síncrona todos os eventos na fila (usado na reprodução de payloads gravados)."""
+        batch = []
+        while True:
+            try:
+                update = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if update is not None:
+                batch.append(update)
+            if len(batch) >= self.batch_size:
+                self.apply_batch(batch)
+                batch = []
+        if batch:
+            self.apply_batch(batch)
+
+    def _run(self):
+        while True:
+            update = self._queue.get()
+            if update is None:
+                return
+            batch = [update]
+            deadline = time.monotonic() + self.flush_seconds
+            stopping = False
+            while len(batch) < self.batch_size:
+                try:
+                    update = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if update is None:
+                    stopping = True
+                    break
+                batch.append(update)
+            try:
+                self.apply_batch(batch)
+            except Exception as e:
+                logger.error(f"Erro ao aplicar lote de {len(batch)} eventos de webhook: {e}")
+            if stopping:
+                self.flush()
+                return
+
+    def apply_batch(self, batch: List[Dict[str, Any]]):
+        """Grava um micro-lote de alterações: um upsert em lote e, se houver, uma remoção em lote."""
+        started_at = time.perf_counter()
+        latest: Dict[int, Dict[str, Any]] = {}
+        for update in batch:
+            previous = latest.pop(update["github_id"], None)
+            if previous and previous["renomeado"] and update["acao"] == "upsert":
+                update = dict(update, renomeado=True)
+            latest[update["github_id"]] = update
+
+        upserts = [update for update in latest.values() if update["acao"] == "upsert"]
+        deleted_ids = [github_id for github_id, update in latest.items() if update["acao"] == "delete"]
+        stored = github_repository.get_repositories_by_github_ids(update["github_id"] for update in upserts)
+
+        rows = []
+        for update in upserts:
+            repo_data = update["repositorio"]
+            existing = stored.get(update["github_id"])
+            if existing and existing["projeto_id"] and not update["renomeado"] and existing["nome"] == repo_data["nome"]:
+                projeto_id = existing["projeto_id"]
+            else:
+                projeto_id = self.assign_project(repo_data["nome"])
+            if projeto_id:
+                rows.append({**repo_data, "projeto_id": projeto_id})
+
+        counts = github_repository.upsert_repositories(rows)
+        removed = github_repository.delete_repositories(deleted_ids) if deleted_ids else 0
+        self._count(lotes=1, aplicados=len(rows) - counts["falhas"], removidos=removed)
+        metrics.inc("webhook_batches")
+        metrics.inc("webhook_events_applied", len(batch))
+        metrics.add_stage_time("webhook_apply", time.perf_counter() - started_at)
+        logger.info(
+            f"Lote de {len(batch)} eventos de webhook aplicado: {counts['inseridos']} inseridos, "
+            f"{counts['atualizados']} atualizados, {counts['inalterados']} inalterados, {removed} removidos, "
+            f"{counts['falhas']} falhas.")
+
+
+class WebhookRequestHandler(BaseHTTPRequestHandler):
+    """Recebe as entregas (POST) do webhook da organização, confere a assinatura e enfileira o evento."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "WebhookServer"
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+    def _send(self, status: int, message: str):
+        body = json.dumps({"message": message}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self) -> Optional[bytes]:
+        """
+        Lê o corpo da requisição conforme o Content-Length, se válido e até MAX_PAYLOAD_BYTES; senão,
+        responde 400 ou 413 sem ler o corpo (e encerra a conexão) e retorna None.
+        """
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_PAYLOAD_BYTES:
+            metrics.inc("webhook_rejected_bodies")
+            logger.warning(f"Entrega de webhook recusada de {self.client_address[0]}: "
+                           f"Content-Length '{self.headers.get('Content-Length')}' inválido ou acima do limite.")
+            # O corpo não lido ficaria no socket: a conexão é encerrada após a resposta.
+            self.close_connection = True
+            if length < 0:
+                self._send(400, "Content-Length inválido.")
+            else:
+                self._send(413, f"Payload acima de {MAX_PAYLOAD_BYTES} bytes.")
+            return None
+        return self.rfile.read(length)
+
+    def do_POST(self):
+        body = self._read_body()
+        if body is None:
+            return
+        if not verify_signature(self.server.secret, body, self.headers.get(SIGNATURE_HEADER)):
+            metrics.inc("webhook_invalid_signatures")
+            logger.warning(f"Entrega de webhook com assinatura inválida recebida de {self.client_address[0]}.")
+            self._send(401, "Assinatura inválida.")
+            return
+        event_name = self.headers.get("X-GitHub-Event", "")
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            self._send(400, "Payload JSON inválido.")
+            return
+        if event_name == "ping":
+            self._send(200, "pong")
+            return
+        self.server.record(event_name, self.headers.get("X-GitHub-Delivery"), payload)
+        accepted = self.server.processor.submit(event_name, payload)
+        self._send(202 if accepted else 200, "Evento enfileirado." if accepted else "Evento ignorado.")
+
+
+class WebhookServer(ThreadingHTTPServer):
+    """
+    Servidor HTTP dos webhooks. Com record_path, grava cada entrega aceita em JSON Lines
+    ({"event", "delivery", "payload"}) para poder reproduzi-la depois (replay_recorded_deliveries).
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], processor: WebhookProcessor, secret: str,
+                 record_path: Optional[str] = None):
+        super().__init__(address, WebhookRequestHandler)
+        self.processor = processor
+        self.secret = secret
+        self._record_file = open(record_path, "a", encoding="utf-8") if record_path else None
+        self._record_lock = threading.Lock()
+
+    def record(self, event_name: str, delivery_id: Optional[str], payload: Dict[str, Any]):
+        if self._record_file is None:
+            return
+        line = json.dumps({"event": event_name, "delivery": delivery_id, "payload": payload}, ensure_ascii=False)
+        with self._record_lock:
+            self._record_file.write(line + "\n")
+            self._record_file.flush()
+
+    def server_close(self):
+        super().server_close()
+        if self._record_file is not None:
+            self._record_file.close()
+
+
+class WebhookReceiver:
+    """Servidor de webhooks e processador da fila, executados em threads próprias."""
+
+    def __init__(self, assign_project: Callable[[str], Optional[int]], organizations: Optional[List[str]] = None,
+                 host: Optional[str] = None, port: Optional[int] = None):
+        self.processor = WebhookProcessor(assign_project, organizations)
+        self.host = host or settings.webhook_host
+        self.port = settings.webhook_port if port is None else port
+        self._server: Optional[WebhookServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> Optional[str]:
+        """Endereço em que o receptor está escutando (None se não estiver em execução)."""
+        return f"http://{self.host}:{self._server.server_address[1]}/" if self._server else None
+
+    def start(self) -> bool:
+        """Inicia o recebimento de webhooks. Retorna False se o segredo não estiver configurado."""
+        if not settings.webhook_secret:
+            logger.error("GITHUB_WEBHOOK_SECRET não configurado: o receptor de webhooks não será iniciado.")
+            return False
+        self._server = WebhookServer((self.host, self.port), self.processor, settings.webhook_secret,
+                                     settings.webhook_record_path)
+        self.processor.start()
+        self._thread = threading.Thread(target=self._server.serve_forever, name="webhook-server", daemon=True)
+        self._thread.start()
+        logger.info(f"Recebendo webhooks do GitHub em {self.url}")
+        return True
+
+    def stop(self):
+        """Para de aceitar entregas e aplica os eventos que ainda estão na fila."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self.processor.stop()
+        self._server = None
+        logger.info(f"Receptor de webhooks encerrado: {self.processor.stats}")
+
+
+def load_recorded_deliveries(path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Lê entregas gravadas em JSON Lines ({"event", "payload"}, como as gravadas pelo WebhookServer)."""
+    with open(path, "r", encoding="utf-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                delivery = json.loads(line)
+                yield delivery["event"], delivery["payload"]
+            except (ValueError, KeyError) as e:
+                logger.warning(f"Entrega inválida na linha {line_number} de '{path}': {e}. Ignorando.")
+
+
+def replay_recorded_deliveries(path: str, url: str, secret: str) -> Dict[str, int]:
+    """
+    Reenvia as entregas gravadas a um receptor em execução (por exemplo, o local), assinadas com 'secret'
+    como o GitHub faria. Retorna a contagem de respostas por código HTTP.
+    """
+    import requests
+
+    statuses: Dict[str, int] = {}
+    with requests.Session() as session:
+        for event_name, payload in load_recorded_deliveries(path):
+            body = json.dumps(payload).encode("utf-8")
+            response = session.post(url, data=body, timeout=30, headers={
+                "Content-Type": "application/json",
+                "X-GitHub-Event": event_name,
+                SIGNATURE_HEADER: compute_signature(secret, body),
+            })
+            statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+    return statuses
@@ -0,0 +1,15 @@
+import pytest
+
+from src.config.config import settings
+from src.models.model import SchemaManager, get_connection_pool
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Banco SQLite temporário com o esquema completo, configurado em settings.database_name."""
+    db_name = str(tmp_path / "repos_monitor.db")
+    settings.override(database_name=db_name, metrics_json_path="", metrics_prometheus_path="")
+    SchemaManager().create_all_tables()
+    yield db_name
+    get_connection_pool(db_name).close_all()
+    settings.reset()
@@ -0,0 +1,89 @@
+import sqlite3
+
+from src.models.model import PROJETO_RESUMO_REBUILD_SQL, RepoRecord
+from src.repositories.github_repository import github_repository
+from src.repositories.project_repository import project_repository
+
+
+def _record(github_id: int, projeto_id: int, **changes) -> RepoRecord:
+    record = RepoRecord(github_id=github_id, nome=f"repo-{github_id}", visibilidade="público",
+                        data_criacao="2024-01-01T00:00:00Z", data_ultima_atualizacao=f"2024-02-{github_id:02d}T00:00:00Z",
+                        estrelas=github_id, forks=1, url=f"https://github.com/org/repo-{github_id}",
+                        descricao=None, projeto_id=projeto_id)
+    return record._replace(**changes)
+
+
+def _project_summary(db_name: str):
+    with sqlite3.connect(db_name) as conn:
+        return conn.execute("SELECT * FROM ProjetoResumo ORDER BY projeto_id").fetchall()
+
+
+def _rebuilt_project_summary(db_name: str):
+    conn = sqlite3.connect(db_name)
+    try:
+        conn.execute("DELETE FROM ProjetoResumo")
+        conn.execute(PROJETO_RESUMO_REBUILD_SQL)
+        return conn.execute("SELECT * FROM ProjetoResumo ORDER BY projeto_id").fetchall()
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def test_upsert_repositories_counts_inserted_updated_and_unchanged(database):
+    project_id = project_repository.insert_project("Alpha")
+    records = [_record(github_id, project_id) for github_id in range(1, 6)]
+
+    assert github_repository.upsert_repositories(records, batch_size=2) == {
+        "inseridos": 5, "atualizados": 0, "inalterados": 0, "falhas": 0}
+    assert github_repository.upsert_repositories(records, batch_size=2) == {
+        "inseridos": 0, "atualizados": 0, "inalterados": 5, "falhas": 0}
+
+    records[1] = records[1]._replace(estrelas=100)
+    records[3] = records[3]._replace(descricao="Nova descrição")
+    records.append(_record(6, project_id))
+    assert github_repository.upsert_repositories(records, batch_size=2) == {
+        "inseridos": 1, "atualizados": 2, "inalterados": 3, "falhas": 0}
+
+    with sqlite3.connect(database) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM Repositorios").fetchone() == (6,)
+        assert conn.execute("SELECT estrelas FROM Repositorios WHERE github_id = 2").fetchone() == (100,)
+
+
+def test_upsert_repositories_accepts_dictionaries(database):
+    project_id = project_repository.insert_project("Alpha")
+    repo = _record(1, project_id)._asdict()
+    del repo["descricao"]
+
+    assert github_repository.upsert_repositories([repo]) == {
+        "inseridos": 1, "atualizados": 0, "inalterados": 0, "falhas": 0}
+    assert github_repository.upsert_repositories([repo]) == {
+        "inseridos": 0, "atualizados": 0, "inalterados": 1, "falhas": 0}
+
+
+def test_project_summary_matches_rebuild(database):
+    alpha = project_repository.insert_project("Alpha")
+    beta = project_repository.insert_project("Beta")
+    records = [_record(github_id, alpha if github_id % 2 else beta,
+                       visibilidade="público" if github_id % 3 else "privado")
+               for github_id in range(1, 13)]
+    github_repository.upsert_repositories(records)
+    assert _project_summary(database) == _rebuilt_project_summary(database)
+
+    # Mudança de projeto, de visibilidade, de contadores e da atualização mais recente de cada projeto.
+    records[0] = records[0]._replace(projeto_id=beta)
+    records[1] = records[1]._replace(visibilidade="privado", estrelas=50, forks=7)
+    records[10] = records[10]._replace(data_ultima_atualizacao="2023-01-01T00:00:00Z")
+    records[11] = records[11]._replace(projeto_id=None)
+    github_repository.upsert_repositories(records)
+    assert _project_summary(database) == _rebuilt_project_summary(database)
+
+    # Remoção, inclusive do repositório com a atualização mais recente de um projeto.
+    kept = [record.github_id for record in records if record.github_id not in (3, 9, 11)]
+    assert github_repository.delete_missing_repositories("org", kept) == 3
+    assert _project_summary(database) == _rebuilt_project_summary(database)
+
+    # Um projeto que fica sem repositórios sai do resumo, como na reconstrução.
+    github_repository.upsert_repositories(record._replace(projeto_id=beta) for record in records)
+    summary = _project_summary(database)
+    assert summary == _rebuilt_project_summary(database)
+    assert [row[0] for row in summary] == [beta]
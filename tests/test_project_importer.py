@@ -0,0 +1,43 @@
+import io
+import json
+
+import pytest
+
+from src.services.project_importer import iter_json_array
+
+ITEMS = [
+    {"nome": "Projeto Jogo Alpha", "descricao": "Contém ] e , e \" no texto"},
+    {"nome": "Ferramentas", "descricao": None, "tags": ["cli", [1, 2, {"x": []}]]},
+    -1.5e10,
+    12345678901234567890,
+    "ação ✓",
+    [],
+    {},
+    True,
+    None,
+]
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_iter_json_array_across_chunk_boundaries(indent):
+    content = json.dumps(ITEMS, ensure_ascii=False, indent=indent)
+    for chunk_size in range(1, len(content) + 2):
+        assert list(iter_json_array(io.StringIO(content), chunk_size)) == ITEMS, chunk_size
+
+
+@pytest.mark.parametrize("content", ["[]", "  [ \n ]  ", "[1]"])
+def test_iter_json_array_small_arrays(content):
+    for chunk_size in (1, 2, 64):
+        assert list(iter_json_array(io.StringIO(content), chunk_size)) == json.loads(content)
+
+
+def test_iter_json_array_rejects_non_arrays():
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO('{"nome": "Projeto"}'), 4))
+
+
+@pytest.mark.parametrize("content", ["[1, 2", "[1 2]", '[{"nome": }]', "[1,]"])
+def test_iter_json_array_rejects_invalid_json(content):
+    for chunk_size in (1, 3, 64):
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_array(io.StringIO(content), chunk_size))
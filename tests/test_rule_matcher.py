@@ -0,0 +1,57 @@
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from src.services.rule_matcher import ProjectRuleMatcher
+
+PROJECT_IDS = {"Jogos": 1, "Ferramentas": 2, "Documentação": 3}
+
+RULES = [
+    {"project_name": "Jogos", "keywords": ["game", "engine"]},
+    {"project_name": "Ferramentas", "keywords": ["game-tools", "tool", "cli"]},
+    {"project_name": "Documentação", "keywords": ["docs", "game-docs"]},
+]
+
+
+def _first_matching_rule(rules: List[Dict[str, Any]], repo_name: str) -> Optional[int]:
+    """Semântica de referência: a primeira regra com alguma palavra-chave contida no nome."""
+    for rule in rules:
+        if any(keyword.lower() in repo_name.lower() for keyword in rule["keywords"]):
+            return PROJECT_IDS[rule["project_name"]]
+    return None
+
+
+@pytest.mark.parametrize("repo_name, expected", [
+    ("game-tools-cli", "Jogos"),  # 'game' e 'game-tools' começam na mesma posição
+    ("my-tool-for-game", "Jogos"),  # 'tool' aparece antes no nome, mas a regra vem depois
+    ("game-docs", "Jogos"),
+    ("GAME-Engine", "Jogos"),
+    ("toolbox", "Ferramentas"),
+    ("docs-cli", "Ferramentas"),
+    ("project-docs", "Documentação"),
+    ("website", None),
+])
+def test_first_rule_wins_with_overlapping_keywords(repo_name, expected):
+    matcher = ProjectRuleMatcher(RULES, PROJECT_IDS)
+    assert matcher.match(repo_name) == (PROJECT_IDS[expected] if expected else None)
+
+
+def test_rule_order_decides_between_overlapping_keywords():
+    matcher = ProjectRuleMatcher(list(reversed(RULES)), PROJECT_IDS)
+    assert matcher.match("game-docs") == PROJECT_IDS["Documentação"]
+    assert matcher.match("game-tools-cli") == PROJECT_IDS["Ferramentas"]
+    assert matcher.match("game") == PROJECT_IDS["Jogos"]
+
+
+def test_matches_reference_semantics():
+    names = ["game-tools-cli", "tool-game", "docsengine", "cli-game-docs", "engine", "g-a-m-e", "Docs", "gametool"]
+    for rules in (RULES, list(reversed(RULES))):
+        matcher = ProjectRuleMatcher(rules, PROJECT_IDS)
+        for name in names:
+            assert matcher.match(name) == _first_matching_rule(rules, name), name
+
+
+def test_rules_of_unknown_projects_are_ignored():
+    matcher = ProjectRuleMatcher(RULES, {"Ferramentas": 2})
+    assert matcher.match("game-tools-cli") == 2
+    assert matcher.match("game") is None
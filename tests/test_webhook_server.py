@@ -0,0 +1,79 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from typing import Dict
+
+import pytest
+
+from src.services.webhook_server import (SIGNATURE_HEADER, WebhookProcessor, WebhookServer, compute_signature,
+                                         verify_signature)
+
+SECRET = "segredo-do-webhook"
+
+
+@pytest.fixture
+def server():
+    """Servidor de webhooks em uma porta livre; o processador não é iniciado (os eventos ficam na fila)."""
+    webhook_server = WebhookServer(("127.0.0.1", 0), WebhookProcessor(lambda repo_name: None), SECRET)
+    thread = threading.Thread(target=webhook_server.serve_forever, daemon=True)
+    thread.start()
+    yield webhook_server
+    webhook_server.shutdown()
+    webhook_server.server_close()
+    thread.join()
+
+
+def _post(server: WebhookServer, body: bytes, headers: Dict[str, str]) -> int:
+    request = urllib.request.Request(f"http://127.0.0.1:{server.server_address[1]}/", data=body,
+                                     headers=headers, method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def _push_payload() -> bytes:
+    return json.dumps({
+        "repository": {"id": 1, "name": "repo", "private": False, "created_at": 1700000000,
+                       "updated_at": "2024-01-01T00:00:00Z", "stargazers_count": 1, "forks_count": 0,
+                       "html_url": "https://github.com/org/repo", "description": None},
+        "organization": {"login": "org"},
+    }).encode()
+
+
+def test_verify_signature():
+    body = b'{"zen": "Keep it logically awesome."}'
+    signature = compute_signature(SECRET, body)
+    assert verify_signature(SECRET, body, signature)
+    assert not verify_signature(SECRET, body, None)
+    assert not verify_signature(SECRET, body, "")
+    assert not verify_signature("outro-segredo", body, signature)
+    assert not verify_signature(SECRET, body + b" ", signature)
+    assert not verify_signature(SECRET, body, signature.replace("sha256=", "sha1="))
+
+
+@pytest.mark.parametrize("signature", [
+    None,
+    "sha256=00",
+    compute_signature("outro-segredo", _push_payload()),
+    compute_signature(SECRET, b"{}"),  # assinatura de outro corpo
+])
+def test_deliveries_with_invalid_signature_are_rejected(server, signature):
+    headers = {"X-GitHub-Event": "push", "Content-Type": "application/json"}
+    if signature is not None:
+        headers[SIGNATURE_HEADER] = signature
+    assert _post(server, _push_payload(), headers) == 401
+    assert server.processor.stats["recebidos"] == 0
+    assert server.processor._queue.empty()
+
+
+def test_signed_deliveries_are_accepted(server):
+    body = _push_payload()
+    headers = {"X-GitHub-Event": "push", SIGNATURE_HEADER: compute_signature(SECRET, body)}
+    assert _post(server, body, headers) == 202
+    assert server.processor.stats["recebidos"] == 1
+
+    ping = b'{"zen": "Design for failure."}'
+    assert _post(server, ping, {"X-GitHub-Event": "ping", SIGNATURE_HEADER: compute_signature(SECRET, ping)}) == 200